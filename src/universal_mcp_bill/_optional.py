@@ -0,0 +1,14 @@
+"""Helpers for features that depend on optional extras."""
+
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+
+
+def require(module: str, extra: str, feature: str) -> ModuleType:
+    """Import `module` or raise an ImportError naming the extra that provides it."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(f"{feature} requires {module}. Install it with `pip install universal-mcp-bill[{extra}]`.") from e
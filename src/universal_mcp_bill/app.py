@@ -1,11 +1,394 @@
-from typing import Any, Optional, List
+import copy
+import functools
+import inspect
+import itertools
+import logging
+import os
+import time
+from datetime import date
+from typing import Any, Callable, Iterator, Optional, List
+import httpx
 from universal_mcp.applications import APIApplication
 from universal_mcp.integrations import Integration
 
+from universal_mcp_bill.aging import DEFAULT_BUCKET_DAYS, BillColumns, compute_aging
+from universal_mcp_bill.audit import AuditTrailStore, trail_key
+from universal_mcp_bill.budget_sync import diff_members
+from universal_mcp_bill.cache import MISSING, CachedResponse, ResponseCache, SingleFlight, TTLCache, parse_max_age, request_key
+from universal_mcp_bill.cdc import ChangeFeed, read_events
+from universal_mcp_bill.concurrency import RateLimiter, run_concurrently
+from universal_mcp_bill.constants import CLOSED_BILL_STATUSES, PENDING_PAYMENT_STATUSES
+from universal_mcp_bill.content_store import ContentStore
+from universal_mcp_bill.dedup import DUPLICATE_POLICIES, BillDuplicateIndex, DuplicateBillError
+from universal_mcp_bill.enrichment import CustomFieldCatalog, chunk_field_ids, enrich, merge_custom_fields
+from universal_mcp_bill.export import PartitionedWriter
+from universal_mcp_bill.filters import Field, apply_query, parse_filters, serialize_filters, serialize_sort
+from universal_mcp_bill.forecast import CashForecaster
+from universal_mcp_bill.name_index import NameIndex
+from universal_mcp_bill.outbox import Outbox, OutboxHandler
+from universal_mcp_bill.payments import DEFAULT_PAYMENTS_PER_REQUEST, PaymentOptionsResolver, bulk_payment_results, decode_check_image, plan_bulk_payments
+from universal_mcp_bill.reconcile import InvoiceReconciler
+from universal_mcp_bill.reference import ReferenceDataStore
+from universal_mcp_bill.spend import SpendStore
+from universal_mcp_bill.tagging import plan_tagging
+from universal_mcp_bill.transport import HttpConfig, build_client
+from universal_mcp_bill.uploads import UploadIndex, content_digest
+from universal_mcp_bill.vendor_import import plan_vendor_import
+from universal_mcp_bill.webhooks import WebhookEvent, WebhookReceiver
+
+logger = logging.getLogger(__name__)
+
+# Exportable entities: list method name and the field used to derive partitions.
+EXPORT_SOURCES = {
+    'bills': ('list_bills', 'createdTime'),
+    'payments': ('list_payments', 'createdTime'),
+    'transactions': ('list_transactions', 'occurredTime'),
+}
+
+# Entity types held in the local name index and the list method that feeds each.
+NAME_INDEX_SOURCES = {
+    'vendor': 'list_vendors',
+    'customer': 'list_customers',
+}
+
+# Entities queryable through query_records and the list method behind each.
+QUERY_SOURCES = {
+    'bills': 'list_bills',
+    'recurring_bills': 'list_recurring_bills',
+    'payments': 'list_payments',
+    'invoices': 'list_invoices',
+    'vendors': 'list_vendors',
+    'customers': 'list_customers',
+    'transactions': 'list_transactions',
+}
+
+# `/v3/<path>` prefixes written through this app and the query_records snapshots each write makes stale.
+# Payments also change the payment status of the bills they pay.
+WRITE_SNAPSHOTS = {
+    'bills': ('bills',),
+    'recurringbills': ('recurring_bills',),
+    'payments': ('payments', 'bills'),
+    'invoices': ('invoices',),
+    'vendors': ('vendors',),
+    'customers': ('customers',),
+    'spend/transactions': ('transactions',),
+}
+
+# Entities tracked by the change-data-capture feed and the list method behind each.
+CDC_SOURCES = {
+    'vendors': 'list_vendors',
+    'customers': 'list_customers',
+    'bills': 'list_bills',
+    'invoices': 'list_invoices',
+    'payments': 'list_payments',
+}
+
+# Webhook event entities and the `/v3/<path>` collection / query_records source each maps to.
+WEBHOOK_ENTITIES = {
+    'bill': 'bills',
+    'vendor': 'vendors',
+    'customer': 'customers',
+    'payment': 'payments',
+    'invoice': 'invoices',
+}
+
+# Largest number of IDs sent in one `id:in:` list filter.
+ID_FILTER_CHUNK = 100
+
 class BillApp(APIApplication):
-    def __init__(self, integration: Integration = None, **kwargs) -> None:
+    def __init__(self, integration: Integration = None, duplicate_bill_policy: str = 'off', network_search_ttl: float = 300.0, network_search_cache_size: int = 1024, list_snapshot_ttl: float = 300.0, response_cache_size: int = 2048, reference_data_snapshot: Optional[str] = None, reference_data_refresh_interval: Optional[float] = 3600.0, payment_options_ttl: float = 900.0, http_config: Optional[HttpConfig] = None, warm_up_connections: int = 0, webhook_cache_ttl: float = 3600.0, outbox_path: Optional[str] = None, outbox_flush_interval: float = 1.0, upload_index_path: Optional[str] = None, **kwargs) -> None:
+        if duplicate_bill_policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"duplicate_bill_policy must be one of {DUPLICATE_POLICIES}.")
         super().__init__(name='bill', integration=integration, **kwargs)
         self.base_url = "https://gateway.stage.bill.com/connect"
+        self._cash_forecaster: Optional[CashForecaster] = None
+        self._spend_store: Optional[SpendStore] = None
+        self._spend_filters: Optional[str] = None
+        self.duplicate_bill_policy = duplicate_bill_policy
+        self._bill_index = BillDuplicateIndex()
+        self._name_index = NameIndex()
+        self._network_search_cache = TTLCache(maxsize=network_search_cache_size, ttl=network_search_ttl)
+        self._list_snapshots = TTLCache(maxsize=len(QUERY_SOURCES), ttl=list_snapshot_ttl)
+        self._response_cache = ResponseCache(maxsize=response_cache_size)
+        self._reference_data = ReferenceDataStore(snapshot_path=reference_data_snapshot, refresh_interval=reference_data_refresh_interval)
+        self._payment_options = PaymentOptionsResolver(self._fetch_payment_options, ttl=payment_options_ttl)
+        self._inflight_gets = SingleFlight()
+        self.http_config = http_config or HttpConfig()
+        self.webhook_cache_ttl = webhook_cache_ttl
+        self._webhook_receiver: Optional[WebhookReceiver] = None
+        self._change_feeds: dict[str, ChangeFeed] = {}
+        self._audit_stores: dict[str, AuditTrailStore] = {}
+        self._upload_index = UploadIndex(upload_index_path)
+        self._outbox: Optional[Outbox] = None
+        self._custom_field_catalog = CustomFieldCatalog(
+            lambda: self._iter_results(self.list_custom_fields),
+            lambda field_id: self._iter_results(self.list_custom_field_values, customFieldId=field_id),
+        )
+        if outbox_path:
+            self._outbox = Outbox(outbox_path, self._outbox_handlers(), flush_interval=outbox_flush_interval).start()
+        if warm_up_connections > 0:
+            try:
+                self.warm_up(warm_up_connections)
+            except Exception:
+                logger.warning("Connection warm-up failed; connections will be opened on first use", exc_info=True)
+
+    @property
+    def client(self) -> httpx.Client:
+        """HTTP client built from `http_config` (pool limits, keep-alive, HTTP/2, per-family timeouts)."""
+        if self._client is None:
+            self._client = build_client(self.http_config, base_url=self.base_url, headers=self._get_headers(), default_timeout=self.default_timeout)
+        return self._client
+
+    def warm_up(self, connections: int = 1) -> int:
+        """Open up to `connections` pooled connections with concurrent health checks; returns how many succeeded.
+
+        The health endpoint is called on the client directly so the calls are
+        not coalesced by `_get`. Over HTTP/2 a single connection is multiplexed,
+        so one request is enough.
+        """
+        count = 1 if self.http_config.http2 else min(connections, self.http_config.max_connections)
+        url = f"{self.base_url}/v3/health"
+        outcomes = run_concurrently(lambda _: self.client.get(url).raise_for_status(), range(count), max_workers=count)
+        return sum(outcome.ok for outcome in outcomes)
+
+    def _get(self, url: str, params: Optional[dict[str, Any]] = None, **kwargs: Any) -> Any:
+        """GET with in-flight deduplication: concurrent identical requests share one network call.
+
+        Callers still decode the shared response separately, so each gets its
+        own copy of the body. Only requests already in flight are shared;
+        nothing is cached once the call completes.
+        """
+        if kwargs:
+            return super()._get(url, params=params, **kwargs)
+        return self._inflight_gets.do(request_key('GET', url, params), lambda: super(BillApp, self)._get(url, params=params))
+
+    def _iter_results(self, list_method: Callable[..., dict[str, Any]], **params: Any) -> Iterator[dict[str, Any]]:
+        """Yield every record of a paginated list endpoint, following `nextPage` tokens."""
+        page_param = 'nextPage' if 'nextPage' in inspect.signature(list_method).parameters else 'page'
+        params = {k: v for k, v in params.items() if v is not None}
+        params.setdefault('max', 100)
+        while True:
+            response = list_method(**params)
+            yield from response.get('results', [])
+            next_page = response.get('nextPage')
+            if not next_page:
+                return
+            params[page_param] = next_page
+
+    def _get_revalidated(self, url: str, list_method: Optional[Callable[..., dict[str, Any]]] = None, record_id: Optional[str] = None) -> dict[str, Any]:
+        """GET a detail endpoint through the response cache, revalidating instead of re-downloading.
+
+        Cached bodies are served while a `Cache-Control: max-age` window is open,
+        revalidated with `If-None-Match`/`If-Modified-Since` when the server sent
+        validators, and otherwise checked for an `updatedTime` change through a
+        one-record list query. While the webhook receiver runs, bodies stay
+        fresh for `webhook_cache_ttl` and change events evict them early.
+        Concurrent identical reads are coalesced into one request. Callers get
+        their own deep copy, so mutating a result never alters the cache.
+        """
+        entry = self._response_cache.get(url)
+        if entry is not None:
+            if entry.fresh_until > time.monotonic():
+                return copy.deepcopy(entry.body)
+            if not entry.has_http_validators and entry.updated_time and list_method is not None:
+                changed = list_method(max=1, filters=serialize_filters([Field('id').eq(record_id), Field('updatedTime').gt(entry.updated_time)]))
+                if not changed.get('results'):
+                    return copy.deepcopy(entry.body)
+        headers = entry.conditional_headers() if entry is not None else None
+        # Concurrent reads of the same URL with the same validators share one request.
+        response = self._inflight_gets.do(request_key('GET', url, {'headers': headers}), lambda: self.client.get(url, headers=headers))
+        max_age = parse_max_age(response.headers.get('Cache-Control'))
+        if self._webhook_receiver is not None and self._webhook_receiver.running:
+            # Changes are pushed to us, so cached bodies can be trusted for longer.
+            max_age = max(max_age or 0.0, self.webhook_cache_ttl)
+        fresh_until = time.monotonic() + max_age if max_age else 0.0
+        if response.status_code == 304 and entry is not None:
+            entry.fresh_until = fresh_until
+            return copy.deepcopy(entry.body)
+        response.raise_for_status()
+        body = self._handle_response(response)
+        self._response_cache.put(url, CachedResponse(
+            body=body,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            updated_time=body.get('updatedTime') if isinstance(body, dict) else None,
+            fresh_until=fresh_until,
+        ))
+        return copy.deepcopy(body)
+
+    def _invalidate_cached(self, url: str) -> None:
+        """Evict cached detail responses for `url` and its parent paths, the list snapshots and the custom field catalog it affects, after a write."""
+        path = url.split('?', 1)[0].rstrip('/')
+        if '/v3/spend/custom-fields' in path:
+            self._custom_field_catalog.invalidate()
+        relative = path.split('/v3/', 1)[-1]
+        for prefix, entities in WRITE_SNAPSHOTS.items():
+            if relative == prefix or relative.startswith(prefix + '/'):
+                for entity in entities:
+                    self._list_snapshots.invalidate(entity)
+        while len(path) > len(self.base_url):
+            self._response_cache.invalidate(path)
+            path = path.rsplit('/', 1)[0]
+
+    def _post(self, url: str, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return super()._post(url, *args, **kwargs)
+        finally:
+            self._invalidate_cached(url)
+
+    def _put(self, url: str, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return super()._put(url, *args, **kwargs)
+        finally:
+            self._invalidate_cached(url)
+
+    def _patch(self, url: str, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return super()._patch(url, *args, **kwargs)
+        finally:
+            self._invalidate_cached(url)
+
+    def _delete(self, url: str, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return super()._delete(url, *args, **kwargs)
+        finally:
+            self._invalidate_cached(url)
+
+    def _fetch_by_ids(self, list_method: Callable[..., dict[str, Any]], ids: List[str], **params: Any) -> dict[str, dict[str, Any]]:
+        """Fetch records by ID with `id:in:` list filters instead of one detail call per record."""
+        records = {}
+        for start in range(0, len(ids), ID_FILTER_CHUNK):
+            chunk = ids[start:start + ID_FILTER_CHUNK]
+            for record in self._iter_results(list_method, filters=serialize_filters(Field('id').in_(chunk)), **params):
+                records[record['id']] = record
+        return records
+
+    def _iter_transactions_with_fields(self, field_ids: List[str], **params: Any) -> Iterator[dict[str, Any]]:
+        """Yield transactions carrying every custom field in `field_ids`, without per-record lookups.
+
+        The first chunk of fields is requested on the listing itself; each
+        further chunk is one extra `list_transactions` pass per page, filtered
+        to that page's transaction IDs and merged by ID.
+        """
+        chunks = chunk_field_ids(field_ids)
+        page_size = params.get('max', 100)
+        page = []
+
+        def flush() -> Iterator[dict[str, Any]]:
+            ids = [record['id'] for record in page]
+            extra = [self._fetch_by_ids(self.list_transactions, ids, showCustomFieldIds=','.join(chunk)) for chunk in chunks[1:]] if ids else []
+            for record in page:
+                yield merge_custom_fields(record, [listing[record['id']] for listing in extra if record['id'] in listing])
+            page.clear()
+
+        for record in self._iter_results(self.list_transactions, showCustomFieldIds=','.join(chunks[0]) or None, **params):
+            page.append(record)
+            if len(page) >= page_size:
+                yield from flush()
+        yield from flush()
+
+    def _iter_enriched_transactions(self, custom_field_ids: Optional[List[str]] = None, **params: Any) -> Iterator[dict[str, Any]]:
+        """Yield transactions with `customFieldValues` for the requested fields, or every catalog field."""
+        field_ids = list(custom_field_ids) if custom_field_ids else list(self._custom_field_catalog.fields())
+        for record in self._iter_transactions_with_fields(field_ids, **params):
+            yield enrich(record, self._custom_field_catalog, field_ids)
+
+    def _audit_store(self, store_path: str) -> AuditTrailStore:
+        store = self._audit_stores.get(store_path)
+        if store is None:
+            store = self._audit_stores[store_path] = AuditTrailStore(store_path)
+        return store
+
+    def _store_check_image(self, paymentId: str, store: ContentStore) -> tuple[str, int, str]:
+        """Stream one check image into `store`; returns its digest, size and content type."""
+        url = f"{self.base_url}/v3/payments/{paymentId}/check-image"
+        with self.client.stream('GET', url) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if 'json' in content_type:
+                # The image is embedded as base64; only this one payload is held in memory.
+                response.read()
+                digest, size = store.put_stream([decode_check_image(response.json())])
+            else:
+                digest, size = store.put_stream(response.iter_bytes())
+        return digest, size, content_type
+
+    def _upload_once(self, target: str, items: List[bytes], send: Callable[[], Any]) -> Any:
+        """Upload unless identical content already went to `target`, in which case return the earlier response.
+
+        `target` names both the object and the file name, so the same content
+        uploaded under another name is a new attachment. The index only knows about uploads made through this app; a file
+        removed on the Bill side is not re-uploaded while its entry remains.
+        """
+        return self._upload_index.upload(content_digest(items), target, send)
+
+    def _outbox_handlers(self) -> dict[str, OutboxHandler]:
+        """Mutations the outbox accepts; arguments are the keyword arguments of the method of the same name."""
+        return {
+            'create_bill': OutboxHandler(lambda args: self.create_bill(**args), self.create_bulk_bills),
+            'update_bill': OutboxHandler(lambda args: self.update_bill(**args)),
+            'create_vendor': OutboxHandler(lambda args: self.create_vendor(**args), self.create_bulk_vendor),
+            'update_vendor': OutboxHandler(lambda args: self.update_vendor(**args)),
+            'create_customer': OutboxHandler(lambda args: self.create_customer(**args)),
+            'create_invoice': OutboxHandler(lambda args: self.create_invoice(**args)),
+        }
+
+    def _require_outbox(self) -> Outbox:
+        if self._outbox is None:
+            raise ValueError("The write-behind outbox is disabled; construct BillApp with `outbox_path` to enable it.")
+        return self._outbox
+
+    def _apply_webhook_event(self, event: WebhookEvent) -> None:
+        """Drop or refresh every local copy of the object a webhook event reports as changed."""
+        collection = WEBHOOK_ENTITIES.get(event.entity)
+        if collection is None:
+            return
+        self._list_snapshots.invalidate(collection)
+        if not event.object_id:
+            return
+        self._response_cache.invalidate(f"{self.base_url}/v3/{collection}/{event.object_id}")
+        if event.entity in NAME_INDEX_SOURCES:
+            if event.record is not None:
+                self._index_names(event.entity, [event.record])
+            elif event.action == 'archived':
+                self._name_index.remove(event.object_id)
+        if event.entity == 'vendor':
+            self._payment_options.invalidate(event.object_id)
+        if event.entity == 'bill':
+            self._bill_index.discard(event.object_id)
+            if event.record is not None and not event.record.get('archived') and event.action != 'archived':
+                self._remember_bills([event.record])
+
+    def _check_duplicate_bills(self, bills: List[dict[str, Any]]) -> None:
+        """Pre-flight duplicate check for bills about to be created, according to `duplicate_bill_policy`."""
+        if self.duplicate_bill_policy == 'off':
+            return
+        if not self._bill_index.loaded:
+            self._bill_index.load(self._iter_results(self.list_bills))
+        duplicates = self._bill_index.find_duplicates(bills)
+        if not duplicates:
+            return
+        if self.duplicate_bill_policy == 'block':
+            raise DuplicateBillError(duplicates)
+        logger.warning("Creating possible duplicate bill(s): %s", duplicates)
+
+    def _index_names(self, entity_type: str, records: List[dict[str, Any]]) -> None:
+        """Keep the name index current after a vendor or customer write, once that type has been loaded."""
+        if entity_type in self._name_index.loaded_types:
+            for record in records:
+                if isinstance(record, dict):
+                    self._name_index.add(entity_type, record)
+
+    def _remember_bills(self, bills: List[dict[str, Any]]) -> None:
+        """Keep the duplicate index current from bill write responses, once it has been loaded."""
+        if self._bill_index.loaded:
+            self._bill_index.add(bill for bill in bills if isinstance(bill, dict))
+
+    def _fetch_payment_options(self, vendorId: str, amount: float) -> dict[str, Any]:
+        url = f"{self.base_url}/v3/payments/options"
+        query_params = {k: v for k, v in [('vendorId', vendorId), ('amount', amount)] if v is not None}
+        response = self._get(url, params=query_params)
+        return self._handle_response(response)
 
     def list_customer_attachments(self, customerId: str, max: Optional[int] = None, page: Optional[str] = None) -> dict[str, Any]:
         """
@@ -36,6 +419,8 @@ class BillApp(APIApplication):
         """
         Upload customer attachment
 
+        Re-uploading content this customer already has under the same name returns the earlier response without sending the file.
+
         Args:
             customerId (string): customerId
             name (string): No description provided.
@@ -56,8 +441,7 @@ class BillApp(APIApplication):
         request_body_data = items
         url = f"{self.base_url}/v3/attachments/customers/{customerId}"
         query_params = {k: v for k, v in [('name', name)] if v is not None}
-        response = self._post(url, data=request_body_data, params=query_params, content_type='application/octet-stream')
-        return self._handle_response(response)
+        return self._upload_once(f"customer:{customerId}:{name}", items, lambda: self._handle_response(self._post(url, data=request_body_data, params=query_params, content_type='application/octet-stream')))
 
     def list_invoice_attachments(self, invoiceId: str, max: Optional[int] = None, page: Optional[str] = None) -> dict[str, Any]:
         """
@@ -88,6 +472,8 @@ class BillApp(APIApplication):
         """
         Upload invoice attachment
 
+        Content already attached to this invoice under the same name is not sent again; the earlier upload response is returned.
+
         Args:
             invoiceId (string): invoiceId
             name (string): No description provided.
@@ -108,8 +494,7 @@ class BillApp(APIApplication):
         request_body_data = items
         url = f"{self.base_url}/v3/attachments/invoices/{invoiceId}"
         query_params = {k: v for k, v in [('name', name)] if v is not None}
-        response = self._post(url, data=request_body_data, params=query_params, content_type='application/octet-stream')
-        return self._handle_response(response)
+        return self._upload_once(f"invoice:{invoiceId}:{name}", items, lambda: self._handle_response(self._post(url, data=request_body_data, params=query_params, content_type='application/octet-stream')))
 
     def list_vendor_attachments(self, vendorId: str, max: Optional[int] = None, page: Optional[str] = None) -> dict[str, Any]:
         """
@@ -140,6 +525,8 @@ class BillApp(APIApplication):
         """
         Upload vendor attachment
 
+        Identical content already uploaded for this vendor under the same name is skipped and the earlier response returned.
+
         Args:
             vendorId (string): vendorId
             name (string): No description provided.
@@ -160,8 +547,7 @@ class BillApp(APIApplication):
         request_body_data = items
         url = f"{self.base_url}/v3/attachments/vendors/{vendorId}"
         query_params = {k: v for k, v in [('name', name)] if v is not None}
-        response = self._post(url, data=request_body_data, params=query_params, content_type='application/octet-stream')
-        return self._handle_response(response)
+        return self._upload_once(f"vendor:{vendorId}:{name}", items, lambda: self._handle_response(self._post(url, data=request_body_data, params=query_params, content_type='application/octet-stream')))
 
     def get_attachment(self, attachmentId: str) -> dict[str, Any]:
         """
@@ -228,6 +614,7 @@ class BillApp(APIApplication):
 
         Raises:
             HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+            DuplicateBillError: Raised when `duplicate_bill_policy` is `block` and a bill matches an existing bill.
 
         Tags:
             bills
@@ -243,10 +630,13 @@ class BillApp(APIApplication):
             'classifications': classifications,
         }
         request_body_data = {k: v for k, v in request_body_data.items() if v is not None}
+        self._check_duplicate_bills([request_body_data])
         url = f"{self.base_url}/v3/bills"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        bill = self._handle_response(response)
+        self._remember_bills([bill])
+        return bill
 
     def create_bulk_bills(self, items: List[dict[str, Any]]) -> list[Any]:
         """
@@ -259,6 +649,7 @@ class BillApp(APIApplication):
 
         Raises:
             HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+            DuplicateBillError: Raised when `duplicate_bill_policy` is `block` and a bill matches an existing bill.
 
         Tags:
             bills
@@ -266,10 +657,13 @@ class BillApp(APIApplication):
         request_body_data = None
         # Using array parameter 'items' directly as request body
         request_body_data = items
+        self._check_duplicate_bills(items)
         url = f"{self.base_url}/v3/bills/bulk"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        bills = self._handle_response(response)
+        self._remember_bills(bills if isinstance(bills, list) else [])
+        return bills
 
     def get_bill(self, billId: str) -> dict[str, Any]:
         """
@@ -290,9 +684,7 @@ class BillApp(APIApplication):
         if billId is None:
             raise ValueError("Missing required parameter 'billId'.")
         url = f"{self.base_url}/v3/bills/{billId}"
-        query_params = {}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._get_revalidated(url, self.list_bills, billId)
 
     def replace_bill(self, billId: str, vendorId: str, dueDate: str, billLineItems: List[dict[str, Any]], invoice: Any, description: Optional[str] = None, payFromChartOfAccountId: Optional[str] = None, classifications: Optional[Any] = None) -> dict[str, Any]:
         """
@@ -333,7 +725,9 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/bills/{billId}"
         query_params = {}
         response = self._put(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        bill = self._handle_response(response)
+        self._remember_bills([bill])
+        return bill
 
     def update_bill(self, billId: str, vendorId: Optional[str] = None, description: Optional[str] = None, dueDate: Optional[str] = None, billLineItems: Optional[List[dict[str, Any]]] = None, invoice: Optional[Any] = None, payFromChartOfAccountId: Optional[str] = None, classifications: Optional[Any] = None) -> dict[str, Any]:
         """
@@ -374,7 +768,9 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/bills/{billId}"
         query_params = {}
         response = self._patch(url, data=request_body_data, params=query_params)
-        return self._handle_response(response)
+        bill = self._handle_response(response)
+        self._remember_bills([bill])
+        return bill
 
     def archive_bill(self, billId: str) -> dict[str, Any]:
         """
@@ -398,7 +794,9 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/bills/{billId}/archive"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        result = self._handle_response(response)
+        self._bill_index.discard(billId)
+        return result
 
     def restore_bill(self, billId: str) -> dict[str, Any]:
         """
@@ -422,7 +820,9 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/bills/{billId}/restore"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        bill = self._handle_response(response)
+        self._remember_bills([bill])
+        return bill
 
     def list_classification_accounting_classes(self, max: Optional[int] = None, sort: Optional[str] = None, filters: Optional[str] = None, page: Optional[str] = None) -> dict[str, Any]:
         """
@@ -2288,7 +2688,9 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/customers"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        customer = self._handle_response(response)
+        self._index_names('customer', [customer])
+        return customer
 
     def get_customer(self, customerId: str) -> dict[str, Any]:
         """
@@ -2309,9 +2711,7 @@ class BillApp(APIApplication):
         if customerId is None:
             raise ValueError("Missing required parameter 'customerId'.")
         url = f"{self.base_url}/v3/customers/{customerId}"
-        query_params = {}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._get_revalidated(url, self.list_customers, customerId)
 
     def update_customer(self, customerId: str, name: Optional[str] = None, companyName: Optional[str] = None, contact: Optional[Any] = None, email: Optional[str] = None, phone: Optional[str] = None, fax: Optional[str] = None, description: Optional[str] = None, invoiceCurrency: Optional[Any] = None, accountType: Optional[Any] = None, paymentTermId: Optional[str] = None, accountNumber: Optional[str] = None, billingAddress: Optional[Any] = None, shippingAddress: Optional[Any] = None) -> dict[str, Any]:
         """
@@ -2364,7 +2764,9 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/customers/{customerId}"
         query_params = {}
         response = self._patch(url, data=request_body_data, params=query_params)
-        return self._handle_response(response)
+        customer = self._handle_response(response)
+        self._index_names('customer', [customer])
+        return customer
 
     def archive_customer(self, customerId: str) -> dict[str, Any]:
         """
@@ -2388,7 +2790,9 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/customers/{customerId}/archive"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        customer = self._handle_response(response)
+        self._index_names('customer', [customer])
+        return customer
 
     def restore_customer(self, customerId: str) -> dict[str, Any]:
         """
@@ -2412,7 +2816,9 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/customers/{customerId}/restore"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        customer = self._handle_response(response)
+        self._index_names('customer', [customer])
+        return customer
 
     def list_documents(self, billId: str, max: Optional[int] = None, page: Optional[str] = None) -> dict[str, Any]:
         """
@@ -2443,6 +2849,8 @@ class BillApp(APIApplication):
         """
         Upload bill document
 
+        A document whose content was already uploaded to this bill under the same name is not sent again; the earlier response is returned.
+
         Args:
             billId (string): billId
             name (string): No description provided.
@@ -2463,8 +2871,7 @@ class BillApp(APIApplication):
         request_body_data = items
         url = f"{self.base_url}/v3/documents/bills/{billId}"
         query_params = {k: v for k, v in [('name', name)] if v is not None}
-        response = self._post(url, data=request_body_data, params=query_params, content_type='application/octet-stream')
-        return self._handle_response(response)
+        return self._upload_once(f"bill:{billId}:{name}", items, lambda: self._handle_response(self._post(url, data=request_body_data, params=query_params, content_type='application/octet-stream')))
 
     def upload_status(self, ids: str) -> list[Any]:
         """
@@ -2829,8 +3236,7 @@ class BillApp(APIApplication):
         """
         url = f"{self.base_url}/v3/funding-accounts/cards/funding-purposes"
         query_params = {k: v for k, v in [('vendorId', vendorId), ('brand', brand)] if v is not None}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._reference_data.get('list_card_funding_purposes', {'url': url, **query_params}, lambda: self._handle_response(self._get(url, params=query_params)))
 
     def list_card_account_users(self, max: Optional[int] = None, sort: Optional[str] = None, filters: Optional[str] = None, page: Optional[str] = None, currentUser: Optional[bool] = None) -> dict[str, Any]:
         """
@@ -3491,8 +3897,14 @@ class BillApp(APIApplication):
         """
         url = f"{self.base_url}/v3/network"
         query_params = {k: v for k, v in [('name', name), ('scope', scope), ('zipOrPostalCode', zipOrPostalCode), ('accountNumber', accountNumber)] if v is not None}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        # Identical directory searches within the TTL, or already in flight, share one request.
+        cache_key = (
+            ' '.join((name or '').lower().split()),
+            str(scope).upper() if scope is not None else None,
+            (zipOrPostalCode or '').replace(' ', '').upper(),
+            (accountNumber or '').strip(),
+        )
+        return self._network_search_cache.get_or_load(cache_key, lambda: self._handle_response(self._get(url, params=query_params)))
 
     def accept_invitation(self, networkId: str, type: Any, id: Optional[str] = None, name: Optional[str] = None) -> Any:
         """
@@ -3709,8 +4121,7 @@ class BillApp(APIApplication):
         """
         url = f"{self.base_url}/v3/organizations/industries"
         query_params = {}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._reference_data.get('list_industries', {'url': url, **query_params}, lambda: self._handle_response(self._get(url, params=query_params)))
 
     def get_organization(self, organizationId: str) -> dict[str, Any]:
         """
@@ -3731,9 +4142,7 @@ class BillApp(APIApplication):
         if organizationId is None:
             raise ValueError("Missing required parameter 'organizationId'.")
         url = f"{self.base_url}/v3/organizations/{organizationId}"
-        query_params = {}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._get_revalidated(url)
 
     def update_organization(self, organizationId: str, name: Optional[str] = None, address: Optional[Any] = None, mailingAddress: Optional[Any] = None, phone: Optional[str] = None, companyOwner: Optional[Any] = None, taxId: Optional[str] = None, taxIdType: Optional[Any] = None, industry: Optional[str] = None, businessCategory: Optional[Any] = None, accountType: Optional[Any] = None, processingOptions: Optional[Any] = None) -> dict[str, Any]:
         """
@@ -3804,8 +4213,7 @@ class BillApp(APIApplication):
             raise ValueError("Missing required parameter 'organizationId'.")
         url = f"{self.base_url}/v3/organizations/{organizationId}/price-plan"
         query_params = {}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._reference_data.get('get_price_plan', {'url': url, **query_params}, lambda: self._handle_response(self._get(url, params=query_params)))
 
     def partner_login(self, appKey: str, username: str, password: str) -> dict[str, Any]:
         """
@@ -3995,8 +4403,7 @@ class BillApp(APIApplication):
         """
         url = f"{self.base_url}/v3/partner/roles"
         query_params = {k: v for k, v in [('max', max), ('sort', sort), ('filters', filters), ('page', page)] if v is not None}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._reference_data.get('list_partner_user_roles', {'url': url, **query_params}, lambda: self._handle_response(self._get(url, params=query_params)))
 
     def get_partner_user_role(self, roleId: str) -> dict[str, Any]:
         """
@@ -4323,6 +4730,9 @@ class BillApp(APIApplication):
         """
         Get list of vendor payment options
 
+        Options are cached per vendor and order-of-magnitude amount bucket, and
+        dropped when the vendor, its bank account or its configuration changes.
+
         Args:
             vendorId (string): No description provided.
             amount (number): No description provided.
@@ -4336,10 +4746,7 @@ class BillApp(APIApplication):
         Tags:
             payments
         """
-        url = f"{self.base_url}/v3/payments/options"
-        query_params = {k: v for k, v in [('vendorId', vendorId), ('amount', amount)] if v is not None}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._payment_options.get(vendorId, amount)
 
     def get_payment(self, paymentId: str) -> dict[str, Any]:
         """
@@ -4360,9 +4767,7 @@ class BillApp(APIApplication):
         if paymentId is None:
             raise ValueError("Missing required parameter 'paymentId'.")
         url = f"{self.base_url}/v3/payments/{paymentId}"
-        query_params = {}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._get_revalidated(url, self.list_payments, paymentId)
 
     def cancel_payment(self, paymentId: str) -> dict[str, Any]:
         """
@@ -4781,8 +5186,7 @@ class BillApp(APIApplication):
         """
         url = f"{self.base_url}/v3/roles"
         query_params = {k: v for k, v in [('max', max), ('sort', sort), ('filters', filters), ('page', page)] if v is not None}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._reference_data.get('list_organization_user_roles', {'url': url, **query_params}, lambda: self._handle_response(self._get(url, params=query_params)))
 
     def get_organization_user_role(self, roleId: str) -> dict[str, Any]:
         """
@@ -6347,7 +6751,9 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/vendors"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        vendor = self._handle_response(response)
+        self._index_names('vendor', [vendor])
+        return vendor
 
     def create_bulk_vendor(self, items: List[dict[str, Any]]) -> dict[str, Any]:
         """
@@ -6370,7 +6776,9 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/vendors/bulk"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        vendors = self._handle_response(response)
+        self._index_names('vendor', vendors if isinstance(vendors, list) else [])
+        return vendors
 
     def get_intl_config(self, country: Any, billCurrency: Any, accountType: Any) -> dict[str, Any]:
         """
@@ -6392,8 +6800,7 @@ class BillApp(APIApplication):
         """
         url = f"{self.base_url}/v3/vendors/configuration/international-payments"
         query_params = {k: v for k, v in [('country', country), ('billCurrency', billCurrency), ('accountType', accountType)] if v is not None}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._reference_data.get('get_intl_config', {'url': url, **query_params}, lambda: self._handle_response(self._get(url, params=query_params)))
 
     def get_vendor(self, vendorId: str) -> dict[str, Any]:
         """
@@ -6414,9 +6821,7 @@ class BillApp(APIApplication):
         if vendorId is None:
             raise ValueError("Missing required parameter 'vendorId'.")
         url = f"{self.base_url}/v3/vendors/{vendorId}"
-        query_params = {}
-        response = self._get(url, params=query_params)
-        return self._handle_response(response)
+        return self._get_revalidated(url, self.list_vendors, vendorId)
 
     def update_vendor(self, vendorId: str, name: Optional[str] = None, shortName: Optional[str] = None, accountNumber: Optional[str] = None, accountType: Optional[Any] = None, email: Optional[str] = None, phone: Optional[str] = None, address: Optional[Any] = None, paymentInformation: Optional[Any] = None, additionalInfo: Optional[Any] = None, billCurrency: Optional[Any] = None, autoPay: Optional[Any] = None) -> dict[str, Any]:
         """
@@ -6467,7 +6872,10 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/vendors/{vendorId}"
         query_params = {}
         response = self._patch(url, data=request_body_data, params=query_params)
-        return self._handle_response(response)
+        vendor = self._handle_response(response)
+        self._payment_options.invalidate(vendorId)
+        self._index_names('vendor', [vendor])
+        return vendor
 
     def archive_vendor(self, vendorId: str) -> dict[str, Any]:
         """
@@ -6491,7 +6899,10 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/vendors/{vendorId}/archive"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        vendor = self._handle_response(response)
+        self._payment_options.invalidate(vendorId)
+        self._index_names('vendor', [vendor])
+        return vendor
 
     def get_vendor_bank_account(self, vendorId: str) -> dict[str, Any]:
         """
@@ -6561,6 +6972,7 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/vendors/{vendorId}/bank-account"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
+        self._payment_options.invalidate(vendorId)
         return self._handle_response(response)
 
     def delete_vendor_bank_account(self, vendorId: str) -> Any:
@@ -6584,6 +6996,7 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/vendors/{vendorId}/bank-account"
         query_params = {}
         response = self._delete(url, params=query_params)
+        self._payment_options.invalidate(vendorId)
         return self._handle_response(response)
 
     def get_configuration_by_vendor_id(self, vendorId: str) -> dict[str, Any]:
@@ -6631,7 +7044,909 @@ class BillApp(APIApplication):
         url = f"{self.base_url}/v3/vendors/{vendorId}/restore"
         query_params = {}
         response = self._post(url, data=request_body_data, params=query_params, content_type='application/json')
-        return self._handle_response(response)
+        vendor = self._handle_response(response)
+        self._payment_options.invalidate(vendorId)
+        self._index_names('vendor', [vendor])
+        return vendor
+
+    def export_ap_data(self, output_dir: str, entities: Optional[List[str]] = None, partition_by: Optional[str] = 'month', filters: Optional[str] = None, file_format: str = 'parquet', batch_size: int = 10000, overwrite: bool = False) -> dict[str, Any]:
+        """
+        Export bills, payments and spend transactions to partitioned Parquet or Arrow files
+
+        Args:
+            output_dir (string): Directory the export is written to. Each entity is written to its own subdirectory.
+            entities (array): Entities to export, any of `bills`, `payments` and `transactions`. Defaults to all of them.
+            partition_by (string): Partition granularity, one of `year`, `month` or `day`, or null for no partitioning.
+            filters (string): Filter expression passed to every list endpoint, e.g. to restrict the export to one year.
+            file_format (string): Output format, `parquet` or `arrow`.
+            batch_size (integer): Maximum number of rows buffered per partition before a part file is written.
+            overwrite (boolean): Replace an existing non-empty entity directory instead of failing.
+
+        Returns:
+            dict[str, Any]: Rows, files and partitions written per entity
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+            ImportError: Raised when pyarrow is not installed.
+            ValueError: Raised when an entity, partitioning or file format is not supported.
+
+        Tags:
+            export, bills, payments, transactions
+        """
+        if output_dir is None:
+            raise ValueError("Missing required parameter 'output_dir'.")
+        entities = entities or list(EXPORT_SOURCES)
+        unknown = [entity for entity in entities if entity not in EXPORT_SOURCES]
+        if unknown:
+            raise ValueError(f"Unsupported export entities {unknown}; expected any of {sorted(EXPORT_SOURCES)}.")
+        summary = {}
+        for entity in entities:
+            method_name, partition_field = EXPORT_SOURCES[entity]
+            writer = PartitionedWriter(
+                os.path.join(output_dir, entity),
+                partition_by=partition_by,
+                partition_field=partition_field,
+                batch_size=batch_size,
+                file_format=file_format,
+                overwrite=overwrite,
+            )
+            writer.write_all(self._iter_results(getattr(self, method_name), filters=filters))
+            summary[entity] = writer.close()
+        return summary
+
+    def get_ap_aging_report(self, as_of_date: Optional[str] = None, bucket_days: Optional[List[int]] = None, filters: Optional[str] = None, include_closed: bool = False, top_vendors: Optional[int] = None) -> dict[str, Any]:
+        """
+        Compute an accounts payable aging summary over all open bills
+
+        Args:
+            as_of_date (string): Date the aging is computed for, in the `yyyy-MM-dd` format. Defaults to today.
+            bucket_days (array): Upper bounds of the overdue buckets in days. Defaults to `[30, 60, 90]`.
+            filters (string): Filter expression passed to `list_bills` to restrict the bills considered. Archived and closed bills are filtered out on the server unless `filters` conditions `archived` or `paymentStatus` itself.
+            include_closed (boolean): Also age closed bills, whose payment status is `PAID` or `SCHEDULED`.
+            top_vendors (integer): Only return the given number of vendors with the largest outstanding totals.
+
+        Returns:
+            dict[str, Any]: Bucket totals and counts, overdue totals and per-vendor aging
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+            ImportError: Raised when numpy is not installed.
+            ValueError: Raised when the date or bucket bounds are invalid.
+
+        Tags:
+            bills, reports
+        """
+        as_of = date.fromisoformat(as_of_date) if as_of_date else None
+        conditions = parse_filters(filters)
+        # Bills the aging drops anyway are excluded on the server instead of being listed.
+        filtered = {condition.field for condition in conditions}
+        if 'archived' not in filtered:
+            conditions.append(Field('archived').eq(False))
+        if not include_closed and 'paymentStatus' not in filtered:
+            conditions.append(Field('paymentStatus').nin(sorted(CLOSED_BILL_STATUSES)))
+        columns = BillColumns.from_records(self._iter_results(self.list_bills, filters=serialize_filters(conditions)), include_closed=include_closed)
+        return compute_aging(columns, as_of=as_of, bucket_days=bucket_days or DEFAULT_BUCKET_DAYS, top_vendors=top_vendors)
+
+    def forecast_cash_requirements(self, days: int = 90, start_date: Optional[str] = None) -> dict[str, Any]:
+        """
+        Forecast day-by-day cash outflows per funding account from open bills, recurring bills and pending payments
+
+        Args:
+            days (integer): Number of days to forecast, starting at `start_date`.
+            start_date (string): First forecast day in the `yyyy-MM-dd` format. Defaults to today. Overdue bills are due on this day.
+
+        Returns:
+            dict[str, Any]: Forecast dates, daily totals, per-account daily outflows and the number of recomputed input records
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+            ValueError: Raised when a date or recurring schedule is invalid.
+
+        Tags:
+            bills, recurringbills, payments, reports
+        """
+        start = date.fromisoformat(start_date) if start_date else date.today()
+        forecaster = self._cash_forecaster
+        if forecaster is None:
+            forecaster = self._cash_forecaster = CashForecaster()
+        # Only open records are listed; records that drop out of a listing are removed from the forecast.
+        # Payments first: bills they already cover are excluded from the bill outflows.
+        recomputed = forecaster.sync('payments', self._iter_results(self.list_payments, filters=serialize_filters(Field('status').in_(sorted(PENDING_PAYMENT_STATUSES)))))
+        recomputed += forecaster.sync('recurring_bills', self._iter_results(self.list_recurring_bills, filters=serialize_filters(Field('archived').eq(False))))
+        open_bills = [Field('archived').eq(False), Field('paymentStatus').nin(sorted(CLOSED_BILL_STATUSES))]
+        recomputed += forecaster.sync('bills', self._iter_results(self.list_bills, filters=serialize_filters(open_bills)))
+        result = forecaster.series(start, days)
+        result['recomputed'] = recomputed
+        return result
+
+    def refresh_spend_analytics(self, full_refresh: bool = False, filters: Optional[str] = None) -> dict[str, Any]:
+        """
+        Load card transactions into the local spend analytics store, fetching only new or changed ones when possible
+
+        After the first load, only transactions updated since the latest
+        `updatedTime` in the store are listed. Every custom field is requested
+        with `showCustomFieldIds` so custom-field dimensions are populated.
+
+        Args:
+            full_refresh (boolean): Drop the store and reload every transaction instead of refreshing incrementally.
+            filters (string): Filter expression passed to `list_transactions`. Changing it reloads the store.
+
+        Returns:
+            dict[str, Any]: Counts of inserted, updated and unchanged transactions and the resulting store size
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+            ImportError: Raised when numpy is not installed.
+
+        Tags:
+            transactions, reports
+        """
+        store = self._spend_store
+        if store is None or full_refresh or filters != self._spend_filters:
+            store = self._spend_store = SpendStore()
+            self._spend_filters = filters
+        conditions = parse_filters(filters)
+        if store.watermark:
+            # `gte` re-reads transactions sharing the watermark time; their fingerprints mark them unchanged.
+            conditions.append(Field('updatedTime').gte(store.watermark))
+        records = self._iter_transactions_with_fields(
+            list(self._custom_field_catalog.fields()),
+            filters=serialize_filters(conditions),
+            sort=serialize_sort(Field('updatedTime').asc()),
+        )
+        counts = store.upsert(records)
+        counts['size'] = len(store)
+        return counts
+
+    def query_spend_analytics(self, group_by: Optional[List[str]] = None, filters: Optional[dict[str, Any]] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, top: Optional[int] = None) -> dict[str, Any]:
+        """
+        Sum and count card spend grouped by budget, card, user, merchant, custom field value or period
+
+        Args:
+            group_by (array): Dimensions to group by: `budgetId`, `cardId`, `userId`, `merchantName`, `transactionType`, `day`, `month`, `year` or `customField:<customFieldId>`.
+            filters (object): Map of dimension to an accepted value or list of accepted values.
+            start_date (string): First transaction date included, in the `yyyy-MM-dd` format.
+            end_date (string): Last transaction date included, in the `yyyy-MM-dd` format.
+            top (integer): Only return the given number of groups with the largest totals.
+
+        Returns:
+            dict[str, Any]: Groups with their total amount and transaction count, largest first
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+            ImportError: Raised when numpy is not installed.
+            ValueError: Raised when a dimension is unknown.
+
+        Tags:
+            transactions, reports
+        """
+        if self._spend_store is None:
+            self.refresh_spend_analytics()
+        rows = self._spend_store.query(group_by or [], filters=filters, start_date=start_date, end_date=end_date, top=top)
+        return {'groups': rows, 'transactions': len(self._spend_store)}
+
+    def check_duplicate_bills(self, items: List[dict[str, Any]], refresh: bool = False) -> dict[str, Any]:
+        """
+        Check bills against the local duplicate-bill index before creating them
+
+        Args:
+            items (array): Bills in the `create_bill` request format. Bills are matched on vendor ID, invoice number, total amount and invoice date.
+            refresh (boolean): Rebuild the index from `list_bills` before checking.
+
+        Returns:
+            dict[str, Any]: Duplicates found, each with the item index and the matching bill ID or earlier item
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+
+        Tags:
+            bills
+        """
+        if refresh or not self._bill_index.loaded:
+            self._bill_index.load(self._iter_results(self.list_bills))
+        duplicates = self._bill_index.find_duplicates(items)
+        return {'duplicates': duplicates, 'checked': len(items), 'indexed': len(self._bill_index)}
+
+    def reconcile_invoice_payments(self, payments: List[dict[str, Any]], amount_tolerance: float = 0.0, allow_partial: bool = False, default_payment_type: str = 'OTHER', invoice_filters: Optional[str] = None, submit: bool = False, max_concurrency: int = 4, requests_per_second: float = 5.0) -> dict[str, Any]:
+        """
+        Match incoming customer payments to open invoices and build or submit `record_invoice` requests
+
+        Args:
+            payments (array): Incoming payments, each with `amount` and optionally `customerId`, `reference` (one or more invoice numbers separated by commas), `paymentDate`, `paymentType` and `description`.
+            amount_tolerance (number): Largest absolute difference accepted between a payment and the invoices it settles.
+            allow_partial (boolean): Record a payment smaller than the referenced invoice's due amount as a partial payment.
+            default_payment_type (string): Payment type used when a payment does not set `paymentType`.
+            invoice_filters (string): Filter expression passed to `list_invoices` to restrict the candidate invoices.
+            submit (boolean): Call `record_invoice` for every match instead of only returning the requests.
+            max_concurrency (integer): Maximum number of `record_invoice` calls in flight when submitting.
+            requests_per_second (number): Upper bound on the submission rate.
+
+        Returns:
+            dict[str, Any]: Matches, unmatched payments, the `record_invoice` requests and, when submitted, a success or error entry per request
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+
+        Tags:
+            invoices, reconciliation
+        """
+        reconciler = InvoiceReconciler(self._iter_results(self.list_invoices, filters=invoice_filters), amount_tolerance=amount_tolerance, allow_partial=allow_partial)
+        result = reconciler.reconcile(payments, default_payment_type=default_payment_type)
+        if submit:
+            limiter = RateLimiter(requests_per_second, burst=max_concurrency)
+            outcomes = run_concurrently(lambda request: self.record_invoice(**request), result['recordInvoiceRequests'], max_workers=max_concurrency, rate_limiter=limiter)
+            submitted = []
+            for match, outcome in zip(result['matches'], outcomes):
+                entry = {'index': match['index'], 'invoiceIds': match['invoiceIds']}
+                submitted.append({**entry, 'status': 'recorded', 'result': outcome.result} if outcome.ok else {**entry, 'status': 'failed', 'error': str(outcome.error)})
+            result['submitted'] = submitted
+        return result
+
+    def find_counterparties(self, name: str, entity_types: Optional[List[str]] = None, limit: int = 10, min_score: float = 0.3, fallback: bool = True, refresh: bool = False) -> dict[str, Any]:
+        """
+        Fuzzy-search vendor and customer names in a local index, calling the API only on misses
+
+        Args:
+            name (string): Name or partial name to look up.
+            entity_types (array): Entity types to search, any of `vendor` and `customer`. Defaults to both.
+            limit (integer): Maximum number of matches returned.
+            min_score (number): Minimum match score; 1.0 or more means an exact match after normalization.
+            fallback (boolean): When nothing matches locally, query the list endpoints with a name prefix filter and index the results.
+            refresh (boolean): Reload the index from the list endpoints before searching.
+
+        Returns:
+            dict[str, Any]: Ranked matches with ID, type, name and score, and whether they came from the index or the API
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+            ValueError: Raised when an entity type is not supported.
+
+        Tags:
+            vendors, customers, search
+        """
+        if name is None:
+            raise ValueError("Missing required parameter 'name'.")
+        entity_types = entity_types or list(NAME_INDEX_SOURCES)
+        unknown = [entity_type for entity_type in entity_types if entity_type not in NAME_INDEX_SOURCES]
+        if unknown:
+            raise ValueError(f"Unsupported entity types {unknown}; expected any of {sorted(NAME_INDEX_SOURCES)}.")
+        for entity_type in entity_types:
+            if refresh or entity_type not in self._name_index.loaded_types:
+                self._name_index.load(entity_type, self._iter_results(getattr(self, NAME_INDEX_SOURCES[entity_type])))
+        matches = self._name_index.search(name, limit=limit, min_score=min_score, entity_types=entity_types)
+        if matches or not fallback:
+            return {'matches': matches, 'source': 'index'}
+        prefix = name.strip()
+        for entity_type in entity_types:
+            response = getattr(self, NAME_INDEX_SOURCES[entity_type])(filters=Field('name').startswith(prefix).to_wire())
+            for record in response.get('results', []):
+                self._name_index.add(entity_type, record)
+        matches = self._name_index.search(name, limit=limit, min_score=min_score, entity_types=entity_types)
+        return {'matches': matches, 'source': 'api'}
+
+    def query_records(self, entity: str, filters: Optional[Any] = None, sort: Optional[Any] = None, max: int = 100, source: str = 'auto') -> dict[str, Any]:
+        """
+        Query a list endpoint with typed filters, answering from a local snapshot when one is available
+
+        Args:
+            entity (string): One of `bills`, `recurring_bills`, `payments`, `invoices`, `vendors`, `customers` or `transactions`.
+            filters (array): Conditions as `{field, op, value}` objects, with `op` one of `eq`, `ne`, `gt`, `gte`, `lt`, `lte`, `in`, `nin` or `sw`, or a raw `filters` string. Dotted fields address nested values.
+            sort (array): Sort fields as `field:asc`/`field:desc` strings, or a raw `sort` string.
+            max (integer): Maximum number of records returned.
+            source (string): `auto` uses a fresh local snapshot when present and the API otherwise, `local` loads a snapshot if needed, `api` always calls the API.
+
+        Returns:
+            dict[str, Any]: Matching records and whether they were served locally or by the API
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+            ValueError: Raised when the entity, source or a filter operator is not supported.
+
+        Tags:
+            query
+        """
+        if entity not in QUERY_SOURCES:
+            raise ValueError(f"Unsupported entity '{entity}'; expected one of {sorted(QUERY_SOURCES)}.")
+        if source not in ('auto', 'local', 'api'):
+            raise ValueError("source must be one of 'auto', 'local' or 'api'.")
+        list_method = getattr(self, QUERY_SOURCES[entity])
+        snapshot = MISSING if source == 'api' else self._list_snapshots.get(entity)
+        if snapshot is MISSING and source == 'local':
+            snapshot = self._list_snapshots.get_or_load(entity, lambda: list(self._iter_results(list_method)))
+        if snapshot is not MISSING:
+            return {'results': apply_query(snapshot, filters, sort, limit=max), 'source': 'local'}
+        records = self._iter_results(list_method, filters=serialize_filters(filters), sort=serialize_sort(sort))
+        return {'results': list(itertools.islice(records, max)), 'source': 'api'}
+
+    def refresh_reference_data(self, name: Optional[str] = None) -> dict[str, Any]:
+        """
+        Drop cached reference data so the next lookup reloads it from the API
+
+        Args:
+            name (string): Lookup to drop, e.g. `list_industries` or `get_price_plan`. Drops every lookup when omitted.
+
+        Returns:
+            dict[str, Any]: Number of reference data entries still cached
+
+        Tags:
+            reference
+        """
+        self._reference_data.invalidate(name)
+        return {'cached': len(self._reference_data)}
+
+    def prefetch_payment_options(self, items: List[dict[str, Any]], max_workers: int = 8) -> dict[str, Any]:
+        """
+        Warm the payment-options cache for a payment run with concurrent lookups
+
+        Each distinct vendor and amount bucket is fetched once; later
+        `list_payment_options` calls for the run are then served from memory.
+
+        Args:
+            items (array): Payments about to be made, each an object with `vendorId` and `amount`.
+            max_workers (integer): Maximum number of lookups in flight at once.
+
+        Returns:
+            dict[str, Any]: Number of distinct lookups made and any that failed
+
+        Tags:
+            payments
+        """
+        return self._payment_options.prefetch(((item['vendorId'], item['amount']) for item in items), max_workers=max_workers)
+
+    def start_webhook_receiver(self, secret: Optional[str] = None, host: str = '127.0.0.1', port: int = 0, path: str = '/') -> dict[str, Any]:
+        """
+        Start a local HTTP receiver for Bill event notifications that keeps caches fresh
+
+        Verified bill, vendor, customer, payment and invoice events evict the
+        changed object from the response cache, list snapshots and local indexes.
+        While the receiver runs, cached detail responses are trusted for
+        `webhook_cache_ttl` seconds instead of being revalidated on every read.
+
+        Args:
+            secret (string): Subscription security key used to verify `x-bill-sha-signature`. Defaults to the `BILL_WEBHOOK_SECRET` environment variable.
+            host (string): Interface to listen on.
+            port (integer): Port to listen on; 0 picks a free port.
+            path (string): Request path notifications are posted to.
+
+        Returns:
+            dict[str, Any]: Address the receiver listens on
+
+        Raises:
+            ValueError: Raised when no security key is configured.
+
+        Tags:
+            webhooks
+        """
+        if self._webhook_receiver is not None:
+            self._webhook_receiver.stop()
+        self._webhook_receiver = WebhookReceiver(secret or os.environ.get('BILL_WEBHOOK_SECRET'), self._apply_webhook_event, host=host, port=port, path=path).start()
+        host, port = self._webhook_receiver.address
+        return {'host': host, 'port': port, 'path': path}
+
+    def stop_webhook_receiver(self) -> dict[str, Any]:
+        """
+        Stop the webhook receiver and drop detail responses cached under its longer freshness window
+
+        Returns:
+            dict[str, Any]: Whether a receiver was running
+
+        Tags:
+            webhooks
+        """
+        receiver, self._webhook_receiver = self._webhook_receiver, None
+        if receiver is not None:
+            receiver.stop()
+            self._response_cache.clear()
+        return {'stopped': receiver is not None}
+
+    def capture_changes(self, log_path: str, entities: Optional[List[str]] = None) -> dict[str, Any]:
+        """
+        Append created, updated, archived and restored records to a local change log
+
+        Each entity is listed from its last `updatedTime` watermark only, and
+        records are compared with stored fingerprints so unchanged records and
+        timestamp-only touches produce no events. Events are JSON lines with an
+        increasing `seq`; state lives next to the log in `<log_path>.state.json`.
+
+        Args:
+            log_path (string): Path of the append-only JSON-lines event log.
+            entities (array): Entities to capture, from `vendors`, `customers`, `bills`, `invoices` and `payments`. Captures all when omitted.
+
+        Returns:
+            dict[str, Any]: Per-entity event counts and the last sequence number written
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+            ValueError: Raised when an entity is not supported.
+
+        Tags:
+            sync
+        """
+        entities = entities or list(CDC_SOURCES)
+        unknown = [entity for entity in entities if entity not in CDC_SOURCES]
+        if unknown:
+            raise ValueError(f"Unsupported entities {unknown}; expected a subset of {list(CDC_SOURCES)}.")
+        feed = self._change_feeds.get(log_path)
+        if feed is None:
+            feed = self._change_feeds[log_path] = ChangeFeed(log_path)
+        summary = {}
+        for entity in entities:
+            watermark = feed.watermark(entity)
+            records = self._iter_results(
+                getattr(self, CDC_SOURCES[entity]),
+                filters=serialize_filters(Field('updatedTime').gte(watermark)) if watermark else None,
+                sort=serialize_sort(Field('updatedTime').asc()),
+            )
+            summary[entity] = feed.capture(entity, records)
+        return {'entities': summary, 'lastSeq': feed.seq}
+
+    def read_change_log(self, log_path: str, after: int = 0, max: int = 100) -> dict[str, Any]:
+        """
+        Read change events written by `capture_changes` after a sequence number
+
+        Args:
+            log_path (string): Path of the change log.
+            after (integer): Return events with a sequence number greater than this.
+            max (integer): Maximum number of events to return.
+
+        Returns:
+            dict[str, Any]: Events in order and the sequence number to pass as `after` next time
+
+        Tags:
+            sync
+        """
+        events = list(read_events(log_path, after=after, limit=max))
+        return {'events': events, 'nextAfter': events[-1]['seq'] if events else after}
+
+    def enqueue_write(self, operation: str, arguments: dict[str, Any]) -> dict[str, Any]:
+        """
+        Journal a mutation in the write-behind outbox and return immediately with a handle
+
+        Entries are delivered in the background in batches, through
+        `create_bulk_bills` and `create_bulk_vendor` where possible, and
+        replayed after a restart. Delivery is at-least-once.
+
+        Args:
+            operation (string): One of `create_bill`, `update_bill`, `create_vendor`, `update_vendor`, `create_customer` or `create_invoice`.
+            arguments (object): Keyword arguments for that method, e.g. `{"vendorId": ..., "dueDate": ..., "billLineItems": [...], "invoice": {...}}`.
+
+        Returns:
+            dict[str, Any]: Handle to pass to `get_write_status`
+
+        Raises:
+            ValueError: Raised when the outbox is disabled or the operation is not supported.
+
+        Tags:
+            outbox
+        """
+        return {'handle': self._require_outbox().enqueue(operation, arguments)}
+
+    def get_write_status(self, handle: str) -> dict[str, Any]:
+        """
+        Get the delivery status of a mutation journaled with `enqueue_write`
+
+        Args:
+            handle (string): Handle returned by `enqueue_write`.
+
+        Returns:
+            dict[str, Any]: Status (`pending`, `done` or `failed`), attempts, API result and last error
+
+        Raises:
+            ValueError: Raised when the outbox is disabled or the handle is unknown.
+
+        Tags:
+            outbox
+        """
+        status = self._require_outbox().status(handle)
+        if status is None:
+            raise ValueError(f"Unknown outbox handle '{handle}'.")
+        return status
+
+    def flush_outbox(self) -> dict[str, Any]:
+        """
+        Deliver every pending outbox entry now instead of waiting for the background flush
+
+        Returns:
+            dict[str, Any]: Number of entries done, failed and still pending after this flush
+
+        Raises:
+            ValueError: Raised when the outbox is disabled.
+
+        Tags:
+            outbox
+        """
+        return self._require_outbox().flush()
+
+    def pay_bills(self, bills: List[Any], fundingAccount: Any, processDate: Optional[str] = None, processingOptions: Optional[Any] = None, single_vendor: bool = False, max_payments_per_request: int = DEFAULT_PAYMENTS_PER_REQUEST, max_concurrency: int = 4, requests_per_second: float = 5.0, dry_run: bool = False) -> dict[str, Any]:
+        """
+        Pay many bills with a few create_bulk_payment calls instead of one create_payment per bill
+
+        Bills are fetched with `id:in:` list filters, grouped by funding
+        account, process date and processing options (and vendor, with
+        `single_vendor`), split into requests of at most
+        `max_payments_per_request` payments and submitted concurrently under a
+        rate limit. Archived, paid and already scheduled bills are skipped.
+
+        Args:
+            bills (array): Bill IDs, or objects with `billId` and optional `amount`, `fundingAccount`, `processDate` and `processingOptions` overriding the defaults for that bill.
+            fundingAccount (object): Default funding account, e.g. `{"type": "BANK_ACCOUNT", "id": "..."}`.
+            processDate (string): Default processing date in `yyyy-MM-dd` format.
+            processingOptions (object): Default processing options.
+            single_vendor (boolean): Put only one vendor's bills in each request and set its `vendorId`.
+            max_payments_per_request (integer): Largest number of payments in one bulk request.
+            max_concurrency (integer): Maximum number of bulk requests in flight at once.
+            requests_per_second (number): Rate limit for submitting bulk requests.
+            dry_run (boolean): Return the planned requests without submitting them.
+
+        Returns:
+            dict[str, Any]: Number of bulk requests (or the planned requests for a dry run) and a result per bill
+
+        Raises:
+            HTTPStatusError: Raised when fetching the bills fails. Failed bulk requests are reported per bill instead.
+
+        Tags:
+            payments, bulk
+        """
+        entries = [{'billId': bill} if isinstance(bill, str) else bill for bill in bills]
+        entries = list({entry['billId']: entry for entry in entries}.values())
+        records = self._fetch_by_ids(self.list_bills, [entry['billId'] for entry in entries])
+        results, items = [], []
+        for entry in entries:
+            bill = records.get(entry['billId'])
+            if bill is None:
+                results.append({'billId': entry['billId'], 'status': 'skipped', 'error': 'Bill not found.'})
+                continue
+            if bill.get('archived') or bill.get('paymentStatus') in CLOSED_BILL_STATUSES:
+                results.append({'billId': entry['billId'], 'status': 'skipped', 'error': 'Bill is archived, paid or already scheduled.'})
+                continue
+            items.append({
+                'billId': entry['billId'],
+                'vendorId': bill.get('vendorId'),
+                'amount': entry.get('amount', bill.get('dueAmount', bill.get('amount'))),
+                'fundingAccount': entry.get('fundingAccount', fundingAccount),
+                'processDate': entry.get('processDate', processDate),
+                'processingOptions': entry.get('processingOptions', processingOptions),
+            })
+        plan = plan_bulk_payments(items, max_per_request=max_payments_per_request, single_vendor=single_vendor)
+        if dry_run:
+            return {'requests': plan, 'results': results}
+        limiter = RateLimiter(requests_per_second, burst=max_concurrency)
+        outcomes = run_concurrently(lambda request: self.create_bulk_payment(**request), plan, max_workers=max_concurrency, rate_limiter=limiter)
+        for outcome in outcomes:
+            payments = outcome.item['payments']
+            if outcome.ok:
+                results.extend(bulk_payment_results(outcome.result, payments))
+            else:
+                results.extend({'billId': payment['billId'], 'status': 'failed', 'error': str(outcome.error)} for payment in payments)
+        return {'requests': len(plan), 'results': results}
+
+    def import_vendors(self, vendors: List[dict[str, Any]], update_existing: bool = True, chunk_size: int = 100, max_concurrency: int = 4, requests_per_second: float = 5.0, dry_run: bool = False) -> dict[str, Any]:
+        """
+        Import a vendor master file idempotently, creating only vendors that do not exist yet
+
+        Incoming vendors are matched against a freshly listed vendor list by
+        normalized tax ID, name plus address, or unique name. Matches are
+        skipped or, with `update_existing`, updated with only the fields that
+        differ; the rest are created with `create_bulk_vendor` in chunks of
+        `chunk_size`. Requests run concurrently under a rate limit.
+
+        Args:
+            vendors (array): Vendor objects in the `create_vendor` request format.
+            update_existing (boolean): Update matched vendors whose fields differ instead of skipping them.
+            chunk_size (integer): Largest number of vendors in one `create_bulk_vendor` request.
+            max_concurrency (integer): Maximum number of requests in flight at once.
+            requests_per_second (number): Rate limit for create and update requests.
+            dry_run (boolean): Return the planned creates, updates and skips without sending them.
+
+        Returns:
+            dict[str, Any]: Counts per outcome and a result per input vendor, in input order
+
+        Raises:
+            HTTPStatusError: Raised when listing existing vendors fails. Failed writes are reported per vendor instead.
+
+        Tags:
+            vendors, bulk
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive.")
+        # Always list afresh: a snapshot can miss vendors created elsewhere since it was taken, and those would be created twice.
+        existing = list(self._iter_results(self.list_vendors))
+        self._list_snapshots.set('vendors', existing)
+        plan = plan_vendor_import(vendors, existing, update_existing=update_existing)
+        if dry_run:
+            return {
+                'create': [index for index, _ in plan['create']],
+                'update': [{'index': index, 'vendorId': vendor_id, 'changes': changes} for index, vendor_id, changes in plan['update']],
+                'skip': plan['skip'],
+            }
+        chunks = [plan['create'][start:start + chunk_size] for start in range(0, len(plan['create']), chunk_size)]
+        jobs = [('create', chunk) for chunk in chunks] + [('update', update) for update in plan['update']]
+
+        def run(job: tuple[str, Any]) -> Any:
+            kind, payload = job
+            if kind == 'create':
+                return self.create_bulk_vendor([vendor for _, vendor in payload])
+            _, vendor_id, changes = payload
+            return self.update_vendor(vendor_id, **changes)
+
+        limiter = RateLimiter(requests_per_second, burst=max_concurrency)
+        results = list(plan['skip'])
+        for outcome in run_concurrently(run, jobs, max_workers=max_concurrency, rate_limiter=limiter):
+            kind, payload = outcome.item
+            if kind == 'update':
+                index, vendor_id, _ = payload
+                result = {'index': index, 'vendorId': vendor_id}
+                results.append({**result, 'status': 'updated'} if outcome.ok else {**result, 'status': 'failed', 'error': str(outcome.error)})
+                continue
+            created = outcome.result if outcome.ok and isinstance(outcome.result, list) and len(outcome.result) == len(payload) else None
+            for position, (index, _) in enumerate(payload):
+                if not outcome.ok:
+                    results.append({'index': index, 'status': 'failed', 'error': str(outcome.error)})
+                else:
+                    results.append({'index': index, 'status': 'created', 'vendorId': created[position].get('id') if created else None})
+        if jobs:
+            self._list_snapshots.invalidate('vendors')
+        results.sort(key=lambda result: result['index'])
+        counts = {status: sum(result['status'] == status for result in results) for status in ('created', 'updated', 'skipped', 'failed')}
+        return {**counts, 'results': results}
+
+    def sync_budget_members(self, desired: dict[str, List[dict[str, Any]]], remove_missing: bool = True, chunk_size: int = 100, max_concurrency: int = 4, requests_per_second: float = 5.0, dry_run: bool = False) -> dict[str, Any]:
+        """
+        Bring budget memberships in line with a desired state, sending only real changes
+
+        Current members of every budget are listed concurrently and diffed
+        against the desired members by user ID. New and changed members are
+        sent through `upsert_bulk_budget_users` in chunks of `chunk_size`;
+        members missing from the desired state are removed with
+        `delete_budget_member`. All requests, including every page of the
+        member listings, share one rate limit and are counted in `requests`.
+
+        Args:
+            desired (object): Budget ID to the list of desired members, each with `userId` and optional `limit`, `recurringLimit`, `role` and `shareBudgetFunds`.
+            remove_missing (boolean): Remove current members that are not in the desired list.
+            chunk_size (integer): Largest number of members in one bulk upsert.
+            max_concurrency (integer): Maximum number of requests in flight at once.
+            requests_per_second (number): Rate limit across all list, upsert and delete requests.
+            dry_run (boolean): Return the diff per budget without applying it.
+
+        Returns:
+            dict[str, Any]: Per-budget counts of added, updated, removed and unchanged members, any failures, and the number of HTTP requests sent
+
+        Tags:
+            budgets, bulk
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive.")
+        limiter = RateLimiter(requests_per_second, burst=max_concurrency)
+        sent: list[str] = []
+
+        def limited(method: Callable[..., Any]) -> Callable[..., Any]:
+            # Every HTTP call, including each page of a listing, takes a token and is counted.
+            @functools.wraps(method)
+            def call(*args: Any, **kwargs: Any) -> Any:
+                limiter.acquire()
+                sent.append(method.__name__)
+                return method(*args, **kwargs)
+
+            return call
+
+        list_members = limited(self.list_budget_members)
+        fetched = run_concurrently(
+            lambda budget_id: list(self._iter_results(list_members, budgetId=budget_id)),
+            list(desired),
+            max_workers=max_concurrency,
+        )
+        summary: dict[str, Any] = {}
+        jobs = []
+        for outcome in fetched:
+            budget_id = outcome.item
+            if not outcome.ok:
+                summary[budget_id] = {'error': f"Listing members failed: {outcome.error}"}
+                continue
+            diff = diff_members(outcome.result, desired[budget_id], remove_missing=remove_missing)
+            summary[budget_id] = {'added': len(diff['add']), 'updated': len(diff['update']), 'removed': len(diff['remove']), 'unchanged': diff['unchanged'], 'failures': []}
+            if dry_run:
+                summary[budget_id]['diff'] = diff
+                continue
+            upserts = diff['add'] + diff['update']
+            jobs += [(budget_id, 'upsert', upserts[start:start + chunk_size]) for start in range(0, len(upserts), chunk_size)]
+            jobs += [(budget_id, 'remove', user_id) for user_id in diff['remove']]
+
+        upsert, delete = limited(self.upsert_bulk_budget_users), limited(self.delete_budget_member)
+
+        def apply(job: tuple[str, str, Any]) -> Any:
+            budget_id, kind, payload = job
+            if kind == 'upsert':
+                return upsert(budget_id, payload)
+            return delete(budget_id, payload)
+
+        for outcome in run_concurrently(apply, jobs, max_workers=max_concurrency):
+            if not outcome.ok:
+                budget_id, kind, payload = outcome.item
+                user_ids = [member['userId'] for member in payload] if kind == 'upsert' else [payload]
+                summary[budget_id]['failures'].append({'action': kind, 'userIds': user_ids, 'error': str(outcome.error)})
+        return {'budgets': summary, 'requests': len(sent)}
+
+    def tag_transactions(self, tags: List[dict[str, Any]], max_concurrency: int = 8, requests_per_second: float = 10.0, dry_run: bool = False) -> dict[str, Any]:
+        """
+        Set custom-field values on many spend transactions, skipping updates that change nothing
+
+        Current values are read with `id:in:` list queries that include the
+        tagged custom fields, tags for the same transaction are merged into one
+        `update_transaction_custom_fields` call, and calls whose values already
+        match are dropped. The remaining updates run concurrently under a rate
+        limit.
+
+        Args:
+            tags (array): Items with `transactionId`, `customFieldId` and `values` (list of values to select; empty clears the field).
+            max_concurrency (integer): Maximum number of updates in flight at once.
+            requests_per_second (number): Rate limit for update requests.
+            dry_run (boolean): Return the planned updates without sending them.
+
+        Returns:
+            dict[str, Any]: Counts per outcome and a result per transaction
+
+        Raises:
+            HTTPStatusError: Raised when reading current values fails. Failed updates are reported per transaction instead.
+
+        Tags:
+            transactions, bulk
+        """
+        transaction_ids = list(dict.fromkeys(tag['transactionId'] for tag in tags))
+        field_ids = sorted({tag['customFieldId'] for tag in tags})
+        current = self._fetch_by_ids(self.list_transactions, transaction_ids, showCustomFieldIds=','.join(field_ids) or None)
+        updates, results = plan_tagging(tags, current)
+        if dry_run:
+            return {'updates': updates, 'results': results}
+        limiter = RateLimiter(requests_per_second, burst=max_concurrency)
+        outcomes = run_concurrently(
+            lambda transaction_id: self.update_transaction_custom_fields(transaction_id, updates[transaction_id]),
+            list(updates),
+            max_workers=max_concurrency,
+            rate_limiter=limiter,
+        )
+        for outcome in outcomes:
+            result = {'transactionId': outcome.item, 'status': 'updated'} if outcome.ok else {'transactionId': outcome.item, 'status': 'failed', 'error': str(outcome.error)}
+            results.append(result)
+        counts = {status: sum(result['status'] == status for result in results) for status in ('updated', 'unchanged', 'failed')}
+        return {**counts, 'results': results}
+
+    def list_enriched_transactions(self, filters: Optional[str] = None, sort: Optional[str] = None, customFieldIds: Optional[List[str]] = None, max: int = 100) -> dict[str, Any]:
+        """
+        List spend transactions with their custom field values resolved to names and labels
+
+        Custom field values are requested inline with `showCustomFieldIds`,
+        20 fields per list call; wider requests add one list pass per page for
+        each further 20 fields. A field a transaction comes back without has
+        no value and is returned empty. Field names and value labels come from
+        a cached custom field catalog.
+
+        Args:
+            filters (string): Filter expression passed to `list_transactions`.
+            sort (string): Sort expression passed to `list_transactions`.
+            customFieldIds (array): Custom fields to include. Includes every custom field when omitted.
+            max (integer): Maximum number of transactions to return.
+
+        Returns:
+            dict[str, Any]: Transactions, each with a `customFieldValues` map from field name to selected value labels
+
+        Raises:
+            HTTPStatusError: Raised when the API request fails with detailed error information including status code and response body.
+
+        Tags:
+            transactions
+        """
+        records = self._iter_enriched_transactions(customFieldIds, filters=filters, sort=sort, max=min(max, 100))
+        return {'results': list(itertools.islice(records, max))}
+
+    def sync_vendor_audit_trails(self, store_path: str, vendorIds: Optional[List[str]] = None, includeArchived: Optional[bool] = None, page_size: int = 100, max_concurrency: int = 8, requests_per_second: float = 10.0) -> dict[str, Any]:
+        """
+        Copy new vendor audit trail entries into a local store, resuming from each vendor's checkpoint
+
+        Each vendor is read from the offset stored after its previous sync, so
+        only entries added since then are fetched; checkpoints are kept per
+        `includeArchived` value. Entries already stored are skipped, and a
+        trail whose last stored entry moved is re-read from the start.
+        Vendors are read concurrently under a rate limit; entries and
+        checkpoints are kept in one SQLite file.
+
+        Args:
+            store_path (string): Path of the SQLite file holding entries and checkpoints.
+            vendorIds (array): Vendors to sync. Syncs every vendor when omitted.
+            includeArchived (boolean): Passed to `get_vendor_audit_trail`.
+            page_size (integer): Entries requested per call.
+            max_concurrency (integer): Maximum number of vendors read at once.
+            requests_per_second (number): Rate limit for audit trail requests.
+
+        Returns:
+            dict[str, Any]: Number of new entries per vendor with new activity, total new entries and any failures
+
+        Raises:
+            HTTPStatusError: Raised when listing vendors fails. Failures reading a vendor's trail are reported per vendor instead.
+
+        Tags:
+            reports, sync
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive.")
+        store = self._audit_store(store_path)
+        if vendorIds is None:
+            vendors = self._list_snapshots.get_or_load('vendors', lambda: list(self._iter_results(self.list_vendors)))
+            vendorIds = [vendor['id'] for vendor in vendors]
+        limiter = RateLimiter(requests_per_second, burst=max_concurrency)
+
+        def fetch_page(vendor_id: str, start: int, max: int) -> list[Any]:
+            limiter.acquire()
+            return self.get_vendor_audit_trail(vendor_id, includeArchived=includeArchived, start=start, max=max)
+
+        outcomes = run_concurrently(
+            lambda vendor_id: store.read_new(trail_key(vendor_id, includeArchived=includeArchived), lambda start, max: fetch_page(vendor_id, start, max), page_size=page_size),
+            vendorIds,
+            max_workers=max_concurrency,
+        )
+        new_entries = {outcome.item: outcome.result for outcome in outcomes if outcome.ok and outcome.result}
+        failures = [{'vendorId': outcome.item, 'error': str(outcome.error)} for outcome in outcomes if not outcome.ok]
+        return {'vendors': len(vendorIds), 'newEntries': new_entries, 'total': sum(new_entries.values()), 'failures': failures}
+
+    def read_vendor_audit_trail(self, store_path: str, vendorId: str, includeArchived: Optional[bool] = None, after: int = 0, max: int = 100) -> dict[str, Any]:
+        """
+        Read a vendor's audit trail from the local store filled by `sync_vendor_audit_trails`
+
+        Args:
+            store_path (string): Path of the SQLite audit trail store.
+            vendorId (string): Vendor whose entries to read.
+            includeArchived (boolean): The `includeArchived` value the trail was synced with; each value is stored separately.
+            after (integer): First position to return; positions start at 0.
+            max (integer): Maximum number of entries to return.
+
+        Returns:
+            dict[str, Any]: Entries with their positions, oldest first, and the position to pass as `after` next time
+
+        Tags:
+            reports
+        """
+        entries = list(self._audit_store(store_path).entries(trail_key(vendorId, includeArchived=includeArchived), after=after, limit=max))
+        return {'entries': entries, 'nextAfter': entries[-1]['position'] + 1 if entries else after}
+
+    def download_check_images(self, paymentIds: List[str], directory: str, max_concurrency: int = 8, requests_per_second: float = 10.0) -> dict[str, Any]:
+        """
+        Download check images for many payments into a content-addressed directory
+
+        Images are fetched concurrently under a rate limit and streamed to
+        disk under their SHA-256 digest, so identical images are stored once.
+        Payments already stored in `directory` are skipped, which makes an
+        interrupted download resumable.
+
+        Args:
+            paymentIds (array): Payments whose check images to download.
+            directory (string): Root directory of the image store.
+            max_concurrency (integer): Maximum number of downloads in flight at once.
+            requests_per_second (number): Rate limit for download requests.
+
+        Returns:
+            dict[str, Any]: Counts per outcome and, per payment, the file path, digest and size or the error
+
+        Tags:
+            payments, export
+        """
+        store = ContentStore(directory)
+        results, pending = [], []
+        for payment_id in dict.fromkeys(paymentIds):
+            ref = store.ref(payment_id)
+            if ref is not None:
+                results.append({'paymentId': payment_id, 'status': 'skipped', 'path': ref['path'], 'sha256': ref['sha256'], 'size': ref['size']})
+            else:
+                pending.append(payment_id)
+        limiter = RateLimiter(requests_per_second, burst=max_concurrency)
+        for outcome in run_concurrently(lambda payment_id: self._store_check_image(payment_id, store), pending, max_workers=max_concurrency, rate_limiter=limiter):
+            if not outcome.ok:
+                results.append({'paymentId': outcome.item, 'status': 'failed', 'error': str(outcome.error)})
+                continue
+            digest, size, content_type = outcome.result
+            ref = store.set_ref(outcome.item, digest, size, contentType=content_type)
+            results.append({'paymentId': outcome.item, 'status': 'downloaded', 'path': ref['path'], 'sha256': digest, 'size': size})
+        counts = {status: sum(result['status'] == status for result in results) for status in ('downloaded', 'skipped', 'failed')}
+        return {**counts, 'results': results}
 
     def list_tools(self):
         return [
@@ -6872,5 +8187,31 @@ class BillApp(APIApplication):
             self.create_vendor_bank_account,
             self.delete_vendor_bank_account,
             self.get_configuration_by_vendor_id,
-            self.restore_vendor
+            self.restore_vendor,
+            self.export_ap_data,
+            self.get_ap_aging_report,
+            self.forecast_cash_requirements,
+            self.refresh_spend_analytics,
+            self.query_spend_analytics,
+            self.check_duplicate_bills,
+            self.reconcile_invoice_payments,
+            self.find_counterparties,
+            self.query_records,
+            self.refresh_reference_data,
+            self.prefetch_payment_options,
+            self.start_webhook_receiver,
+            self.stop_webhook_receiver,
+            self.capture_changes,
+            self.read_change_log,
+            self.enqueue_write,
+            self.get_write_status,
+            self.flush_outbox,
+            self.pay_bills,
+            self.import_vendors,
+            self.sync_budget_members,
+            self.tag_transactions,
+            self.list_enriched_transactions,
+            self.sync_vendor_audit_trails,
+            self.read_vendor_audit_trail,
+            self.download_check_images
         ]
@@ -0,0 +1,135 @@
+"""Checkpointed incremental reader for vendor audit trails.
+
+Audit trails are paged by `start` offset, and each trail keeps the offset
+its next read starts from. Trails are keyed by vendor and query options, so
+reads with and without archived entries never share a checkpoint. Entries are
+deduplicated by content hash, and every resumed read re-fetches the last
+stored entry: if it moved, the trail was reordered and is re-read from the
+start, storing only entries not seen before. Entries and offsets live in one
+SQLite file, and an offset advances in the same transaction as its entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_entries (
+    vendor_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    entry TEXT NOT NULL,
+    entry_hash TEXT,
+    PRIMARY KEY (vendor_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS audit_checkpoints (
+    vendor_id TEXT PRIMARY KEY,
+    next_start INTEGER NOT NULL,
+    last_hash TEXT
+) WITHOUT ROWID;
+"""
+
+# Columns added after the first release of the store, migrated on open.
+_ADDED_COLUMNS = {"audit_entries": "entry_hash TEXT", "audit_checkpoints": "last_hash TEXT"}
+
+
+def trail_key(vendor_id: str, **options: Any) -> str:
+    """Checkpoint key for a vendor's trail read with `options`, e.g. `009a?includeArchived=true`."""
+    query = "&".join(f"{name}={json.dumps(value)}" for name, value in sorted(options.items()) if value is not None)
+    return f"{vendor_id}?{query}" if query else vendor_id
+
+
+def entry_hash(entry: Any) -> str:
+    payload = json.dumps(entry, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class AuditTrailStore:
+    """Local copy of vendor audit trails with a resume offset per trail.
+
+    Methods take a trail key: a vendor ID, or `trail_key(vendor_id, ...)`
+    when the trail is read with query options.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        for table, column in _ADDED_COLUMNS.items():
+            if column.split()[0] not in {row[1] for row in self._db.execute(f"PRAGMA table_info({table})")}:
+                self._db.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+        self._db.execute("CREATE UNIQUE INDEX IF NOT EXISTS audit_entry_hashes ON audit_entries (vendor_id, entry_hash)")
+        self._lock = threading.Lock()
+
+    def checkpoint(self, vendor_id: str) -> int:
+        return self._checkpoint(vendor_id)[0]
+
+    def _checkpoint(self, vendor_id: str) -> tuple[int, Optional[str]]:
+        with self._lock:
+            row = self._db.execute("SELECT next_start, last_hash FROM audit_checkpoints WHERE vendor_id = ?", (vendor_id,)).fetchone()
+        return (row[0], row[1]) if row else (0, None)
+
+    def append(self, vendor_id: str, start: int, entries: list[Any]) -> int:
+        """Store `entries` found at offset `start`, skipping ones already stored, and move the checkpoint past them.
+
+        Returns how many entries were new.
+        """
+        hashes = [entry_hash(entry) for entry in entries]
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                position = self._db.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM audit_entries WHERE vendor_id = ?", (vendor_id,)).fetchone()[0]
+                added = 0
+                for entry, digest in zip(entries, hashes):
+                    cursor = self._db.execute(
+                        "INSERT OR IGNORE INTO audit_entries (vendor_id, position, entry, entry_hash) VALUES (?, ?, ?, ?)",
+                        (vendor_id, position + added, json.dumps(entry, separators=(",", ":"), default=str), digest),
+                    )
+                    added += cursor.rowcount
+                self._db.execute(
+                    "INSERT INTO audit_checkpoints (vendor_id, next_start, last_hash) VALUES (?, ?, ?) "
+                    "ON CONFLICT (vendor_id) DO UPDATE SET next_start = excluded.next_start, last_hash = excluded.last_hash",
+                    (vendor_id, start + len(entries), hashes[-1] if hashes else None),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return added
+
+    def read_new(self, vendor_id: str, fetch_page: Callable[[int, int], list[Any]], page_size: int = 100) -> int:
+        """Fetch entries after the checkpoint, page by page, until a short page; returns how many were new."""
+        start, last_hash = self._checkpoint(vendor_id)
+        if start and last_hash:
+            # Re-read the last stored entry: if it is no longer there, the trail was reordered.
+            anchor = fetch_page(start - 1, 1) or []
+            if not anchor or entry_hash(anchor[0]) != last_hash:
+                start = 0
+        fetched = 0
+        while True:
+            page = fetch_page(start, page_size) or []
+            if page:
+                fetched += self.append(vendor_id, start, page)
+                start += len(page)
+            if len(page) < page_size:
+                return fetched
+
+    def entries(self, vendor_id: str, after: int = 0, limit: Optional[int] = None) -> Iterator[dict[str, Any]]:
+        """Stored entries at positions `after` and later, oldest first."""
+        query = "SELECT position, entry FROM audit_entries WHERE vendor_id = ? AND position >= ? ORDER BY position"
+        params: tuple = (vendor_id, after)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        for position, entry in rows:
+            yield {"position": position, "entry": json.loads(entry)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
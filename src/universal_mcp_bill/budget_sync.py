@@ -0,0 +1,45 @@
+"""Minimal add/update/remove diff between current and desired budget members."""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+# Member settings `upsert_bulk_budget_users` and `upsert_budget_member` accept.
+MEMBER_FIELDS = ("limit", "recurringLimit", "role", "shareBudgetFunds")
+
+
+def member_user_id(member: dict[str, Any]) -> Optional[str]:
+    return member.get("userId") or (member.get("user") or {}).get("id")
+
+
+def _same(current: Any, desired: Any) -> bool:
+    if isinstance(current, (int, float)) and isinstance(desired, (int, float)) and not isinstance(desired, bool):
+        return abs(float(current) - float(desired)) < 0.005
+    return current == desired
+
+
+def diff_members(current: Iterable[dict[str, Any]], desired: Iterable[dict[str, Any]], remove_missing: bool = True) -> dict[str, Any]:
+    """Compare members by user ID.
+
+    Only settings given in a desired member are compared, so omitting a
+    field leaves it as it is. Desired members come back as upsert payloads
+    (`userId` plus settings); removals are user IDs.
+    """
+    existing = {member_user_id(member): member for member in current if member_user_id(member)}
+    add, update, unchanged = [], [], 0
+    wanted = set()
+    for member in desired:
+        user_id = member_user_id(member)
+        if not user_id:
+            raise ValueError(f"Desired budget member without a userId: {member}.")
+        wanted.add(user_id)
+        payload = {"userId": user_id, **{field: member[field] for field in MEMBER_FIELDS if member.get(field) is not None}}
+        present = existing.get(user_id)
+        if present is None:
+            add.append(payload)
+        elif any(not _same(present.get(field), value) for field, value in payload.items() if field != "userId"):
+            update.append(payload)
+        else:
+            unchanged += 1
+    remove = sorted(user_id for user_id in existing if user_id not in wanted) if remove_missing else []
+    return {"add": add, "update": update, "remove": remove, "unchanged": unchanged}
@@ -0,0 +1,80 @@
+"""Bounded thread-pool fan-out used by the batch tools."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` calls per second with bursts of up to `burst` calls."""
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call is allowed."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+@dataclass
+class Outcome:
+    """Result of running a function on one item: either `result` or `error` is set."""
+
+    item: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_concurrently(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> list[Outcome]:
+    """Call `fn` on every item with at most `max_workers` in flight.
+
+    Outcomes are returned in input order; an exception raised for one item is
+    captured in its outcome instead of aborting the others. With a
+    `rate_limiter`, every call first waits for a token.
+    """
+
+    def call(item: Any) -> Outcome:
+        try:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            return Outcome(item, result=fn(item))
+        except Exception as e:
+            return Outcome(item, error=e)
+
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
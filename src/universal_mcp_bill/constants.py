@@ -0,0 +1,8 @@
+"""Bill and payment status groups shared by the aging, forecasting, payment and query helpers."""
+
+from __future__ import annotations
+
+# Bills in these payment statuses need no further funding.
+CLOSED_BILL_STATUSES = frozenset({"PAID", "SCHEDULED"})
+# Payments in these statuses have not been processed yet.
+PENDING_PAYMENT_STATUSES = frozenset({"SCHEDULED", "PENDING"})
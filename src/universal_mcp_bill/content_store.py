@@ -0,0 +1,74 @@
+"""Content-addressed on-disk blob store with named references.
+
+Blobs are written once under `<root>/<sha256[:2]>/<sha256>` by streaming into
+a temporary file while hashing, then renaming; identical content is stored
+once. References map a name (e.g. a payment ID) to a digest and are kept in
+an append-only `refs.jsonl`, so an interrupted run resumes with everything it
+already stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Iterable, Optional
+
+
+class ContentStore:
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._refs_path = os.path.join(root, "refs.jsonl")
+        self._refs: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self._refs_path):
+            with open(self._refs_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        ref = json.loads(line)
+                        self._refs[ref["name"]] = ref
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def put_stream(self, chunks: Iterable[bytes]) -> tuple[str, int]:
+        """Store streamed content and return its sha256 digest and size; nothing is held in memory."""
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".blob-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            path = self.path_for(digest.hexdigest())
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                os.unlink(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest.hexdigest(), size
+
+    def ref(self, name: str) -> Optional[dict[str, Any]]:
+        """The stored reference for `name`, if its blob is still on disk."""
+        with self._lock:
+            ref = self._refs.get(name)
+        if ref is None or not os.path.exists(self.path_for(ref["sha256"])):
+            return None
+        return {**ref, "path": self.path_for(ref["sha256"])}
+
+    def set_ref(self, name: str, digest: str, size: int, **metadata: Any) -> dict[str, Any]:
+        ref = {"name": name, "sha256": digest, "size": size, **metadata}
+        with self._lock:
+            self._refs[name] = ref
+            with open(self._refs_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(ref, default=str) + "\n")
+        return {**ref, "path": self.path_for(digest)}
@@ -0,0 +1,122 @@
+"""Local duplicate-bill index keyed by normalized vendor, invoice number, amount and date."""
+
+from __future__ import annotations
+
+import re
+import threading
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Iterable, Optional
+
+DUPLICATE_POLICIES = ("off", "warn", "block")
+
+_INVOICE_NUMBER_JUNK = re.compile(r"[^0-9A-Z]")
+
+BillKey = tuple[str, str, str, str]
+
+
+class DuplicateBillError(ValueError):
+    """Raised when a bill being created matches an existing bill under the `block` policy."""
+
+    def __init__(self, duplicates: list[dict[str, Any]]) -> None:
+        self.duplicates = duplicates
+        summary = ", ".join(f"item {d['index']} duplicates {d['duplicateOf']}" for d in duplicates)
+        super().__init__(f"Duplicate bill(s) detected: {summary}.")
+
+
+def _normalize_amount(amount: Any) -> str:
+    try:
+        return str(Decimal(str(amount)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        return ""
+
+
+def bill_key(vendor_id: Optional[str], invoice_number: Optional[str], amount: Any, invoice_date: Optional[str]) -> BillKey:
+    """Normalize the identifying fields of a bill.
+
+    Invoice numbers are upper-cased and stripped of everything but letters and
+    digits, so `inv-0042` and `INV 0042` collide; amounts are rounded to cents
+    and dates truncated to `yyyy-MM-dd`.
+    """
+    return (
+        (vendor_id or "").strip(),
+        _INVOICE_NUMBER_JUNK.sub("", (invoice_number or "").upper()),
+        _normalize_amount(amount) if amount is not None else "",
+        (invoice_date or "")[:10],
+    )
+
+
+def record_key(record: dict[str, Any]) -> Optional[BillKey]:
+    """Key for a bill record or create payload; None when it has no invoice number."""
+    invoice = record.get("invoice") or {}
+    if not invoice.get("invoiceNumber"):
+        return None
+    amount = record.get("amount")
+    if amount is None:
+        amount = sum(Decimal(str(item.get("amount") or 0)) for item in record.get("billLineItems") or [])
+    return bill_key(record.get("vendorId"), invoice["invoiceNumber"], amount, invoice.get("invoiceDate"))
+
+
+class BillDuplicateIndex:
+    """Hash index from normalized bill key to bill ID, built once and kept current on every bill write."""
+
+    def __init__(self) -> None:
+        self._bills: dict[BillKey, str] = {}
+        self._keys: dict[str, BillKey] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._bills)
+
+    def load(self, records: Iterable[dict[str, Any]]) -> None:
+        """Replace the index contents with the given (non-archived) bills."""
+        bills, keys = {}, {}
+        for record in records:
+            key = record_key(record)
+            if key is not None and record.get("id") and not record.get("archived"):
+                bills[key] = record["id"]
+                keys[record["id"]] = key
+        with self._lock:
+            self._bills, self._keys = bills, keys
+            self.loaded = True
+
+    def add(self, records: Iterable[dict[str, Any]]) -> None:
+        """Index created, updated or restored bills, re-keying bills already indexed under older fields."""
+        with self._lock:
+            for record in records:
+                bill_id = record.get("id")
+                if not bill_id:
+                    continue
+                previous = self._keys.pop(bill_id, None)
+                if previous is not None and self._bills.get(previous) == bill_id:
+                    del self._bills[previous]
+                key = record_key(record)
+                if key is not None and not record.get("archived"):
+                    self._bills[key] = bill_id
+                    self._keys[bill_id] = key
+
+    def discard(self, bill_id: str) -> None:
+        with self._lock:
+            key = self._keys.pop(bill_id, None)
+            if key is not None and self._bills.get(key) == bill_id:
+                del self._bills[key]
+
+    def find(self, record: dict[str, Any]) -> Optional[str]:
+        key = record_key(record)
+        return None if key is None else self._bills.get(key)
+
+    def find_duplicates(self, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return one entry per record that matches an indexed bill or an earlier record in the list."""
+        duplicates = []
+        seen: dict[BillKey, int] = {}
+        for index, record in enumerate(records):
+            key = record_key(record)
+            if key is None:
+                continue
+            existing = self._bills.get(key)
+            if existing is None and key in seen:
+                existing = f"item {seen[key]}"
+            if existing is not None:
+                duplicates.append({"index": index, "duplicateOf": existing})
+            seen.setdefault(key, index)
+        return duplicates
@@ -0,0 +1,86 @@
+"""Custom-field enrichment of spend transactions without per-record lookups.
+
+`showCustomFieldIds` accepts a limited number of fields per list call, so
+wider requests are split into chunks fetched as extra list passes and merged
+by transaction ID.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Iterable
+
+from universal_mcp_bill.cache import TTLCache
+from universal_mcp_bill.tagging import selected_values
+
+# Custom field IDs requested per `showCustomFieldIds` list call, keeping URLs short.
+MAX_SHOWN_CUSTOM_FIELDS = 20
+
+
+class CustomFieldCatalog:
+    """Cached custom field definitions and value-ID-to-label maps.
+
+    Fields are loaded once per `ttl`; the values of a field are loaded the
+    first time one of its value IDs needs a label.
+    """
+
+    def __init__(
+        self,
+        load_fields: Callable[[], Iterable[dict[str, Any]]],
+        load_values: Callable[[str], Iterable[dict[str, Any]]],
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._load_fields = load_fields
+        self._load_values = load_values
+        self._cache = TTLCache(maxsize=4096, ttl=ttl, clock=clock)
+
+    def fields(self) -> dict[str, dict[str, Any]]:
+        return self._cache.get_or_load("fields", lambda: {field["id"]: field for field in self._load_fields() if field.get("id")})
+
+    def value_labels(self, field_id: str) -> dict[str, str]:
+        def load() -> dict[str, str]:
+            return {value["id"]: str(value.get("value", value["id"])) for value in self._load_values(field_id) if value.get("id")}
+
+        return self._cache.get_or_load(("values", field_id), load)
+
+    def label(self, field_id: str, value: str) -> str:
+        labels = self.value_labels(field_id)
+        return labels.get(value, value)
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+
+def chunk_field_ids(field_ids: list[str]) -> list[list[str]]:
+    """Split field IDs into `showCustomFieldIds` chunks; always at least one, possibly empty, chunk."""
+    return [field_ids[i:i + MAX_SHOWN_CUSTOM_FIELDS] for i in range(0, len(field_ids), MAX_SHOWN_CUSTOM_FIELDS)] or [[]]
+
+
+def merge_custom_fields(record: dict[str, Any], others: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Copy of `record` with the `customFields` of other listings of the same transaction appended."""
+    present = set(selected_values(record))
+    merged = list(record.get("customFields") or [])
+    for other in others:
+        for field in other.get("customFields") or []:
+            field_id = field.get("id") or field.get("customFieldId")
+            if field_id and field_id not in present:
+                present.add(field_id)
+                merged.append(field)
+    return {**record, "customFields": merged}
+
+
+def enrich(record: dict[str, Any], catalog: CustomFieldCatalog, field_ids: Iterable[str]) -> dict[str, Any]:
+    """Copy of `record` with `customFieldValues`: field name to selected value labels.
+
+    Every field in `field_ids` appears in the result; a field the listing
+    omitted has no value on the transaction and maps to an empty list. Values
+    that are catalog value IDs are replaced by their labels.
+    """
+    fields = catalog.fields()
+    selected = selected_values(record)
+    named = {}
+    for field_id in dict.fromkeys([*field_ids, *selected]):
+        name = (fields.get(field_id) or {}).get("name", field_id)
+        named[name] = [catalog.label(field_id, value) for value in sorted(selected.get(field_id, ()))]
+    return {**record, "customFieldValues": named}
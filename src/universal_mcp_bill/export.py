@@ -0,0 +1,295 @@
+"""Streaming columnar export of Bill list endpoints to Parquet or Arrow files.
+
+Records are flattened into dotted column names, buffered per partition in
+small column batches and written out as soon as a batch is full, so memory
+stays bounded by the batch size rather than by the size of the export.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+from datetime import date, datetime
+from typing import Any, Iterable, Optional
+
+from universal_mcp_bill._optional import require
+
+PARTITION_FORMATS = {"year": "%Y", "month": "%Y-%m", "day": "%Y-%m-%d"}
+FILE_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+UNKNOWN_PARTITION = "unknown"
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TIMESTAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}")
+
+
+def _require_pyarrow():
+    return require("pyarrow", "export", "Columnar export")
+
+
+def flatten_record(record: dict[str, Any], prefix: str = "", sep: str = ".") -> dict[str, Any]:
+    """Flatten nested objects into dotted keys; lists are kept as compact JSON strings."""
+    flat: dict[str, Any] = {}
+    for key, value in record.items():
+        name = f"{prefix}{sep}{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, name, sep))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value, separators=(",", ":"), default=str)
+        else:
+            flat[name] = value
+    return flat
+
+
+def _value_kind(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int64"
+    if isinstance(value, float):
+        return "float64"
+    if isinstance(value, str):
+        if _DATE_RE.match(value):
+            return "date"
+        if _TIMESTAMP_RE.match(value):
+            return "timestamp"
+    return "string"
+
+
+def _column_kind(name: str, value: Any) -> Optional[str]:
+    kind = _value_kind(value)
+    if kind == "int64" and "amount" in name.lower():
+        return "float64"
+    return kind
+
+
+def _merge_kinds(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    """Widen two column kinds to the narrowest kind that holds values of both."""
+    if current is None:
+        return new
+    if new is None or new == current:
+        return current
+    if {current, new} == {"int64", "float64"}:
+        return "float64"
+    if {current, new} == {"date", "timestamp"}:
+        return "timestamp"
+    return "string"
+
+
+def _coerce(values: list[Any], kind: Optional[str]) -> list[Any]:
+    if kind == "float64":
+        return [None if v is None else float(v) for v in values]
+    if kind == "date":
+        return [None if v is None else date.fromisoformat(v) for v in values]
+    if kind == "timestamp":
+        return [None if v is None else datetime.fromisoformat(v) for v in values]
+    if kind == "string":
+        return [v if v is None or isinstance(v, str) else str(v) for v in values]
+    return values
+
+
+def arrow_schema(kinds: dict[str, Optional[str]]):
+    """Build a `pyarrow.Schema` with sorted column names; never-seen-populated columns use the null type."""
+    pa = _require_pyarrow()
+    arrow_types = {
+        None: pa.null(),
+        "bool": pa.bool_(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "date": pa.date32(),
+        "timestamp": pa.timestamp("ms", tz="UTC"),
+        "string": pa.string(),
+    }
+    return pa.schema([(name, arrow_types[kinds[name]]) for name in sorted(kinds)])
+
+
+class ColumnBatch:
+    """Column-oriented buffer of flattened records with per-column type inference."""
+
+    def __init__(self) -> None:
+        self.columns: dict[str, list[Any]] = {}
+        self.kinds: dict[str, Optional[str]] = {}
+        self.num_rows = 0
+
+    def append(self, flat: dict[str, Any]) -> None:
+        for name in flat.keys() - self.columns.keys():
+            self.columns[name] = [None] * self.num_rows
+            self.kinds[name] = None
+        for name, column in self.columns.items():
+            value = flat.get(name)
+            column.append(value)
+            if value is not None:
+                self.kinds[name] = _merge_kinds(self.kinds[name], _column_kind(name, value))
+        self.num_rows += 1
+
+    def to_arrow(self, kinds: Optional[dict[str, Optional[str]]] = None):
+        """Build a `pyarrow.Table` with one typed column per flattened field.
+
+        With `kinds`, the table follows that schema: absent columns are filled
+        with nulls, and a column whose values cannot be coerced to its kind is
+        widened to string in place so the caller's schema stays authoritative.
+        """
+        pa = _require_pyarrow()
+        kinds = dict(self.kinds) if kinds is None else kinds
+        arrays = []
+        for name in sorted(kinds):
+            values = self.columns.get(name, [None] * self.num_rows)
+            try:
+                values = _coerce(values, kinds[name])
+            except ValueError:
+                kinds[name] = "string"
+                values = _coerce(values, "string")
+            arrays.append(values)
+        schema = arrow_schema(kinds)
+        return pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(arrays, schema)], schema=schema
+        )
+
+
+def partition_value(value: Any, partition_by: str) -> str:
+    """Map a date or timestamp string onto its partition label, e.g. `2024-03` for months."""
+    if not isinstance(value, str) or len(value) < 10:
+        return UNKNOWN_PARTITION
+    try:
+        day = date.fromisoformat(value[:10])
+    except ValueError:
+        return UNKNOWN_PARTITION
+    return day.strftime(PARTITION_FORMATS[partition_by])
+
+
+class PartitionedWriter:
+    """Write flattened records into Hive-style partition directories.
+
+    Each partition keeps its own `ColumnBatch`; a batch is flushed to a new part
+    file when it reaches `batch_size` rows, and the largest batch is flushed
+    whenever all buffers together exceed `max_buffered_rows`.
+
+    All part files share one schema for the entity: every batch is cast to the
+    writer's running schema, which only ever widens. Parts written before a
+    later widening are rewritten one at a time on `close()`, so the export
+    directory can be read back as a single dataset.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        partition_by: Optional[str] = "month",
+        partition_field: Optional[str] = None,
+        batch_size: int = 10_000,
+        max_buffered_rows: int = 50_000,
+        file_format: str = "parquet",
+        overwrite: bool = False,
+    ) -> None:
+        if partition_by is not None and partition_by not in PARTITION_FORMATS:
+            raise ValueError(f"Unsupported partition_by '{partition_by}'; expected one of {sorted(PARTITION_FORMATS)}.")
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Unsupported file_format '{file_format}'; expected one of {sorted(FILE_FORMATS)}.")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive.")
+        _require_pyarrow()
+        if os.path.isdir(root) and os.listdir(root):
+            if not overwrite:
+                raise ValueError(f"Export directory '{root}' is not empty; pass overwrite=True to replace it.")
+            shutil.rmtree(root)
+        self.root = root
+        self.partition_by = partition_by
+        self.partition_field = partition_field
+        self.batch_size = batch_size
+        self.max_buffered_rows = max(max_buffered_rows, batch_size)
+        self.file_format = file_format
+        self.rows_written = 0
+        self.files: list[str] = []
+        self.kinds: dict[str, Optional[str]] = {}
+        self._file_kinds: dict[str, dict[str, Optional[str]]] = {}
+        self._batches: dict[str, ColumnBatch] = {}
+        self._part_counters: dict[str, int] = {}
+        self._buffered_rows = 0
+
+    def write(self, record: dict[str, Any]) -> None:
+        flat = flatten_record(record)
+        if self.partition_by is None:
+            key = ""
+        else:
+            label = partition_value(flat.get(self.partition_field), self.partition_by)
+            key = f"{self.partition_by}={label}"
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = ColumnBatch()
+        batch.append(flat)
+        self._buffered_rows += 1
+        if batch.num_rows >= self.batch_size:
+            self._flush(key)
+        elif self._buffered_rows > self.max_buffered_rows:
+            self._flush(max(self._batches, key=lambda k: self._batches[k].num_rows))
+
+    def write_all(self, records: Iterable[dict[str, Any]]) -> None:
+        for record in records:
+            self.write(record)
+
+    def _flush(self, key: str) -> None:
+        batch = self._batches.pop(key)
+        if not batch.num_rows:
+            return
+        directory = os.path.join(self.root, key) if key else self.root
+        os.makedirs(directory, exist_ok=True)
+        part = self._part_counters.get(key, 0)
+        self._part_counters[key] = part + 1
+        path = os.path.join(directory, f"part-{part:05d}{FILE_FORMATS[self.file_format]}")
+        for name, kind in batch.kinds.items():
+            self.kinds[name] = _merge_kinds(self.kinds.get(name), kind)
+        self._write_table(batch.to_arrow(self.kinds), path)
+        self._file_kinds[path] = dict(self.kinds)
+        self._buffered_rows -= batch.num_rows
+        self.rows_written += batch.num_rows
+        self.files.append(path)
+
+    def close(self) -> dict[str, Any]:
+        """Flush all remaining buffers and return a summary of what was written."""
+        for key in list(self._batches):
+            self._flush(key)
+        self._unify_schema()
+        return {
+            "path": self.root,
+            "rows": self.rows_written,
+            "files": list(self.files),
+            "partitions": sorted(self._part_counters),
+        }
+
+    def _write_table(self, table, path: str) -> None:
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, path, compression="zstd")
+        else:
+            import pyarrow.feather as feather
+
+            feather.write_feather(table, path, compression="zstd")
+
+    def _read_table(self, path: str):
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.read_table(path)
+        import pyarrow.feather as feather
+
+        return feather.read_table(path)
+
+    def _unify_schema(self) -> None:
+        """Rewrite part files whose schema predates the final, widened schema."""
+        pa = _require_pyarrow()
+        schema = arrow_schema(self.kinds)
+        for path in self.files:
+            if self._file_kinds[path] == self.kinds:
+                continue
+            table = self._read_table(path)
+            columns = [
+                table.column(field.name).cast(field.type)
+                if field.name in table.column_names
+                else pa.nulls(table.num_rows, type=field.type)
+                for field in schema
+            ]
+            self._write_table(pa.Table.from_arrays(columns, schema=schema), path)
+            self._file_kinds[path] = dict(self.kinds)
@@ -0,0 +1,244 @@
+"""Typed filter and sort expressions for Bill list endpoints.
+
+Expressions serialize to the wire format the list endpoints take in their
+`filters` and `sort` parameters (`field:op:value`, comma separated, and
+`field:asc|desc`), can be parsed back from it, and compile to plain Python
+predicates so the same query can be answered from records already in memory.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Sequence, Union
+
+OPERATORS = ("eq", "ne", "gt", "gte", "lt", "lte", "in", "nin", "sw")
+_LIST_OPERATORS = frozenset({"in", "nin"})
+
+
+def _encode(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (list, tuple, set)):
+        return json.dumps(",".join(str(item) for item in value))
+    return json.dumps(str(value))
+
+
+def _decode(text: str, op: str) -> Any:
+    if text.startswith('"') and text.endswith('"') and len(text) >= 2:
+        value = json.loads(text)
+        return value.split(",") if op in _LIST_OPERATORS else value
+    if text in ("true", "false"):
+        return text == "true"
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text.split(",") if op in _LIST_OPERATORS else text
+
+
+def _lookup(record: dict[str, Any], path: str) -> Any:
+    value: Any = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _comparable(left: Any, right: Any) -> tuple[Any, Any]:
+    """Coerce a record value and a filter value to a common comparable type."""
+    if isinstance(left, bool) or isinstance(right, bool):
+        return left, right
+    if isinstance(left, (int, float)) and not isinstance(right, (int, float)):
+        try:
+            return left, float(right)
+        except (TypeError, ValueError):
+            return str(left), str(right)
+    if isinstance(right, (int, float)) and isinstance(left, str):
+        try:
+            return float(left), right
+        except ValueError:
+            return left, str(right)
+    return left, right
+
+
+@dataclass(frozen=True)
+class Filter:
+    """One `field:op:value` condition. Dotted fields address nested objects locally."""
+
+    field: str
+    op: str
+    value: Any
+
+    def __post_init__(self) -> None:
+        if self.op not in OPERATORS:
+            raise ValueError(f"Unsupported filter operator '{self.op}'; expected one of {OPERATORS}.")
+
+    def to_wire(self) -> str:
+        return f"{self.field}:{self.op}:{_encode(self.value)}"
+
+    def matches(self, record: dict[str, Any]) -> bool:
+        actual = _lookup(record, self.field)
+        if self.op in _LIST_OPERATORS:
+            accepted = self.value if isinstance(self.value, (list, tuple, set)) else [self.value]
+            found = any(left == right for left, right in (_comparable(actual, item) for item in accepted))
+            return found if self.op == "in" else not found
+        if self.op == "sw":
+            return isinstance(actual, str) and actual.lower().startswith(str(self.value).lower())
+        left, right = _comparable(actual, self.value)
+        if self.op == "eq":
+            return left == right
+        if self.op == "ne":
+            return left != right
+        if left is None or right is None:
+            return False
+        try:
+            if self.op == "gt":
+                return left > right
+            if self.op == "gte":
+                return left >= right
+            if self.op == "lt":
+                return left < right
+            return left <= right
+        except TypeError:
+            return False
+
+
+@dataclass(frozen=True)
+class Sort:
+    field: str
+    descending: bool = False
+
+    def to_wire(self) -> str:
+        return f"{self.field}:{'desc' if self.descending else 'asc'}"
+
+
+class Field:
+    """Builder for filters and sorts on one field, e.g. `Field("dueDate").lte("2024-06-30")`."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def eq(self, value: Any) -> Filter:
+        return Filter(self.name, "eq", value)
+
+    def ne(self, value: Any) -> Filter:
+        return Filter(self.name, "ne", value)
+
+    def gt(self, value: Any) -> Filter:
+        return Filter(self.name, "gt", value)
+
+    def gte(self, value: Any) -> Filter:
+        return Filter(self.name, "gte", value)
+
+    def lt(self, value: Any) -> Filter:
+        return Filter(self.name, "lt", value)
+
+    def lte(self, value: Any) -> Filter:
+        return Filter(self.name, "lte", value)
+
+    def in_(self, values: Iterable[Any]) -> Filter:
+        return Filter(self.name, "in", list(values))
+
+    def nin(self, values: Iterable[Any]) -> Filter:
+        return Filter(self.name, "nin", list(values))
+
+    def startswith(self, prefix: str) -> Filter:
+        return Filter(self.name, "sw", prefix)
+
+    def asc(self) -> Sort:
+        return Sort(self.name)
+
+    def desc(self) -> Sort:
+        return Sort(self.name, descending=True)
+
+
+FilterSpec = Union[None, str, Filter, dict[str, Any], Sequence[Union[Filter, dict[str, Any]]]]
+SortSpec = Union[None, str, Sort, Sequence[Union[Sort, str]]]
+
+
+def _split_outside_quotes(text: str) -> list[str]:
+    parts, current, quoted, escaped = [], [], False, False
+    for char in text:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif char == "," and not quoted:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_filters(spec: FilterSpec) -> list[Filter]:
+    """Normalize a wire string, a `Filter`, a `{field, op, value}` dict or a list of them."""
+    if spec is None:
+        return []
+    if isinstance(spec, Filter):
+        return [spec]
+    if isinstance(spec, dict):
+        return [Filter(spec["field"], spec.get("op", "eq"), spec.get("value"))]
+    if isinstance(spec, str):
+        filters = []
+        for part in _split_outside_quotes(spec):
+            field, op, value = part.split(":", 2)
+            filters.append(Filter(field, op, _decode(value, op)))
+        return filters
+    return [item for entry in spec for item in parse_filters(entry)]
+
+
+def parse_sort(spec: SortSpec) -> list[Sort]:
+    if spec is None:
+        return []
+    if isinstance(spec, Sort):
+        return [spec]
+    if isinstance(spec, str):
+        sorts = []
+        for part in _split_outside_quotes(spec):
+            field, _, direction = part.partition(":")
+            sorts.append(Sort(field, descending=direction.lower() == "desc"))
+        return sorts
+    return [item for entry in spec for item in parse_sort(entry)]
+
+
+def serialize_filters(spec: FilterSpec) -> Optional[str]:
+    filters = parse_filters(spec)
+    return ",".join(f.to_wire() for f in filters) if filters else None
+
+
+def serialize_sort(spec: SortSpec) -> Optional[str]:
+    sorts = parse_sort(spec)
+    return ",".join(s.to_wire() for s in sorts) if sorts else None
+
+
+def compile_predicate(spec: FilterSpec) -> Callable[[dict[str, Any]], bool]:
+    """Compile filters into one predicate; all conditions must hold."""
+    filters = parse_filters(spec)
+    if not filters:
+        return lambda record: True
+    return lambda record: all(f.matches(record) for f in filters)
+
+
+def apply_query(records: Iterable[dict[str, Any]], filters: FilterSpec = None, sort: SortSpec = None, limit: Optional[int] = None) -> list[dict[str, Any]]:
+    """Evaluate filters and sort against in-memory records.
+
+    Records missing a sort field are placed last regardless of direction.
+    """
+    predicate = compile_predicate(filters)
+    selected = [record for record in records if predicate(record)]
+    # Stable sorts applied from the least to the most significant key.
+    for order in reversed(parse_sort(sort)):
+        present = [r for r in selected if _lookup(r, order.field) is not None]
+        missing = [r for r in selected if _lookup(r, order.field) is None]
+        present.sort(key=lambda r: _lookup(r, order.field), reverse=order.descending)
+        selected = present + missing
+    return selected if limit is None else selected[:limit]
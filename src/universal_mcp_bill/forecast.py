@@ -0,0 +1,221 @@
+"""Day-by-day cash requirements forecast from bills, recurring bills and payments.
+
+`CashForecaster` keeps the outflows contributed by every input record together
+with a fingerprint of the fields they were derived from. Re-syncing a source
+only re-expands records whose fingerprint changed, so a daily refresh where a
+handful of bills moved costs a handful of updates rather than a full rebuild.
+Outflows are stored on their own due dates and only clamped to a forecast
+window when a series is built, so moving the window needs no resync. Pending
+payments reduce the outflow of the bills they pay by the amount scheduled.
+"""
+
+from __future__ import annotations
+
+import calendar
+import hashlib
+import json
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Iterable, Optional
+
+from universal_mcp_bill.constants import CLOSED_BILL_STATUSES, PENDING_PAYMENT_STATUSES
+
+UNASSIGNED_ACCOUNT = "unassigned"
+PERIOD_MONTHS = {"MONTHLY": 1, "QUARTERLY": 3, "SEMIANNUALLY": 6, "ANNUALLY": 12, "YEARLY": 12}
+PERIOD_DAYS = {"DAILY": 1, "WEEKLY": 7, "BIWEEKLY": 14}
+
+# Fields each source's outflows depend on; anything else can change without a recompute.
+SOURCE_FIELDS = {
+    "bills": ("archived", "paymentStatus", "dueDate", "amount", "dueAmount", "fundingAccount"),
+    "recurring_bills": ("archived", "schedule", "recurringBillLineItems", "fundingAccount"),
+    "payments": ("status", "processDate", "amount", "fundingAccount"),
+}
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def expand_schedule(schedule: dict[str, Any], start: date, end: date) -> list[date]:
+    """Return the due dates a recurring-bill schedule produces in `[start, end)`.
+
+    Occurrences are computed from the anchor `nextDueDate` rather than from the
+    previous occurrence, so month-end anchors do not drift after short months.
+    """
+    anchor = schedule.get("nextDueDate")
+    if not anchor:
+        return []
+    anchor = date.fromisoformat(anchor[:10])
+    last = date.fromisoformat(schedule["endDate"][:10]) if schedule.get("endDate") else None
+    period = (schedule.get("period") or "MONTHLY").upper()
+    frequency = max(int(schedule.get("frequency") or 1), 1)
+    if period in PERIOD_MONTHS:
+        step_months, step_days = PERIOD_MONTHS[period] * frequency, 0
+    elif period in PERIOD_DAYS:
+        step_months, step_days = 0, PERIOD_DAYS[period] * frequency
+    else:
+        raise ValueError(f"Unsupported recurring bill period '{period}'.")
+    occurrences = []
+    n = 0
+    while True:
+        due = _add_months(anchor, n * step_months) if step_months else anchor + timedelta(days=n * step_days)
+        if due >= end or (last is not None and due > last):
+            return occurrences
+        if due >= start:
+            occurrences.append(due)
+        n += 1
+
+
+def _funding_account(record: dict[str, Any]) -> str:
+    account = record.get("fundingAccount")
+    if isinstance(account, dict) and account.get("id"):
+        return account["id"]
+    return UNASSIGNED_ACCOUNT
+
+
+def _fingerprint(record: dict[str, Any], fields: tuple[str, ...]) -> str:
+    payload = json.dumps([record.get(field) for field in fields], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=12).hexdigest()
+
+
+class CashForecaster:
+    """Incrementally maintained outflow totals per funding account and day."""
+
+    def __init__(self) -> None:
+        self._contributions: dict[tuple[str, str], tuple[str, list[tuple[str, Any, float]]]] = {}
+        self._totals: dict[tuple[str, date], float] = defaultdict(float)
+        self._schedules: dict[str, tuple[str, dict[str, Any], float]] = {}
+        self._covered_bills: dict[str, float] = {}
+
+    def _outflows(self, source: str, record: dict[str, Any]) -> list[tuple[str, Any, float]]:
+        """Outflows of one record as `(account, due, amount)`; recurring bills carry their schedule as `due`."""
+        if record.get("archived"):
+            return []
+        account = _funding_account(record)
+        if source == "bills":
+            if record.get("paymentStatus") in CLOSED_BILL_STATUSES:
+                return []
+            # The part already scheduled by a pending payment is counted on the payment's process date.
+            amount = float(record.get("dueAmount", record.get("amount")) or 0.0) - self._covered_bills.get(record.get("id"), 0.0)
+            if amount <= 0 or not record.get("dueDate"):
+                return []
+            return [(account, date.fromisoformat(record["dueDate"][:10]), amount)]
+        if source == "recurring_bills":
+            amount = sum(item.get("amount") or 0.0 for item in record.get("recurringBillLineItems") or [])
+            schedule = record.get("schedule") or {}
+            if not amount or not schedule.get("nextDueDate"):
+                return []
+            return [(account, schedule, float(amount))]
+        if source == "payments":
+            if record.get("status") not in PENDING_PAYMENT_STATUSES or not record.get("processDate"):
+                return []
+            return [(account, date.fromisoformat(record["processDate"][:10]), float(record.get("amount") or 0.0))]
+        raise ValueError(f"Unknown forecast source '{source}'.")
+
+    def _apply(self, source: str, record_id: str, outflows: list[tuple[str, Any, float]], sign: float) -> None:
+        if source == "recurring_bills":
+            if sign > 0 and outflows:
+                self._schedules[record_id] = outflows[0]
+            else:
+                self._schedules.pop(record_id, None)
+            return
+        for account, due, amount in outflows:
+            key = (account, due)
+            self._totals[key] += sign * amount
+            if abs(self._totals[key]) < 1e-9:
+                del self._totals[key]
+
+    def _set(self, source: str, record_id: str, fingerprint: Optional[str], outflows: list[tuple[str, Any, float]]) -> None:
+        previous = self._contributions.pop((source, record_id), None)
+        if previous is not None:
+            self._apply(source, record_id, previous[1], -1.0)
+        if fingerprint is not None:
+            self._contributions[(source, record_id)] = (fingerprint, outflows)
+            self._apply(source, record_id, outflows, 1.0)
+
+    def sync(self, source: str, records: Iterable[dict[str, Any]]) -> int:
+        """Make `source` match `records`; returns how many records were recomputed.
+
+        Records that disappeared from the source are removed, so callers may
+        list only open records. Pending payments must be synced before bills
+        so the amounts they already cover are not counted twice.
+        """
+        fields = SOURCE_FIELDS[source]
+        seen: set[str] = set()
+        changed = 0
+        if source == "payments":
+            covered: dict[str, float] = defaultdict(float)
+        for record in records:
+            record_id = record.get("id")
+            if record_id is None:
+                continue
+            seen.add(record_id)
+            if source == "payments" and record.get("status") in PENDING_PAYMENT_STATUSES:
+                for bill_id, amount in _paid_bill_amounts(record).items():
+                    covered[bill_id] += amount
+            fingerprint = _fingerprint(record, fields)
+            current = self._contributions.get((source, record_id))
+            if current is not None and current[0] == fingerprint:
+                continue
+            self._set(source, record_id, fingerprint, self._outflows(source, record))
+            changed += 1
+        for stale_source, record_id in [key for key in self._contributions if key[0] == source and key[1] not in seen]:
+            self._set(stale_source, record_id, None, [])
+            changed += 1
+        if source == "payments" and covered != self._covered_bills:
+            # Bills whose coverage changed must be re-expanded on the next bills sync.
+            for bill_id in covered.keys() | self._covered_bills.keys():
+                if covered.get(bill_id) == self._covered_bills.get(bill_id):
+                    continue
+                entry = self._contributions.get(("bills", bill_id))
+                if entry is not None:
+                    self._contributions[("bills", bill_id)] = ("", entry[1])
+            self._covered_bills = dict(covered)
+        return changed
+
+    def series(self, start: date, days: int = 90) -> dict[str, Any]:
+        """Return per-account daily outflows for `days` days from `start`, aligned with a shared list of dates.
+
+        Outflows due before `start`, including recurring-bill occurrences,
+        are overdue and have to be funded on the first forecast day.
+        """
+        if days <= 0:
+            raise ValueError("days must be positive.")
+        end = start + timedelta(days=days)
+        dates = [start + timedelta(days=offset) for offset in range(days)]
+        accounts: dict[str, list[float]] = {}
+        for (account, due), amount in self._totals.items():
+            if due >= end:
+                continue
+            amounts = accounts.setdefault(account, [0.0] * days)
+            amounts[(max(due, start) - start).days] += amount
+        for account, schedule, amount in self._schedules.values():
+            for due in expand_schedule(schedule, date.min, end):
+                amounts = accounts.setdefault(account, [0.0] * days)
+                amounts[(max(due, start) - start).days] += amount
+        daily_total = [round(sum(values), 2) for values in zip(*accounts.values())] if accounts else [0.0] * days
+        return {
+            "startDate": start.isoformat(),
+            "endDate": (end - timedelta(days=1)).isoformat(),
+            "dates": [day.isoformat() for day in dates],
+            "total": round(sum(daily_total), 2),
+            "dailyTotal": daily_total,
+            "accounts": {
+                account: {"total": round(sum(amounts), 2), "daily": [round(value, 2) for value in amounts]}
+                for account, amounts in sorted(accounts.items())
+            },
+        }
+
+
+def _paid_bill_amounts(payment: dict[str, Any]) -> dict[str, float]:
+    """Amount a payment puts towards each bill; a bill payment without an amount covers the whole bill."""
+    amounts: dict[str, float] = defaultdict(float)
+    if payment.get("billId"):
+        amounts[payment["billId"]] += float(payment.get("amount") or 0.0)
+    for bill_payment in payment.get("billPayments") or []:
+        if bill_payment.get("billId"):
+            amount = bill_payment.get("amount")
+            amounts[bill_payment["billId"]] += float(amount) if amount is not None else float("inf")
+    return amounts
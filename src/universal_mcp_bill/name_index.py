@@ -0,0 +1,127 @@
+"""In-memory trigram and prefix index over vendor and customer names."""
+
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Iterable, Optional
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+# Legal-form suffixes that rarely help tell two counterparties apart.
+_SUFFIXES = frozenset({"inc", "llc", "ltd", "llp", "co", "corp", "corporation", "company", "incorporated", "limited", "plc", "gmbh"})
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lower-case, strip accents and punctuation and drop trailing legal-form suffixes."""
+    text = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode().lower()
+    words = _NON_ALNUM.sub(" ", text).split()
+    while len(words) > 1 and words[-1] in _SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Ranked fuzzy lookup of names by trigram overlap, with exact and prefix boosts."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._grams: dict[str, set[str]] = {}
+        self._postings: dict[str, set[str]] = defaultdict(set)
+        self._sorted: list[tuple[str, str]] = []
+        self._lock = threading.RLock()
+        self.loaded_types: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entity_type: str, record: dict[str, Any]) -> None:
+        """Index (or re-index) a vendor or customer record; archived records are removed."""
+        record_id = record.get("id")
+        if not record_id:
+            return
+        with self._lock:
+            self.remove(record_id)
+            if record.get("archived"):
+                return
+            normalized = normalize_name(record.get("name"))
+            if not normalized:
+                return
+            grams = trigrams(normalized)
+            self._entries[record_id] = {"id": record_id, "type": entity_type, "name": record.get("name"), "normalized": normalized}
+            self._grams[record_id] = grams
+            for gram in grams:
+                self._postings[gram].add(record_id)
+            bisect.insort(self._sorted, (normalized, record_id))
+
+    def load(self, entity_type: str, records: Iterable[dict[str, Any]]) -> None:
+        with self._lock:
+            for record_id in [rid for rid, entry in self._entries.items() if entry["type"] == entity_type]:
+                self.remove(record_id)
+            for record in records:
+                self.add(entity_type, record)
+            self.loaded_types.add(entity_type)
+
+    def remove(self, record_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(record_id, None)
+            if entry is None:
+                return
+            for gram in self._grams.pop(record_id):
+                postings = self._postings[gram]
+                postings.discard(record_id)
+                if not postings:
+                    del self._postings[gram]
+            position = bisect.bisect_left(self._sorted, (entry["normalized"], record_id))
+            del self._sorted[position]
+
+    def _prefix_matches(self, prefix: str, limit: int) -> list[str]:
+        start = bisect.bisect_left(self._sorted, (prefix, ""))
+        matches = []
+        for normalized, record_id in self._sorted[start:]:
+            if not normalized.startswith(prefix) or len(matches) >= limit:
+                break
+            matches.append(record_id)
+        return matches
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.3, entity_types: Optional[Iterable[str]] = None) -> list[dict[str, Any]]:
+        """Return up to `limit` matches ranked by score, highest first.
+
+        The score is the Dice coefficient of the trigram sets, plus 1.0 for an
+        exact normalized match and 0.5 for a prefix match.
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        types = set(entity_types) if entity_types else None
+        query_grams = trigrams(normalized)
+        with self._lock:
+            overlaps: Counter[str] = Counter()
+            for gram in query_grams:
+                overlaps.update(self._postings.get(gram, ()))
+            for record_id in self._prefix_matches(normalized, limit * 4):
+                overlaps.setdefault(record_id, 0)
+            scored = []
+            for record_id, overlap in overlaps.items():
+                entry = self._entries[record_id]
+                if types is not None and entry["type"] not in types:
+                    continue
+                score = 2 * overlap / (len(query_grams) + len(self._grams[record_id]))
+                if entry["normalized"] == normalized:
+                    score += 1.0
+                elif entry["normalized"].startswith(normalized):
+                    score += 0.5
+                if score >= min_score:
+                    scored.append((score, entry))
+        scored.sort(key=lambda item: (-item[0], item[1]["normalized"]))
+        return [
+            {"id": entry["id"], "type": entry["type"], "name": entry["name"], "score": round(score, 3)}
+            for score, entry in scored[:limit]
+        ]
@@ -0,0 +1,246 @@
+"""SQLite-backed write-behind outbox for Bill mutations.
+
+Mutations are journaled and acknowledged with a handle immediately; a
+background thread delivers them in batches, through a bulk endpoint where
+the operation has one. Entries are only marked done after the API call
+succeeds, so anything journaled before a crash is replayed on restart:
+delivery is at-least-once, and a crash between the API call and the commit
+can deliver an entry twice. Failed entries are retried with exponential
+backoff and jitter, scheduled per entry.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    handle TEXT NOT NULL UNIQUE,
+    operation TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (status, operation, seq);
+"""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Rate limiting, server errors and transport failures are transient; other errors are not."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def _retry_after(error: BaseException) -> float:
+    if isinstance(error, httpx.HTTPStatusError):
+        try:
+            return float(error.response.headers.get("Retry-After", 0))
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+
+@dataclass
+class OutboxHandler:
+    """How to deliver one operation: per entry, or `bulk_size` entries per bulk call."""
+
+    single: Callable[[dict[str, Any]], Any]
+    bulk: Optional[Callable[[list[dict[str, Any]]], Any]] = None
+    bulk_size: int = 100
+
+
+class Outbox:
+    """Durable queue of pending mutations with batched background delivery.
+
+    An entry that fails is retried on a later flush once its backoff has
+    elapsed: `base_backoff * 2 ** (attempts - 1)` seconds, capped at
+    `max_backoff`, with half of it jittered and never sooner than a
+    `Retry-After` header asks. Transient failures (429, 5xx, transport
+    errors) keep retrying until `retry_window` seconds have passed since the
+    entry was enqueued; other failures are marked `failed` after
+    `max_attempts` attempts. A bulk call that fails is retried entry by entry
+    so one bad item does not hold back the rest of its batch.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        handlers: dict[str, OutboxHandler],
+        flush_interval: float = 1.0,
+        max_attempts: int = 5,
+        base_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        retry_window: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.handlers = handlers
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.retry_window = retry_window
+        self._clock = clock
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(outbox)")}
+        if "next_attempt_at" not in columns:
+            self._db.execute("ALTER TABLE outbox ADD COLUMN next_attempt_at REAL NOT NULL DEFAULT 0")
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Entries whose bulk call failed are retried individually.
+        self._isolate: set[str] = set()
+
+    def enqueue(self, operation: str, payload: dict[str, Any]) -> str:
+        if operation not in self.handlers:
+            raise ValueError(f"Unsupported outbox operation '{operation}'; expected one of {sorted(self.handlers)}.")
+        handle = uuid.uuid4().hex
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO outbox (handle, operation, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (handle, operation, json.dumps(payload, default=str), now, now),
+            )
+        return handle
+
+    def status(self, handle: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT handle, operation, status, attempts, result, error FROM outbox WHERE handle = ?", (handle,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "handle": row[0],
+            "operation": row[1],
+            "status": row[2],
+            "attempts": row[3],
+            "result": json.loads(row[4]) if row[4] is not None else None,
+            "error": row[5],
+        }
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    def _backoff(self, attempts: int, error: BaseException) -> float:
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+        return max(delay / 2 + random.uniform(0, delay / 2), _retry_after(error))
+
+    def _finish(self, handle: str, result: Any = None, error: Optional[BaseException] = None) -> str:
+        now = self._clock()
+        with self._lock:
+            if error is None:
+                self._db.execute(
+                    "UPDATE outbox SET status = 'done', attempts = attempts + 1, result = ?, error = NULL, updated_at = ? WHERE handle = ?",
+                    (json.dumps(result, default=str), now, handle),
+                )
+                return "done"
+            attempts, created_at = self._db.execute("SELECT attempts, created_at FROM outbox WHERE handle = ?", (handle,)).fetchone()
+            attempts += 1
+            next_attempt_at = now + self._backoff(attempts, error)
+            if is_retryable(error):
+                exhausted = next_attempt_at > created_at + self.retry_window
+            else:
+                exhausted = attempts >= self.max_attempts
+            status = "failed" if exhausted else "pending"
+            self._db.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, error = ?, updated_at = ?, next_attempt_at = ? WHERE handle = ?",
+                (status, attempts, str(error), now, next_attempt_at, handle),
+            )
+            return status
+
+    def flush(self) -> dict[str, int]:
+        """Deliver every pending entry whose backoff has elapsed; returns how many ended done, failed or still pending."""
+        counts = {"done": 0, "failed": 0, "pending": 0}
+        with self._flush_lock:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT handle, operation, payload FROM outbox WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY seq",
+                    (self._clock(),),
+                ).fetchall()
+            by_operation: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+            for handle, operation, payload in rows:
+                by_operation.setdefault(operation, []).append((handle, json.loads(payload)))
+            for operation, entries in by_operation.items():
+                handler = self.handlers.get(operation)
+                if handler is None:
+                    for handle, _ in entries:
+                        counts[self._finish(handle, error=ValueError(f"No handler for '{operation}'."))] += 1
+                    continue
+                batchable = [entry for entry in entries if entry[0] not in self._isolate] if handler.bulk else []
+                singles = [entry for entry in entries if not handler.bulk or entry[0] in self._isolate]
+                for start in range(0, len(batchable), handler.bulk_size):
+                    self._deliver_bulk(handler, batchable[start : start + handler.bulk_size], counts)
+                for handle, payload in singles:
+                    try:
+                        result = handler.single(payload)
+                    except Exception as e:
+                        counts[self._finish(handle, error=e)] += 1
+                    else:
+                        counts[self._finish(handle, result)] += 1
+                    self._isolate.discard(handle)
+        return counts
+
+    def _deliver_bulk(self, handler: OutboxHandler, batch: list[tuple[str, dict[str, Any]]], counts: dict[str, int]) -> None:
+        try:
+            result = handler.bulk([payload for _, payload in batch])
+        except Exception as e:
+            logger.warning("Bulk delivery of %d outbox entries failed; retrying them one by one", len(batch), exc_info=True)
+            for handle, _ in batch:
+                self._isolate.add(handle)
+                counts[self._finish(handle, error=e)] += 1
+            return
+        # Bulk endpoints answer with one item per request item, in order.
+        per_item = result if isinstance(result, list) and len(result) == len(batch) else [result] * len(batch)
+        for (handle, _), item in zip(batch, per_item):
+            counts[self._finish(handle, item)] += 1
+
+    def start(self) -> "Outbox":
+        """Start background delivery; entries left pending by a previous process are replayed first."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="bill-outbox", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Outbox flush failed")
+            # Entries enqueued during the interval are delivered together in the next flush.
+            self._stop.wait(self.flush_interval)
+
+    def close(self, flush: bool = True) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush()
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,141 @@
+"""Payment-run helpers: memoized vendor payment options and bulk payment planning."""
+
+from __future__ import annotations
+
+import base64
+import json
+import math
+import threading
+from typing import Any, Callable, Iterable, Optional
+
+from universal_mcp_bill.cache import TTLCache
+from universal_mcp_bill.concurrency import DEFAULT_MAX_WORKERS, run_concurrently
+
+
+def amount_bucket(amount: float) -> int:
+    """Order-of-magnitude bucket: amounts in (10**(k-1), 10**k] share bucket k."""
+    if not amount or amount <= 0:
+        return 0
+    return math.ceil(math.log10(amount))
+
+
+class PaymentOptionsResolver:
+    """Cache vendor payment options per vendor and amount bucket.
+
+    The options for one vendor rarely depend on the exact amount, so they are
+    fetched for the first amount seen in a bucket and reused for the rest.
+    Invalidating a vendor bumps its generation, which orphans every cached
+    bucket for it at once; orphaned entries age out of the LRU.
+    """
+
+    def __init__(self, fetch: Callable[[str, float], Any], ttl: float = 900.0, maxsize: int = 10_000) -> None:
+        self._fetch = fetch
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, vendor_id: str, amount: float) -> tuple[str, int, int]:
+        return (vendor_id, self._generations.get(vendor_id, 0), amount_bucket(amount))
+
+    def get(self, vendor_id: str, amount: float) -> Any:
+        return self._cache.get_or_load(self._key(vendor_id, amount), lambda: self._fetch(vendor_id, amount))
+
+    def prefetch(self, requests: Iterable[tuple[str, float]], max_workers: int = DEFAULT_MAX_WORKERS) -> dict[str, Any]:
+        """Resolve options for many (vendor, amount) pairs, one request per distinct vendor bucket."""
+        distinct: dict[tuple[str, int, int], tuple[str, float]] = {}
+        for vendor_id, amount in requests:
+            distinct.setdefault(self._key(vendor_id, amount), (vendor_id, amount))
+        outcomes = run_concurrently(lambda pair: self.get(*pair), distinct.values(), max_workers=max_workers)
+        return {
+            "requested": len(distinct),
+            "failed": [{"vendorId": o.item[0], "amount": o.item[1], "error": str(o.error)} for o in outcomes if not o.ok],
+        }
+
+    def invalidate(self, vendor_id: str) -> None:
+        with self._lock:
+            self._generations[vendor_id] = self._generations.get(vendor_id, 0) + 1
+
+
+DEFAULT_PAYMENTS_PER_REQUEST = 100
+
+
+def _request_key(item: dict[str, Any], single_vendor: bool) -> tuple:
+    return (
+        json.dumps(item["fundingAccount"], sort_keys=True, default=str),
+        item.get("processDate"),
+        json.dumps(item.get("processingOptions"), sort_keys=True, default=str),
+        item.get("vendorId") if single_vendor else None,
+    )
+
+
+def plan_bulk_payments(
+    items: Iterable[dict[str, Any]],
+    max_per_request: int = DEFAULT_PAYMENTS_PER_REQUEST,
+    single_vendor: bool = False,
+) -> list[dict[str, Any]]:
+    """Group bill payments into `create_bulk_payment` keyword arguments.
+
+    Each item needs `billId`, `amount` and `fundingAccount`, and may carry
+    `vendorId`, `processDate` and `processingOptions`. Items sharing a funding
+    account, process date and processing options (and vendor, with
+    `single_vendor`) go into the same requests, at most `max_per_request`
+    payments each. Within a group, one vendor's bills stay together.
+    """
+    if max_per_request <= 0:
+        raise ValueError("max_per_request must be positive.")
+    groups: dict[tuple, list[dict[str, Any]]] = {}
+    for item in items:
+        groups.setdefault(_request_key(item, single_vendor), []).append(item)
+    requests = []
+    for group in groups.values():
+        group.sort(key=lambda item: item.get("vendorId") or "")
+        first = group[0]
+        for start in range(0, len(group), max_per_request):
+            chunk = group[start : start + max_per_request]
+            request = {
+                "fundingAccount": first["fundingAccount"],
+                "processDate": first.get("processDate"),
+                "processingOptions": first.get("processingOptions"),
+                "vendorId": first.get("vendorId") if single_vendor else None,
+                "payments": [{"billId": item["billId"], "amount": item["amount"]} for item in chunk],
+            }
+            requests.append({k: v for k, v in request.items() if v is not None})
+    return requests
+
+
+def bulk_payment_results(response: Any, payments: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Attribute a `create_bulk_payment` response to the bills it paid, in `payments` order."""
+    created = response if isinstance(response, list) else None
+    if isinstance(response, dict):
+        created = response.get("payments") or response.get("results")
+    by_bill: dict[str, Any] = {}
+    if isinstance(created, list):
+        for payment in created:
+            if not isinstance(payment, dict):
+                continue
+            bill_ids = [payment.get("billId")] + [bill.get("id") for bill in payment.get("bills") or [] if isinstance(bill, dict)]
+            for bill_id in filter(None, bill_ids):
+                by_bill[bill_id] = payment
+    results = []
+    for index, item in enumerate(payments):
+        payment: Optional[Any] = by_bill.get(item["billId"])
+        if payment is None:
+            payment = created[index] if isinstance(created, list) and len(created) == len(payments) else response
+        results.append({"billId": item["billId"], "status": "submitted", "payment": payment})
+    return results
+
+
+# Keys under which a JSON check-image response may carry the base64 image.
+CHECK_IMAGE_KEYS = ("checkImageData", "checkImage", "imageData", "image", "data", "content")
+
+
+def decode_check_image(body: Any) -> bytes:
+    """Extract the image bytes from a JSON `get_check_image_data` response."""
+    if isinstance(body, dict):
+        for key in CHECK_IMAGE_KEYS:
+            value = body.get(key)
+            if isinstance(value, str) and value:
+                return base64.b64decode(value.split(",", 1)[-1] if value.startswith("data:") else value)
+            if isinstance(value, dict):
+                return decode_check_image(value)
+    raise ValueError("Check image response does not contain image data.")
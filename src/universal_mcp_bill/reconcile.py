@@ -0,0 +1,186 @@
+"""Hash-join reconciliation of incoming customer payments against open invoices.
+
+Open invoices are streamed once into hash tables (the build side); payments are
+then probed against them by reference and by amount with constant-time
+lookups. Matched invoices are consumed so one invoice is never applied
+twice, and the whole run is linear in invoices plus payments.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict, deque
+from decimal import Decimal
+from typing import Any, Iterable, Optional
+
+_REFERENCE_SPLIT = re.compile(r"[,;]")
+_REFERENCE_JUNK = re.compile(r"[^0-9A-Z]")
+CLOSED_INVOICE_STATUSES = frozenset({"PAID_IN_FULL", "PAID", "VOID", "VOIDED"})
+
+
+def _cents(amount: Any) -> int:
+    return int((Decimal(str(amount or 0)) * 100).to_integral_value())
+
+
+def normalize_reference(reference: Optional[str]) -> str:
+    return _REFERENCE_JUNK.sub("", (reference or "").upper())
+
+
+def _references(payment: dict[str, Any]) -> list[str]:
+    raw = payment.get("reference") or payment.get("references") or []
+    if isinstance(raw, str):
+        raw = _REFERENCE_SPLIT.split(raw)
+    return [ref for ref in (normalize_reference(r) for r in raw) if ref]
+
+
+class _OpenInvoice:
+    __slots__ = ("id", "customer_id", "number", "due_cents", "due_date")
+
+    def __init__(self, record: dict[str, Any]) -> None:
+        self.id = record["id"]
+        self.customer_id = record.get("customerId") or (record.get("customer") or {}).get("id")
+        self.number = normalize_reference(record.get("invoiceNumber"))
+        due = record.get("dueAmount")
+        self.due_cents = _cents(due if due is not None else record.get("totalAmount", record.get("amount")))
+        self.due_date = record.get("dueDate") or ""
+
+
+class InvoiceReconciler:
+    """Match payments to open invoices with reference and amount hash joins.
+
+    `amount_tolerance` is the largest absolute difference, in currency units,
+    accepted between a payment and the invoice(s) it settles. With
+    `allow_partial`, a reference match for less than the amount due is
+    recorded as a partial payment.
+    """
+
+    def __init__(self, invoices: Iterable[dict[str, Any]], amount_tolerance: float = 0.0, allow_partial: bool = False) -> None:
+        self.tolerance_cents = _cents(amount_tolerance)
+        self.allow_partial = allow_partial
+        self._by_reference: dict[tuple[Optional[str], str], _OpenInvoice] = {}
+        self._by_number: dict[str, list[_OpenInvoice]] = defaultdict(list)
+        self._by_amount: dict[tuple[Optional[str], int], deque[_OpenInvoice]] = defaultdict(deque)
+        self._consumed: set[str] = set()
+        self.open_invoices = 0
+        open_invoices = [
+            _OpenInvoice(record)
+            for record in invoices
+            if record.get("id") and not record.get("archived") and record.get("status") not in CLOSED_INVOICE_STATUSES
+        ]
+        # Oldest due date first, so amount matches settle the oldest of equal invoices.
+        open_invoices.sort(key=lambda invoice: invoice.due_date)
+        for invoice in open_invoices:
+            if invoice.due_cents <= 0:
+                continue
+            self.open_invoices += 1
+            if invoice.number:
+                self._by_reference[(invoice.customer_id, invoice.number)] = invoice
+                self._by_number[invoice.number].append(invoice)
+            self._by_amount[(invoice.customer_id, invoice.due_cents)].append(invoice)
+
+    def _lookup_reference(self, customer_id: Optional[str], reference: str) -> Optional[_OpenInvoice]:
+        if customer_id is not None:
+            invoice = self._by_reference.get((customer_id, reference))
+        else:
+            candidates = [i for i in self._by_number.get(reference, []) if i.id not in self._consumed]
+            invoice = candidates[0] if len(candidates) == 1 else None
+        return None if invoice is None or invoice.id in self._consumed else invoice
+
+    def _lookup_amount(self, customer_id: Optional[str], cents: int) -> Optional[_OpenInvoice]:
+        if customer_id is None:
+            return None
+        # Probe exact amount first, then one cent further away on each side, up to the tolerance.
+        for offset in range(self.tolerance_cents + 1):
+            for probe in {cents - offset, cents + offset}:
+                queue = self._by_amount.get((customer_id, probe))
+                # Entries go stale when their invoice is consumed or partially paid.
+                while queue and (queue[0].id in self._consumed or queue[0].due_cents != probe):
+                    queue.popleft()
+                if queue:
+                    return queue[0]
+        return None
+
+    def _match_reference(self, payment: dict[str, Any]) -> tuple[Optional[str], list[tuple[_OpenInvoice, int]]]:
+        customer_id = payment.get("customerId")
+        cents = _cents(payment.get("amount"))
+        references = _references(payment)
+        if not references:
+            return None, []
+        invoices = [self._lookup_reference(customer_id, reference) for reference in references]
+        if not all(invoices) or len({i.id for i in invoices}) != len(invoices):
+            return None, []
+        due = sum(invoice.due_cents for invoice in invoices)
+        if abs(due - cents) <= self.tolerance_cents:
+            # Any tolerated difference is absorbed by the last invoice.
+            applied = [(invoice, invoice.due_cents) for invoice in invoices]
+            applied[-1] = (invoices[-1], invoices[-1].due_cents + cents - due)
+            return "reference", applied
+        if self.allow_partial and len(invoices) == 1 and 0 < cents < due:
+            return "partial", [(invoices[0], cents)]
+        return None, []
+
+    def _match_amount(self, payment: dict[str, Any]) -> tuple[Optional[str], list[tuple[_OpenInvoice, int]]]:
+        cents = _cents(payment.get("amount"))
+        invoice = self._lookup_amount(payment.get("customerId"), cents)
+        if invoice is not None:
+            return "amount", [(invoice, cents)]
+        return None, []
+
+    def _apply(self, rule: str, applied: list[tuple[_OpenInvoice, int]]) -> None:
+        for invoice, cents in applied:
+            if rule != "partial":
+                self._consumed.add(invoice.id)
+            else:
+                invoice.due_cents -= cents
+                self._by_amount[(invoice.customer_id, invoice.due_cents)].append(invoice)
+
+    def reconcile(self, payments: Iterable[dict[str, Any]], default_payment_type: str = "OTHER") -> dict[str, Any]:
+        """Match payments and build `record_invoice` requests for every match.
+
+        Explicit references are resolved for every payment first, so an
+        amount-only payment earlier in the list cannot take an invoice that a
+        later payment names. Amount matching then runs over what is left.
+        Payments without a `paymentDate` are reported as unmatched, since
+        `record_invoice` cannot record them.
+        """
+        payments = list(payments)
+        found: dict[int, tuple[str, list[tuple[_OpenInvoice, int]]]] = {}
+        unmatched = []
+        for index, payment in enumerate(payments):
+            if not payment.get("paymentDate"):
+                unmatched.append({"index": index, "payment": payment, "reason": "missing paymentDate"})
+                continue
+            rule, applied = self._match_reference(payment)
+            if rule is not None:
+                self._apply(rule, applied)
+                found[index] = (rule, applied)
+        for index, payment in enumerate(payments):
+            if index in found or not payment.get("paymentDate"):
+                continue
+            rule, applied = self._match_amount(payment)
+            if rule is None:
+                unmatched.append({"index": index, "payment": payment, "reason": "no matching open invoice"})
+                continue
+            self._apply(rule, applied)
+            found[index] = (rule, applied)
+        matches, records = [], []
+        for index in sorted(found):
+            rule, applied = found[index]
+            payment = payments[index]
+            matches.append({"index": index, "rule": rule, "invoiceIds": [invoice.id for invoice, _ in applied]})
+            record = {
+                "customerId": payment.get("customerId") or applied[0][0].customer_id,
+                "paymentDate": payment.get("paymentDate"),
+                "paymentType": payment.get("paymentType") or default_payment_type,
+                "amount": _cents(payment.get("amount")) / 100,
+                "description": payment.get("description"),
+                "invoices": [{"id": invoice.id, "amount": cents / 100} for invoice, cents in applied],
+            }
+            records.append({k: v for k, v in record.items() if v is not None})
+        unmatched.sort(key=lambda entry: entry["index"])
+        return {
+            "matches": matches,
+            "unmatched": unmatched,
+            "recordInvoiceRequests": records,
+            "openInvoices": self.open_invoices,
+        }
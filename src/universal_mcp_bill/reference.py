@@ -0,0 +1,158 @@
+"""Process-wide store for near-static reference data.
+
+Lookups such as industries, user roles or price plans are loaded once, served
+from memory afterwards, refreshed by a background thread and optionally
+persisted to a JSON snapshot so a restarted process starts warm.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional
+
+from universal_mcp_bill.cache import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def _params_key(params: dict[str, Any]) -> tuple:
+    return tuple(sorted((k, json.dumps(v, sort_keys=True, default=str)) for k, v in params.items() if v is not None))
+
+
+@dataclass
+class _Entry:
+    name: str
+    params: dict[str, Any]
+    value: Any
+    loaded_at: float
+    loader: Optional[Callable[[], Any]] = field(default=None, repr=False)
+
+
+class ReferenceDataStore:
+    """In-memory reference data with background refresh and an optional on-disk snapshot.
+
+    Entries older than `refresh_interval` are reloaded by the background
+    thread; entries older than `max_stale` (for example restored from an old
+    snapshot) are reloaded synchronously on access.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Optional[str] = None,
+        refresh_interval: Optional[float] = 3600.0,
+        max_stale: float = 86400.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.snapshot_path = snapshot_path
+        self.refresh_interval = refresh_interval
+        self.max_stale = max_stale
+        self._clock = clock
+        self._entries: dict[Hashable, _Entry] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if snapshot_path and os.path.exists(snapshot_path):
+            self._load_snapshot()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: str, params: dict[str, Any], loader: Callable[[], Any]) -> Any:
+        """Return a copy of the value for `(name, params)`, loading it with `loader` on first use.
+
+        Callers get their own deep copy, so mutating a result never alters the store.
+        """
+        key = (name, _params_key(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.loader = loader
+        self._ensure_refresher()
+        if entry is not None and self._clock() - entry.loaded_at <= self.max_stale:
+            return copy.deepcopy(entry.value)
+        return copy.deepcopy(self._flight.do(key, lambda: self._load(key, name, params, loader)))
+
+    def _load(self, key: Hashable, name: str, params: dict[str, Any], loader: Callable[[], Any]) -> Any:
+        value = loader()
+        with self._lock:
+            self._entries[key] = _Entry(name, params, value, self._clock(), loader)
+        self._save_snapshot()
+        return value
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop all entries, or only those for one lookup name."""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if name is None or entry.name == name]:
+                del self._entries[key]
+        self._save_snapshot()
+
+    def refresh_due(self) -> int:
+        """Reload every entry older than `refresh_interval`; returns how many were refreshed."""
+        if self.refresh_interval is None:
+            return 0
+        now = self._clock()
+        with self._lock:
+            due = [(key, entry) for key, entry in self._entries.items() if entry.loader is not None and now - entry.loaded_at >= self.refresh_interval]
+        refreshed = 0
+        for key, entry in due:
+            try:
+                self._flight.do(key, lambda: self._load(key, entry.name, entry.params, entry.loader))
+                refreshed += 1
+            except Exception:
+                # Keep serving the previous value; the next cycle retries.
+                logger.warning("Refreshing reference data %s failed", entry.name, exc_info=True)
+        return refreshed
+
+    def _ensure_refresher(self) -> None:
+        if self.refresh_interval is None or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="bill-reference-refresh", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh_due()
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def _load_snapshot(self) -> None:
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable reference data snapshot %s", self.snapshot_path, exc_info=True)
+            return
+        for item in stored:
+            key = (item["name"], _params_key(item["params"]))
+            self._entries[key] = _Entry(item["name"], item["params"], item["value"], item["loadedAt"])
+
+    def _save_snapshot(self) -> None:
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            stored = [
+                {"name": e.name, "params": e.params, "value": e.value, "loadedAt": e.loaded_at}
+                for e in self._entries.values()
+            ]
+        directory = os.path.dirname(os.path.abspath(self.snapshot_path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file and rename so readers never see a partial snapshot.
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".reference-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(stored, f, default=str)
+            os.replace(tmp_path, self.snapshot_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
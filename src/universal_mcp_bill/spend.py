@@ -0,0 +1,199 @@
+"""Columnar in-memory store and group-by engine for spend transactions.
+
+Transactions are ingested once into NumPy arrays: amounts and dates as native
+columns, and every groupable dimension (budget, card, user, merchant,
+custom-field values) dictionary-encoded into integer codes. Queries filter
+with boolean masks and aggregate with `bincount`, so a group-by over the whole
+store is a handful of vectorized passes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Iterable, Optional, Sequence
+
+from universal_mcp_bill._optional import require
+from universal_mcp_bill.tagging import selected_values
+
+DIMENSIONS = ("budgetId", "cardId", "userId", "merchantName", "transactionType")
+TIME_DIMENSIONS = {"day": "datetime64[D]", "month": "datetime64[M]", "year": "datetime64[Y]"}
+CUSTOM_FIELD_PREFIX = "customField:"
+
+
+class _Dictionary:
+    """Value <-> integer code mapping; code 0 is reserved for missing values."""
+
+    def __init__(self) -> None:
+        self.values: list[Any] = [None]
+        self._codes: dict[Any, int] = {}
+
+    def encode(self, value: Any) -> int:
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: Any) -> Optional[int]:
+        return 0 if value is None else self._codes.get(value)
+
+
+def _custom_field_values(record: dict[str, Any]) -> dict[str, str]:
+    """Map custom field ID to its selected value(s); multi-select values are joined with `|`."""
+    return {field_id: "|".join(sorted(labels)) for field_id, labels in selected_values(record).items() if labels}
+
+
+def _fingerprint(record: dict[str, Any]) -> bytes:
+    payload = json.dumps(record, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=12).digest()
+
+
+class SpendStore:
+    """Growable column store of spend transactions keyed by transaction ID."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        np = require("numpy", "analytics", "Spend analytics")
+        self._np = np
+        self.size = 0
+        self._capacity = capacity
+        self.amounts = np.zeros(capacity, dtype=np.float64)
+        self.dates = np.full(capacity, np.datetime64("NaT"), dtype="datetime64[D]")
+        self.codes: dict[str, Any] = {dim: np.zeros(capacity, dtype=np.int32) for dim in DIMENSIONS}
+        self.dictionaries: dict[str, _Dictionary] = {dim: _Dictionary() for dim in DIMENSIONS}
+        self._rows: dict[str, int] = {}
+        self._fingerprints: dict[str, bytes] = {}
+        # Latest `updatedTime` ingested; incremental refreshes list from here.
+        self.watermark: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def dimensions(self) -> list[str]:
+        return [*self.codes, *TIME_DIMENSIONS]
+
+    def _grow(self) -> None:
+        np = self._np
+        extra = self._capacity
+        self._capacity *= 2
+        self.amounts = np.concatenate([self.amounts, np.zeros(extra, dtype=np.float64)])
+        self.dates = np.concatenate([self.dates, np.full(extra, np.datetime64("NaT"), dtype="datetime64[D]")])
+        for dim, column in self.codes.items():
+            self.codes[dim] = np.concatenate([column, np.zeros(extra, dtype=np.int32)])
+
+    def _column(self, dim: str):
+        column = self.codes.get(dim)
+        if column is None:
+            column = self.codes[dim] = self._np.zeros(self._capacity, dtype=self._np.int32)
+            self.dictionaries[dim] = _Dictionary()
+        return column
+
+    def upsert(self, records: Iterable[dict[str, Any]]) -> dict[str, int]:
+        """Insert new transactions and overwrite changed ones in place."""
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        for record in records:
+            transaction_id = record.get("id")
+            if transaction_id is None:
+                continue
+            updated = record.get("updatedTime")
+            if updated and (self.watermark is None or updated > self.watermark):
+                self.watermark = updated
+            fingerprint = _fingerprint(record)
+            row = self._rows.get(transaction_id)
+            if row is not None and self._fingerprints[transaction_id] == fingerprint:
+                counts["unchanged"] += 1
+                continue
+            if row is None:
+                if self.size == self._capacity:
+                    self._grow()
+                row = self._rows[transaction_id] = self.size
+                self.size += 1
+                counts["inserted"] += 1
+            else:
+                counts["updated"] += 1
+            self._fingerprints[transaction_id] = fingerprint
+            self.amounts[row] = float(record.get("amount") or 0.0)
+            occurred = record.get("occurredTime") or record.get("occurredDate")
+            self.dates[row] = self._np.datetime64(occurred[:10], "D") if occurred else self._np.datetime64("NaT")
+            for dim in DIMENSIONS:
+                self.codes[dim][row] = self.dictionaries[dim].encode(record.get(dim))
+            custom = _custom_field_values(record)
+            for dim in [dim for dim in self.codes if dim.startswith(CUSTOM_FIELD_PREFIX)]:
+                self.codes[dim][row] = 0
+            for field_id, value in custom.items():
+                dim = CUSTOM_FIELD_PREFIX + field_id
+                column = self._column(dim)
+                column[row] = self.dictionaries[dim].encode(value)
+        return counts
+
+    def _group_codes(self, dim: str):
+        np = self._np
+        if dim in TIME_DIMENSIONS:
+            periods = self.dates[: self.size].astype(TIME_DIMENSIONS[dim])
+            labels, inverse = np.unique(periods, return_inverse=True)
+            return inverse.reshape(-1), [None if np.isnat(label) else str(label) for label in labels]
+        if dim not in self.codes:
+            raise ValueError(f"Unknown spend dimension '{dim}'; expected one of {self.dimensions}.")
+        return self.codes[dim][: self.size].astype(np.int64), self.dictionaries[dim].values
+
+    def query(
+        self,
+        group_by: Sequence[str] = (),
+        filters: Optional[dict[str, Any]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        top: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """Sum and count amounts grouped by any combination of dimensions.
+
+        `filters` maps a dimension to a value or list of accepted values; the
+        date range is inclusive on both ends. Groups are returned largest
+        total first.
+        """
+        np = self._np
+        mask = np.ones(self.size, dtype=bool)
+        dates = self.dates[: self.size]
+        if start_date:
+            mask &= dates >= np.datetime64(start_date, "D")
+        if end_date:
+            mask &= dates <= np.datetime64(end_date, "D")
+        for dim, accepted in (filters or {}).items():
+            if dim not in self.codes:
+                raise ValueError(f"Unknown spend dimension '{dim}'; expected one of {list(self.codes)}.")
+            accepted_values = accepted if isinstance(accepted, (list, tuple, set)) else [accepted]
+            wanted = [code for code in (self.dictionaries[dim].lookup(value) for value in accepted_values) if code is not None]
+            mask &= np.isin(self.codes[dim][: self.size], wanted)
+
+        amounts = self.amounts[: self.size][mask]
+        key = np.zeros(len(amounts), dtype=np.int64)
+        labels = []
+        radix = 1
+        for dim in group_by:
+            codes, values = self._group_codes(dim)
+            key = key * len(values) + codes[mask]
+            labels.append(values)
+            radix *= len(values)
+        if radix > 2**62:
+            raise ValueError("Too many distinct groups; group by fewer dimensions.")
+        groups, inverse = np.unique(key, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        sums = np.bincount(inverse, weights=amounts, minlength=len(groups))
+        counts = np.bincount(inverse, minlength=len(groups))
+
+        order = np.argsort(-sums, kind="stable")
+        if top is not None:
+            order = order[:top]
+        rows = []
+        for i in order.tolist():
+            row: dict[str, Any] = {}
+            remainder = int(groups[i])
+            for dim, values in zip(reversed(group_by), reversed(labels)):
+                remainder, code = divmod(remainder, len(values))
+                row[dim] = values[code]
+            row["total"] = round(float(sums[i]), 2)
+            row["count"] = int(counts[i])
+            rows.append(row)
+        return rows
@@ -0,0 +1,56 @@
+"""Batch custom-field tagging of spend transactions with no-op elimination."""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+
+def _label(item: Any) -> str:
+    return str(item.get("value", item.get("id"))) if isinstance(item, dict) else str(item)
+
+
+def selected_values(record: dict[str, Any]) -> dict[str, frozenset[str]]:
+    """Map custom field ID to the set of values currently selected on a transaction."""
+    values = {}
+    for field in record.get("customFields") or []:
+        field_id = field.get("id") or field.get("customFieldId")
+        selected = field.get("selectedValues") or field.get("values") or []
+        if field_id:
+            values[field_id] = frozenset(_label(item) for item in selected)
+    return values
+
+
+def plan_tagging(
+    tags: Iterable[dict[str, Any]], transactions: dict[str, dict[str, Any]]
+) -> tuple[dict[str, list[dict[str, Any]]], list[dict[str, Any]]]:
+    """Group tags into one `customFields` update per transaction, dropping no-ops.
+
+    `tags` are `{transactionId, customFieldId, values}` items; later tags for
+    the same transaction and field win. Returns the updates by transaction ID
+    and result dicts for transactions that need no request.
+    """
+    wanted: dict[str, dict[str, list[str]]] = {}
+    for tag in tags:
+        values = tag.get("values")
+        if values is None:
+            values = []
+        elif isinstance(values, str):
+            values = [values]
+        wanted.setdefault(tag["transactionId"], {})[tag["customFieldId"]] = [str(value) for value in values]
+    updates, skipped = {}, []
+    for transaction_id, fields in wanted.items():
+        record: Optional[dict[str, Any]] = transactions.get(transaction_id)
+        if record is None:
+            skipped.append({"transactionId": transaction_id, "status": "failed", "error": "Transaction not found."})
+            continue
+        current = selected_values(record)
+        changes = [
+            {"customFieldId": field_id, "selectedValues": values}
+            for field_id, values in fields.items()
+            if current.get(field_id, frozenset()) != frozenset(values)
+        ]
+        if changes:
+            updates[transaction_id] = changes
+        else:
+            skipped.append({"transactionId": transaction_id, "status": "unchanged"})
+    return updates, skipped
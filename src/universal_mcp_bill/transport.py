@@ -0,0 +1,81 @@
+"""HTTP client construction: connection pooling, HTTP/2 and per-family timeouts."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional
+
+import httpx
+
+from universal_mcp_bill._optional import require
+
+# Matches the request timeout `APIApplication` uses when no client is configured.
+DEFAULT_TIMEOUT = 180.0
+
+
+def endpoint_family(path: str) -> Optional[str]:
+    """First path segment after the API version, e.g. `spend` for `/connect/v3/spend/budgets`."""
+    segments = [segment for segment in path.split("/") if segment]
+    for position, segment in enumerate(segments[:-1]):
+        if len(segment) > 1 and segment[0] == "v" and segment[1:].isdigit():
+            return segments[position + 1]
+    return None
+
+
+@dataclass
+class HttpConfig:
+    """Connection pool, protocol and timeout settings for the Bill HTTP client.
+
+    `timeout` of `None` keeps the application's default request timeout.
+    `family_timeouts` maps an endpoint family (see `endpoint_family`) to a
+    timeout in seconds that replaces `timeout` for requests in that family;
+    no family is overridden unless configured.
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    timeout: Optional[float] = None
+    connect_timeout: float = 10.0
+    family_timeouts: dict[str, float] = field(default_factory=dict)
+
+    def timeout_for(self, path: str) -> httpx.Timeout:
+        default = DEFAULT_TIMEOUT if self.timeout is None else self.timeout
+        seconds = self.family_timeouts.get(endpoint_family(path) or "", default)
+        return httpx.Timeout(seconds, connect=min(self.connect_timeout, seconds))
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+def build_client(
+    config: HttpConfig, base_url: str = "", headers: Optional[dict[str, str]] = None, default_timeout: float = DEFAULT_TIMEOUT
+) -> httpx.Client:
+    """Create an `httpx.Client` honouring `config`; HTTP/2 needs the `http2` extra.
+
+    `default_timeout` applies when `config.timeout` is unset.
+    """
+    if config.timeout is None:
+        config = replace(config, timeout=default_timeout)
+    if config.http2:
+        require("h2", "http2", "HTTP/2 support")
+
+    def apply_family_timeout(request: httpx.Request) -> None:
+        # Event hooks run before the transport reads the timeout extension.
+        if endpoint_family(request.url.path) in config.family_timeouts:
+            request.extensions["timeout"] = config.timeout_for(request.url.path).as_dict()
+
+    hooks: dict[str, list[Any]] = {"request": [apply_family_timeout]} if config.family_timeouts else {}
+    return httpx.Client(
+        base_url=base_url,
+        headers=headers,
+        timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+        limits=config.limits(),
+        http2=config.http2,
+        event_hooks=hooks,
+    )
@@ -0,0 +1,71 @@
+"""Content-hash index that keeps identical files from being uploaded twice to the same target."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Iterable, Optional, Union
+
+from universal_mcp_bill.cache import SingleFlight
+
+
+def content_digest(items: Iterable[Union[bytes, str]]) -> str:
+    """SHA-256 of the upload body, hashed item by item in a single pass."""
+    digest = hashlib.sha256()
+    for item in items:
+        digest.update(item.encode() if isinstance(item, str) else item)
+    return digest.hexdigest()
+
+
+class UploadIndex:
+    """Remembers the API response for each (content digest, target) pair already uploaded.
+
+    A repeat upload of the same content to the same target returns the
+    recorded response instead of sending the file again, and concurrent
+    uploads of the same pair share one request. With a `path`, the index is
+    appended to a JSON-lines file and survives restarts.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._uploads: dict[tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._uploads[(entry["sha256"], entry["target"])] = entry["result"]
+
+    def __len__(self) -> int:
+        return len(self._uploads)
+
+    def get(self, digest: str, target: str) -> Optional[Any]:
+        with self._lock:
+            return self._uploads.get((digest, target))
+
+    def record(self, digest: str, target: str, result: Any) -> None:
+        with self._lock:
+            self._uploads[(digest, target)] = result
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"sha256": digest, "target": target, "result": result}, default=str) + "\n")
+
+    def upload(self, digest: str, target: str, send: Callable[[], Any]) -> Any:
+        """Return the recorded response for the pair, or call `send` once and record its response."""
+        previous = self.get(digest, target)
+        if previous is not None:
+            return previous
+
+        def upload_once() -> Any:
+            previous = self.get(digest, target)
+            if previous is not None:
+                return previous
+            result = send()
+            self.record(digest, target, result)
+            return result
+
+        return self._flight.do((digest, target), upload_once)
@@ -0,0 +1,149 @@
+"""Idempotent bulk vendor import: match incoming vendors against existing ones.
+
+Vendors are identified by normalized tax ID, then by normalized name plus
+address, then by normalized name alone; name-based matches never pair two
+different tax IDs. A name shared by several existing vendors is skipped as
+ambiguous rather than created. Matches become updates of only the fields that
+differ (or are skipped when nothing differs); everything else is created.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, Optional
+
+from universal_mcp_bill.name_index import normalize_name
+
+# Fields `update_vendor` accepts.
+UPDATABLE_FIELDS = (
+    "name",
+    "shortName",
+    "accountNumber",
+    "accountType",
+    "email",
+    "phone",
+    "address",
+    "paymentInformation",
+    "additionalInfo",
+    "billCurrency",
+    "autoPay",
+)
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]")
+
+
+def normalize_tax_id(tax_id: Optional[str]) -> str:
+    return _NON_ALNUM.sub("", (tax_id or "").upper())
+
+
+def normalize_address(address: Any) -> str:
+    """First address line and 5-character postal code, normalized; empty when either is missing."""
+    if not isinstance(address, dict):
+        return ""
+    line = normalize_name(address.get("line1"))
+    postal = _NON_ALNUM.sub("", str(address.get("zipOrPostalCode") or "").upper())[:5]
+    if not line or not postal:
+        return ""
+    return f"{line}|{postal}|{(address.get('country') or '').upper()}"
+
+
+def _tax_id(record: dict[str, Any]) -> str:
+    return normalize_tax_id((record.get("additionalInfo") or {}).get("taxId"))
+
+
+def vendor_keys(record: dict[str, Any]) -> list[tuple[str, str]]:
+    """Identity keys for a vendor, strongest first."""
+    keys = []
+    tax_id = _tax_id(record)
+    if tax_id:
+        keys.append(("taxId", tax_id))
+    name = normalize_name(record.get("name"))
+    address = normalize_address(record.get("address"))
+    if name and address:
+        keys.append(("nameAddress", f"{name}|{address}"))
+    if name:
+        keys.append(("name", name))
+    return keys
+
+
+def changed_fields(existing: dict[str, Any], incoming: dict[str, Any]) -> dict[str, Any]:
+    """Fields of `incoming` that differ from `existing`; nested objects are merged over the existing value."""
+    changes = {}
+    for field in UPDATABLE_FIELDS:
+        if field not in incoming or incoming[field] is None:
+            continue
+        value, current = incoming[field], existing.get(field)
+        if isinstance(value, dict) and isinstance(current, dict):
+            merged = {**current, **value}
+            if merged != current:
+                changes[field] = merged
+        elif value != current:
+            changes[field] = value
+    return changes
+
+
+class VendorMatcher:
+    """Hash index from vendor identity keys to existing vendor records."""
+
+    def __init__(self, vendors: Iterable[dict[str, Any]]) -> None:
+        self._by_key: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        for vendor in vendors:
+            if vendor.get("id") and not vendor.get("archived"):
+                self.add(vendor)
+
+    def add(self, vendor: dict[str, Any]) -> None:
+        for key in vendor_keys(vendor):
+            self._by_key.setdefault(key, []).append(vendor)
+
+    def resolve(self, record: dict[str, Any]) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+        """Return the matching vendor, or `None` with a reason when the match is ambiguous.
+
+        Name-based keys only consider vendors whose tax ID is compatible:
+        either side has none, or both have the same one.
+        """
+        tax_id = _tax_id(record)
+        for key in vendor_keys(record):
+            candidates = self._by_key.get(key, [])
+            if key[0] != "taxId":
+                candidates = [c for c in candidates if not tax_id or not _tax_id(c) or _tax_id(c) == tax_id]
+            if len(candidates) == 1 or (candidates and key[0] != "name"):
+                return candidates[0], None
+            if candidates:
+                ids = ", ".join(str(c["id"]) for c in candidates)
+                return None, f"Name matches {len(candidates)} existing vendors ({ids}); add a tax ID or address to disambiguate."
+        return None, None
+
+    def match(self, record: dict[str, Any]) -> Optional[dict[str, Any]]:
+        return self.resolve(record)[0]
+
+
+def plan_vendor_import(vendors: Iterable[dict[str, Any]], existing: Iterable[dict[str, Any]], update_existing: bool = True) -> dict[str, list]:
+    """Split incoming vendors into creates, updates and skips.
+
+    Returns `create` as `(index, payload)` pairs, `update` as
+    `(index, vendorId, changes)` triples and `skip` as result dicts. A vendor
+    repeated within the input is created (or updated) once and skipped after,
+    and a vendor whose name matches several existing vendors is skipped.
+    """
+    matcher = VendorMatcher(existing)
+    seen = VendorMatcher(())
+    plan: dict[str, list] = {"create": [], "update": [], "skip": []}
+    for index, vendor in enumerate(vendors):
+        if seen.match(vendor) is not None:
+            plan["skip"].append({"index": index, "status": "skipped", "reason": "Duplicate of an earlier vendor in the import."})
+            continue
+        seen.add(vendor)
+        current, ambiguity = matcher.resolve(vendor)
+        if ambiguity is not None:
+            plan["skip"].append({"index": index, "status": "skipped", "reason": ambiguity})
+            continue
+        if current is None:
+            plan["create"].append((index, vendor))
+            continue
+        changes = changed_fields(current, vendor) if update_existing else {}
+        if changes:
+            plan["update"].append((index, current["id"], changes))
+        else:
+            reason = "Vendor exists and is unchanged." if update_existing else "Vendor exists."
+            plan["skip"].append({"index": index, "status": "skipped", "vendorId": current["id"], "reason": reason})
+    return plan
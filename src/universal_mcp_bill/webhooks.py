@@ -0,0 +1,170 @@
+"""Local receiver for Bill event notifications.
+
+Bill signs each notification with the subscription's security key: the
+`x-bill-sha-signature` header carries the base64 HMAC-SHA256 of the raw
+request body. Verified events are parsed into `WebhookEvent`s and handed to a
+callback, typically one that invalidates caches for the changed object.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "x-bill-sha-signature"
+MAX_BODY_BYTES = 1 << 20
+
+
+def sign(body: bytes, secret: str) -> str:
+    return base64.b64encode(hmac.new(secret.encode(), body, hashlib.sha256).digest()).decode()
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    return bool(signature) and hmac.compare_digest(sign(body, secret), signature.strip())
+
+
+@dataclass(frozen=True)
+class WebhookEvent:
+    """One change notification, e.g. entity `bill`, action `updated`."""
+
+    event_id: Optional[str]
+    entity: str
+    action: str
+    object_id: Optional[str]
+    record: Optional[dict[str, Any]] = None
+
+
+def parse_event(payload: Any) -> WebhookEvent:
+    """Parse a notification body: `metadata.eventType` (`<entity>.<action>`) plus the object under the entity key.
+
+    Raises `ValueError` for anything that is not a JSON object of that shape.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError(f"Expected a JSON object, got {type(payload).__name__}.")
+    metadata = payload.get("metadata") or {}
+    if not isinstance(metadata, dict):
+        raise ValueError("Notification metadata must be an object.")
+    event_type = metadata.get("eventType") or payload.get("eventType") or ""
+    if not isinstance(event_type, str):
+        raise ValueError("Notification event type must be a string.")
+    entity, _, action = event_type.partition(".")
+    if not entity or not action:
+        raise ValueError(f"Unrecognized event type '{event_type}'.")
+    record = payload.get(entity)
+    if not isinstance(record, dict):
+        record = None
+    object_id = (record or {}).get("id") or metadata.get("objectId")
+    return WebhookEvent(metadata.get("eventId"), entity, action, object_id, record)
+
+
+class WebhookReceiver:
+    """Threaded HTTP server that verifies, de-duplicates and dispatches notifications.
+
+    Bill retries deliveries it considers failed, so the last `dedup_size`
+    event IDs are remembered and redelivered events are acknowledged without
+    being dispatched again.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        on_event: Callable[[WebhookEvent], None],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = "/",
+        dedup_size: int = 4096,
+    ) -> None:
+        if not secret:
+            raise ValueError("A webhook security key is required to verify notifications.")
+        self.secret = secret
+        self.on_event = on_event
+        self.path = path
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._dedup_size = dedup_size
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.server_address[:2]
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "WebhookReceiver":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="bill-webhooks", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def _first_delivery(self, event_id: Optional[str]) -> bool:
+        if event_id is None:
+            return True
+        with self._lock:
+            if event_id in self._seen:
+                return False
+            self._seen[event_id] = None
+            while len(self._seen) > self._dedup_size:
+                self._seen.popitem(last=False)
+            return True
+
+    def handle(self, body: bytes, signature: Optional[str]) -> int:
+        """Process one delivery and return the HTTP status to answer with."""
+        if not verify_signature(body, signature, self.secret):
+            return 401
+        try:
+            event = parse_event(json.loads(body))
+        except ValueError:
+            return 400
+        if self._first_delivery(event.event_id):
+            try:
+                self.on_event(event)
+            except Exception:
+                logger.exception("Handling webhook event %s failed", event.event_id)
+                with self._lock:
+                    self._seen.pop(event.event_id, None)
+                return 500
+        return 200
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                if self.path.split("?", 1)[0] != receiver.path:
+                    self._reply(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY_BYTES:
+                    self._reply(413)
+                    return
+                self._reply(receiver.handle(self.rfile.read(length), self.headers.get(SIGNATURE_HEADER)))
+
+            def _reply(self, status: int) -> None:
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("webhook %s", format % args)
+
+        return Handler
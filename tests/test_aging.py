@@ -0,0 +1,43 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from universal_mcp_bill.aging import BillColumns, bucket_labels, compute_aging
+
+
+BILLS = [
+    {"id": "b1", "vendorId": "v1", "vendorName": "Acme", "dueDate": "2024-03-10", "amount": 100.0, "dueAmount": 100.0},
+    {"id": "b2", "vendorId": "v1", "vendorName": "Acme", "dueDate": "2024-01-15", "amount": 50.0, "dueAmount": 20.0},
+    {"id": "b3", "vendorId": "v2", "vendorName": "Globex", "dueDate": "2023-11-01", "amount": 300.0},
+    {"id": "b4", "vendorId": "v2", "vendorName": "Globex", "dueDate": "2024-02-01", "amount": 10.0, "paymentStatus": "PAID"},
+    {"id": "b5", "vendorId": "v3", "dueDate": None, "amount": 5.0},
+    {"id": "b6", "vendorId": "v3", "dueDate": "2024-02-01", "amount": 7.0, "archived": True},
+    {"id": "b7", "vendorId": "v1", "vendorName": "Acme", "dueDate": "2024-02-20", "amount": 40.0, "paymentStatus": "SCHEDULED"},
+]
+
+
+def test_bucket_labels():
+    assert bucket_labels([30, 60, 90]) == ["current", "1-30", "31-60", "61-90", "90+"]
+
+
+def test_compute_aging():
+    columns = BillColumns.from_records(BILLS)
+    assert len(columns) == 4
+    assert len(BillColumns.from_records(BILLS, include_closed=True)) == 6
+    report = compute_aging(columns, as_of=date(2024, 3, 1))
+    buckets = {bucket["label"]: (bucket["total"], bucket["count"]) for bucket in report["buckets"]}
+    assert buckets == {"current": (105.0, 2), "1-30": (0.0, 0), "31-60": (20.0, 1), "61-90": (0.0, 0), "90+": (300.0, 1)}
+    assert report["overdueCount"] == 2
+    assert report["overdueTotal"] == 320.0
+    assert [vendor["vendorId"] for vendor in report["vendors"]] == ["v2", "v1", "v3"]
+    acme = report["vendors"][1]
+    assert acme["total"] == 120.0
+    assert acme["overdueCount"] == 1
+    assert acme["buckets"]["31-60"] == 20.0
+
+
+def test_compute_aging_rejects_bad_buckets():
+    with pytest.raises(ValueError):
+        compute_aging(BillColumns.from_records([]), bucket_days=[0, 30])
@@ -0,0 +1,443 @@
+import base64
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+pytest.importorskip("universal_mcp")
+
+from universal_mcp_bill.app import BillApp
+from universal_mcp_bill.webhooks import SIGNATURE_HEADER, sign
+
+
+class FakeBill:
+    """Routes requests by method and path below `/v3` and records every request it answers."""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+
+    def route(self, method, path, response):
+        self.routes[(method, path)] = response
+
+    def calls(self, method, path):
+        return [request for request in self.requests if request.method == method and _path(request) == path]
+
+    def __call__(self, request):
+        self.requests.append(request)
+        response = self.routes.get((request.method, _path(request)))
+        if response is None:
+            return httpx.Response(404, json={"message": f"No route for {request.method} {request.url.path}"})
+        if callable(response):
+            response = response(request)
+        return response if isinstance(response, httpx.Response) else httpx.Response(200, json=response)
+
+
+def _path(request):
+    return request.url.path.split("/v3", 1)[1]
+
+
+def _json(request):
+    return json.loads(request.content)
+
+
+def _ids_filter(request):
+    """IDs of an `id:in:` filter, or None when the request has no such filter."""
+    filters = request.url.params.get("filters") or ""
+    if not filters.startswith("id:in:"):
+        return None
+    return filters[len("id:in:"):].strip('"').split(",")
+
+
+def _listing(records):
+    def respond(request):
+        ids = _ids_filter(request)
+        return {"results": [record for record in records if ids is None or record["id"] in ids]}
+
+    return respond
+
+
+@pytest.fixture
+def api():
+    return FakeBill()
+
+
+@pytest.fixture
+def app(api):
+    mock_integration = MagicMock()
+    mock_integration.get_credentials.return_value = {"access_token": "dummy_access_token"}
+    app = BillApp(integration=mock_integration)
+    app._client = httpx.Client(transport=httpx.MockTransport(api), base_url=app.base_url)
+    return app
+
+
+def test_export_ap_data(app, api, tmp_path):
+    pytest.importorskip("pyarrow")
+    api.route("GET", "/bills", {"results": [
+        {"id": "b1", "amount": 10, "dueDate": "2024-01-05", "createdTime": "2024-01-01T00:00:00Z"},
+        {"id": "b2", "amount": 12.5, "dueDate": "2024-02-05", "createdTime": "2024-02-01T00:00:00Z"},
+    ]})
+    summary = app.export_ap_data(str(tmp_path), entities=["bills"])
+    assert summary["bills"]["rows"] == 2
+    assert len(summary["bills"]["partitions"]) == 2
+    with pytest.raises(ValueError):
+        app.export_ap_data(str(tmp_path), entities=["vendors"])
+
+
+def test_get_ap_aging_report(app, api):
+    pytest.importorskip("numpy")
+    api.route("GET", "/bills", {"results": [
+        {"id": "b1", "vendorId": "v1", "dueAmount": 100.0, "dueDate": "2024-01-01"},
+        {"id": "b2", "vendorId": "v1", "dueAmount": 50.0, "dueDate": "2024-03-01"},
+        {"id": "b3", "vendorId": "v2", "dueAmount": 30.0, "dueDate": "2023-12-01", "paymentStatus": "PAID"},
+    ]})
+    report = app.get_ap_aging_report(as_of_date="2024-02-15")
+    assert report["billCount"] == 2
+    assert (report["total"], report["overdueTotal"]) == (150.0, 100.0)
+    assert api.calls("GET", "/bills")[0].url.params["filters"] == 'archived:eq:false,paymentStatus:nin:"PAID,SCHEDULED"'
+    assert app.get_ap_aging_report(as_of_date="2024-02-15", include_closed=True, filters="vendorId:eq:v2")["billCount"] == 3
+    assert api.calls("GET", "/bills")[1].url.params["filters"] == 'vendorId:eq:"v2",archived:eq:false'
+
+
+def test_forecast_cash_requirements(app, api):
+    api.route("GET", "/payments", {"results": [
+        {"id": "p1", "status": "SCHEDULED", "processDate": "2024-01-03", "amount": 25.0, "billId": "b2",
+         "fundingAccount": {"type": "BANK_ACCOUNT", "id": "bank1"}},
+    ]})
+    api.route("GET", "/recurringbills", {"results": [
+        {"id": "r1", "schedule": {"period": "MONTHLY", "nextDueDate": "2023-12-28"}, "recurringBillLineItems": [{"amount": 5.0}]},
+    ]})
+    api.route("GET", "/bills", {"results": [
+        {"id": "b1", "dueDate": "2023-12-20", "dueAmount": 10.0},
+        {"id": "b2", "dueDate": "2024-01-05", "dueAmount": 40.0},
+    ]})
+    forecast = app.forecast_cash_requirements(days=10, start_date="2024-01-01")
+    assert forecast["total"] == 55.0
+    assert forecast["accounts"]["bank1"]["daily"][2] == 25.0
+    assert forecast["accounts"]["unassigned"]["daily"][0] == 15.0
+    assert forecast["accounts"]["unassigned"]["daily"][4] == 15.0
+    assert forecast["recomputed"] == 4
+    assert "paymentStatus:nin:" in api.calls("GET", "/bills")[0].url.params["filters"]
+    assert app.forecast_cash_requirements(days=10, start_date="2024-01-02")["recomputed"] == 0
+
+
+def test_refresh_and_query_spend_analytics(app, api):
+    pytest.importorskip("numpy")
+    transactions = [
+        {"id": "t1", "amount": 10.0, "budgetId": "b1", "occurredTime": "2024-01-05T10:00:00Z", "updatedTime": "2024-01-05T10:00:00Z"},
+        {"id": "t2", "amount": 25.0, "budgetId": "b2", "occurredTime": "2024-02-01T10:00:00Z", "updatedTime": "2024-02-01T10:00:00Z"},
+    ]
+    api.route("GET", "/spend/custom-fields", {"results": []})
+    api.route("GET", "/spend/transactions", _listing(transactions))
+    result = app.query_spend_analytics(group_by=["budgetId"])
+    assert result == {"groups": [{"budgetId": "b2", "total": 25.0, "count": 1}, {"budgetId": "b1", "total": 10.0, "count": 1}], "transactions": 2}
+    assert app.refresh_spend_analytics() == {"inserted": 0, "updated": 0, "unchanged": 2, "size": 2}
+    assert "updatedTime:gte:" in api.calls("GET", "/spend/transactions")[-1].url.params["filters"]
+    assert app.refresh_spend_analytics(full_refresh=True) == {"inserted": 2, "updated": 0, "unchanged": 0, "size": 2}
+
+
+def test_check_duplicate_bills(app, api):
+    api.route("GET", "/bills", {"results": [
+        {"id": "b1", "vendorId": "v1", "amount": 100.0, "invoice": {"invoiceNumber": "INV-1", "invoiceDate": "2024-01-01"}},
+    ]})
+    items = [
+        {"vendorId": "v1", "invoice": {"invoiceNumber": "inv-1", "invoiceDate": "2024-01-01"}, "billLineItems": [{"amount": 100.0}]},
+        {"vendorId": "v2", "invoice": {"invoiceNumber": "INV-2", "invoiceDate": "2024-01-01"}, "billLineItems": [{"amount": 5.0}]},
+        {"vendorId": "v2", "invoice": {"invoiceNumber": "INV-2", "invoiceDate": "2024-01-01"}, "billLineItems": [{"amount": 5.0}]},
+    ]
+    result = app.check_duplicate_bills(items)
+    assert result["duplicates"] == [{"index": 0, "duplicateOf": "b1"}, {"index": 2, "duplicateOf": "item 1"}]
+    assert (result["checked"], result["indexed"]) == (3, 1)
+    app.check_duplicate_bills(items)
+    assert len(api.calls("GET", "/bills")) == 1
+
+
+def test_reconcile_invoice_payments(app, api):
+    api.route("GET", "/invoices", {"results": [
+        {"id": "i1", "invoiceNumber": "1001", "customerId": "c1", "dueAmount": 100.0, "status": "OPEN"},
+        {"id": "i2", "invoiceNumber": "1002", "customerId": "c1", "dueAmount": 40.0, "status": "OPEN"},
+    ]})
+    api.route("POST", "/invoices/record-payment", lambda request: {"id": "rp-" + _json(request)["invoices"][0]["id"]})
+    payments = [
+        {"amount": 100.0, "customerId": "c1", "reference": "1001", "paymentDate": "2024-01-10"},
+        {"amount": 40.0, "customerId": "c1", "paymentDate": "2024-01-11"},
+        {"amount": 7.0, "customerId": "c1"},
+    ]
+    result = app.reconcile_invoice_payments(payments, submit=True)
+    assert [(entry["index"], entry["status"], entry["result"]["id"]) for entry in result["submitted"]] == [(0, "recorded", "rp-i1"), (1, "recorded", "rp-i2")]
+    assert [entry["reason"] for entry in result["unmatched"]] == ["missing paymentDate"]
+    assert len(api.calls("POST", "/invoices/record-payment")) == 2
+
+
+def test_find_counterparties(app, api):
+    api.route("GET", "/vendors", {"results": [{"id": "v1", "name": "Acme Supplies"}]})
+    api.route("GET", "/customers", {"results": [{"id": "c1", "name": "Globex Corp"}]})
+    result = app.find_counterparties("acme")
+    assert result["source"] == "index"
+    assert [(match["id"], match["type"]) for match in result["matches"]] == [("v1", "vendor")]
+    assert len(api.requests) == 2
+    with pytest.raises(ValueError):
+        app.find_counterparties("acme", entity_types=["employee"])
+
+
+def test_query_records(app, api):
+    api.route("GET", "/vendors", _listing([{"id": "v1", "name": "Acme", "balance": 10}, {"id": "v2", "name": "Beta", "balance": 30}]))
+    result = app.query_records("vendors", filters=[{"field": "balance", "op": "gt", "value": 20}], source="api")
+    assert result["source"] == "api"
+    assert api.requests[-1].url.params["filters"] == "balance:gt:20"
+    result = app.query_records("vendors", filters=[{"field": "balance", "op": "gt", "value": 20}], source="local")
+    assert (result["source"], [record["id"] for record in result["results"]]) == ("local", ["v2"])
+    requests = len(api.requests)
+    assert app.query_records("vendors", sort=["name:desc"])["results"][0]["id"] == "v2"
+    assert len(api.requests) == requests
+    api.route("PATCH", "/vendors/v1", {"id": "v1", "name": "Acme", "balance": 50})
+    app.update_vendor("v1", email="ap@acme.test")
+    assert app.query_records("vendors")["source"] == "api"
+    with pytest.raises(ValueError):
+        app.query_records("employees")
+
+
+def test_refresh_reference_data(app, api):
+    api.route("GET", "/organizations/industries", [{"name": "Retail"}])
+    app.list_industries()
+    app.list_industries()
+    assert len(api.calls("GET", "/organizations/industries")) == 1
+    assert app.refresh_reference_data("list_industries") == {"cached": 0}
+    app.list_industries()
+    assert len(api.calls("GET", "/organizations/industries")) == 2
+
+
+def test_prefetch_payment_options(app, api):
+    api.route("GET", "/payments/options", lambda request: {"vendorId": request.url.params["vendorId"], "options": ["ACH"]})
+    result = app.prefetch_payment_options([
+        {"vendorId": "v1", "amount": 120.0},
+        {"vendorId": "v1", "amount": 150.0},
+        {"vendorId": "v2", "amount": 10.0},
+    ])
+    assert result == {"requested": 2, "failed": []}
+    assert app.list_payment_options("v1", 130.0)["vendorId"] == "v1"
+    assert len(api.calls("GET", "/payments/options")) == 2
+
+
+def test_get_payment_returns_independent_copies(app, api):
+    api.route("GET", "/payments/p1", httpx.Response(200, json={"id": "p1", "amount": 10.0}, headers={"Cache-Control": "max-age=60"}))
+    first = app.get_payment("p1")
+    first["amount"] = 0
+    assert app.get_payment("p1")["amount"] == 10.0
+    assert len(api.calls("GET", "/payments/p1")) == 1
+
+
+def test_concurrent_detail_reads_share_one_request(app, api):
+    def vendor(request):
+        time.sleep(0.2)
+        return {"id": "v1", "name": "Acme"}
+
+    api.route("GET", "/vendors/v1", vendor)
+    barrier = threading.Barrier(4)
+    results = []
+
+    def read():
+        barrier.wait()
+        results.append(app.get_vendor("v1"))
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [{"id": "v1", "name": "Acme"}] * 4
+    assert len(api.calls("GET", "/vendors/v1")) == 1
+
+
+def test_webhook_receiver_invalidates_payment_options(app, api):
+    api.route("GET", "/payments/options", {"options": ["ACH"]})
+    app.list_payment_options("v1", 100.0)
+    receiver = app.start_webhook_receiver(secret="s3cret")
+    try:
+        body = json.dumps({"metadata": {"eventId": "e1", "eventType": "vendor.updated"}, "vendor": {"id": "v1", "name": "Acme"}}).encode()
+        url = f"http://{receiver['host']}:{receiver['port']}{receiver['path']}"
+        assert httpx.post(url, content=body, headers={SIGNATURE_HEADER: sign(body, "wrong")}).status_code == 401
+        assert httpx.post(url, content=body, headers={SIGNATURE_HEADER: sign(body, "s3cret")}).status_code == 200
+        app.list_payment_options("v1", 100.0)
+        assert len(api.calls("GET", "/payments/options")) == 2
+    finally:
+        assert app.stop_webhook_receiver() == {"stopped": True}
+    assert app.stop_webhook_receiver() == {"stopped": False}
+
+
+def test_capture_changes_and_read_change_log(app, api, tmp_path):
+    vendors = [{"id": "v1", "name": "Acme", "updatedTime": "2024-01-01T00:00:00Z"}]
+    api.route("GET", "/vendors", lambda request: {"results": vendors})
+    log_path = str(tmp_path / "changes.jsonl")
+    result = app.capture_changes(log_path, entities=["vendors"])
+    assert (result["entities"]["vendors"]["created"], result["lastSeq"]) == (1, 1)
+    vendors[0] = dict(vendors[0], name="Acme Inc", updatedTime="2024-01-02T00:00:00Z")
+    assert app.capture_changes(log_path, entities=["vendors"])["entities"]["vendors"]["updated"] == 1
+    assert api.calls("GET", "/vendors")[-1].url.params["filters"].startswith("updatedTime:gte:")
+    log = app.read_change_log(log_path)
+    assert [event["seq"] for event in log["events"]] == [1, 2]
+    assert log["nextAfter"] == 2
+    assert app.read_change_log(log_path, after=2) == {"events": [], "nextAfter": 2}
+
+
+def test_enqueue_write_and_flush_outbox(api, tmp_path):
+    mock_integration = MagicMock()
+    mock_integration.get_credentials.return_value = {"access_token": "dummy_access_token"}
+    app = BillApp(integration=mock_integration, outbox_path=str(tmp_path / "outbox.db"), outbox_flush_interval=3600.0)
+    app._client = httpx.Client(transport=httpx.MockTransport(api), base_url=app.base_url)
+    api.route("POST", "/vendors/bulk", lambda request: [{"id": f"v{i}", **vendor} for i, vendor in enumerate(_json(request))])
+    try:
+        handles = [app.enqueue_write("create_vendor", {"name": name})["handle"] for name in ("Acme", "Globex")]
+        assert app.get_write_status(handles[0])["status"] == "pending"
+        assert app.flush_outbox() == {"done": 2, "failed": 0, "pending": 0}
+        status = app.get_write_status(handles[1])
+        assert (status["status"], status["result"]["name"]) == ("done", "Globex")
+        assert len(api.calls("POST", "/vendors/bulk")) == 1
+        with pytest.raises(ValueError):
+            app.get_write_status("unknown")
+    finally:
+        app._outbox.close()
+
+
+def test_outbox_tools_require_outbox(app):
+    with pytest.raises(ValueError):
+        app.enqueue_write("create_vendor", {"name": "Acme"})
+    with pytest.raises(ValueError):
+        app.flush_outbox()
+
+
+def test_pay_bills(app, api):
+    api.route("GET", "/bills", _listing([
+        {"id": "b1", "vendorId": "v1", "dueAmount": 100.0},
+        {"id": "b2", "vendorId": "v1", "dueAmount": 50.0, "paymentStatus": "PAID"},
+        {"id": "b3", "vendorId": "v2", "dueAmount": 20.0},
+    ]))
+    api.route("POST", "/payments/bulk", lambda request: {"payments": [{"id": "p-" + payment["billId"], "billId": payment["billId"]} for payment in _json(request)["payments"]]})
+    funding = {"type": "BANK_ACCOUNT", "id": "bank1"}
+    result = app.pay_bills(["b1", "b2", {"billId": "b3", "amount": 5.0}, "b4"], funding)
+    assert result["requests"] == 1
+    by_bill = {entry["billId"]: entry for entry in result["results"]}
+    assert (by_bill["b1"]["status"], by_bill["b1"]["payment"]["id"]) == ("submitted", "p-b1")
+    assert (by_bill["b2"]["status"], by_bill["b4"]["status"]) == ("skipped", "skipped")
+    request = _json(api.calls("POST", "/payments/bulk")[0])
+    assert request["fundingAccount"] == funding
+    assert [(payment["billId"], payment["amount"]) for payment in request["payments"]] == [("b1", 100.0), ("b3", 5.0)]
+    assert len(api.calls("GET", "/bills")) == 1
+
+
+def test_import_vendors(app, api):
+    existing = [{"id": "v1", "name": "Acme", "email": "old@acme.test"}]
+
+    def create(request):
+        created = [{"id": f"v{len(existing) + 1 + i}", **vendor} for i, vendor in enumerate(_json(request))]
+        existing.extend(created)
+        return created
+
+    def update(request):
+        existing[0] = {**existing[0], **_json(request)}
+        return existing[0]
+
+    api.route("GET", "/vendors", lambda request: {"results": list(existing)})
+    api.route("POST", "/vendors/bulk", create)
+    api.route("PATCH", "/vendors/v1", update)
+    vendors = [{"name": "Acme", "email": "ap@acme.test"}, {"name": "Globex"}]
+    plan = app.import_vendors(vendors, dry_run=True)
+    assert (plan["create"], [update["vendorId"] for update in plan["update"]]) == ([1], ["v1"])
+    assert not api.calls("POST", "/vendors/bulk")
+    result = app.import_vendors(vendors)
+    assert (result["created"], result["updated"], result["failed"]) == (1, 1, 0)
+    assert result["results"][1] == {"index": 1, "status": "created", "vendorId": "v2"}
+    assert _json(api.calls("PATCH", "/vendors/v1")[0]) == {"email": "ap@acme.test"}
+
+    app.query_records("vendors", source="local")
+    existing.append({"id": "v3", "name": "Initech"})
+    result = app.import_vendors(vendors + [{"name": "Initech"}])
+    assert (result["created"], result["updated"], result["skipped"]) == (0, 0, 3)
+    assert len(api.calls("POST", "/vendors/bulk")) == 1
+
+
+def test_sync_budget_members(app, api):
+    api.route("GET", "/spend/budgets/bud1/members", {"results": [{"userId": "u1", "role": "MEMBER"}, {"userId": "u2", "role": "MEMBER"}]})
+    api.route("PUT", "/spend/budgets/bud1/members/bulk", {})
+    api.route("DELETE", "/spend/budgets/bud1/members/u2", {})
+    result = app.sync_budget_members({"bud1": [{"userId": "u1", "role": "MEMBER"}, {"userId": "u3", "role": "MEMBER"}]})
+    summary = result["budgets"]["bud1"]
+    assert (summary["added"], summary["removed"], summary["unchanged"], summary["failures"]) == (1, 1, 1, [])
+    assert result["requests"] == 3
+    assert [member["userId"] for member in _json(api.calls("PUT", "/spend/budgets/bud1/members/bulk")[0])["members"]] == ["u3"]
+
+
+def test_tag_transactions(app, api):
+    api.route("GET", "/spend/transactions", _listing([
+        {"id": "t1", "customFields": [{"id": "cf1", "selectedValues": [{"value": "Travel"}]}]},
+        {"id": "t2", "customFields": [{"id": "cf1", "selectedValues": [{"value": "Meals"}]}]},
+    ]))
+    api.route("PUT", "/spend/transactions/t2/custom-fields", {"id": "t2"})
+    tags = [
+        {"transactionId": "t1", "customFieldId": "cf1", "values": ["Travel"]},
+        {"transactionId": "t2", "customFieldId": "cf1", "values": ["Travel"]},
+    ]
+    result = app.tag_transactions(tags)
+    assert (result["updated"], result["unchanged"], result["failed"]) == (1, 1, 0)
+    assert api.calls("GET", "/spend/transactions")[0].url.params["showCustomFieldIds"] == "cf1"
+    assert len(api.calls("PUT", "/spend/transactions/t2/custom-fields")) == 1
+    assert not api.calls("PUT", "/spend/transactions/t1/custom-fields")
+
+
+def test_list_enriched_transactions(app, api):
+    field_ids = [f"cf{i}" for i in range(25)]
+
+    def transactions(request):
+        shown = (request.url.params.get("showCustomFieldIds") or "").split(",")
+        fields = [{"id": field_id, "selectedValues": [{"id": f"{field_id}-val"}]} for field_id in ("cf0", "cf22") if field_id in shown]
+        return {"results": [{"id": "t1", "amount": 5.0, "customFields": fields}]}
+
+    api.route("GET", "/spend/custom-fields", {"results": [{"id": field_id, "name": field_id.upper()} for field_id in field_ids]})
+    api.route("GET", "/spend/custom-fields/cf0/values", {"results": [{"id": "cf0-val", "value": "Travel"}]})
+    api.route("GET", "/spend/custom-fields/cf22/values", {"results": [{"id": "cf22-val", "value": "EMEA"}]})
+    api.route("GET", "/spend/transactions", transactions)
+    result = app.list_enriched_transactions(customFieldIds=field_ids)
+    values = result["results"][0]["customFieldValues"]
+    assert (values["CF0"], values["CF22"], values["CF1"]) == (["Travel"], ["EMEA"], [])
+    assert len(api.calls("GET", "/spend/transactions")) == 2
+
+
+def test_sync_and_read_vendor_audit_trail(app, api, tmp_path):
+    trail = [{"action": "CREATED", "time": "2024-01-01"}, {"action": "UPDATED", "time": "2024-01-02"}]
+
+    def audit(request):
+        start, max = int(request.url.params["start"]), int(request.url.params["max"])
+        return trail[start:start + max]
+
+    api.route("GET", "/vendors", {"results": [{"id": "v1", "name": "Acme"}]})
+    api.route("GET", "/reports/audit-trail/vendor/v1", audit)
+    store_path = str(tmp_path / "audit.db")
+    result = app.sync_vendor_audit_trails(store_path, page_size=10)
+    assert (result["vendors"], result["newEntries"], result["failures"]) == (1, {"v1": 2}, [])
+    trail.append({"action": "ARCHIVED", "time": "2024-01-03"})
+    assert app.sync_vendor_audit_trails(store_path, vendorIds=["v1"], page_size=10)["newEntries"] == {"v1": 1}
+    page = app.read_vendor_audit_trail(store_path, "v1", after=1, max=5)
+    assert [entry["position"] for entry in page["entries"]] == [1, 2]
+    assert page["nextAfter"] == 3
+    assert app.read_vendor_audit_trail(store_path, "v1", includeArchived=True)["entries"] == []
+
+
+def test_download_check_images(app, api, tmp_path):
+    api.route("GET", "/payments/p1/check-image", {"checkImageData": base64.b64encode(b"check-one").decode()})
+    api.route("GET", "/payments/p2/check-image", httpx.Response(200, content=b"check-two", headers={"Content-Type": "image/png"}))
+    result = app.download_check_images(["p1", "p2", "p3"], str(tmp_path))
+    assert (result["downloaded"], result["skipped"], result["failed"]) == (2, 0, 1)
+    assert app.download_check_images(["p1", "p2"], str(tmp_path))["skipped"] == 2
+    assert len(api.calls("GET", "/payments/p1/check-image")) == 1
+
+
+def test_create_bill_document_uploads_content_once(app, api):
+    api.route("POST", "/documents/bills/b1", lambda request: {"id": "d" + str(len(api.calls("POST", "/documents/bills/b1")))})
+    assert app.create_bill_document("b1", "invoice.pdf", [b"%PDF-1"]) == {"id": "d1"}
+    assert app.create_bill_document("b1", "invoice.pdf", [b"%PDF-1"]) == {"id": "d1"}
+    assert len(api.calls("POST", "/documents/bills/b1")) == 1
+    assert app.create_bill_document("b1", "copy.pdf", [b"%PDF-1"]) == {"id": "d2"}
+    assert api.calls("POST", "/documents/bills/b1")[1].url.params["name"] == "copy.pdf"
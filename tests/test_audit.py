@@ -0,0 +1,70 @@
+from universal_mcp_bill.audit import AuditTrailStore, trail_key
+
+
+class FakeTrail:
+    def __init__(self, entries):
+        self.entries = entries
+        self.calls = []
+
+    def __call__(self, start, max):
+        self.calls.append((start, max))
+        return self.entries[start : start + max]
+
+
+def test_reads_only_new_entries_after_checkpoint(tmp_path):
+    path = str(tmp_path / "audit.db")
+    store = AuditTrailStore(path)
+    trail = FakeTrail([{"event": i} for i in range(5)])
+    assert store.read_new("v1", trail, page_size=2) == 5
+    assert trail.calls == [(0, 2), (2, 2), (4, 2)]
+    store.close()
+
+    resumed = AuditTrailStore(path)
+    assert resumed.checkpoint("v1") == 5
+    trail.entries += [{"event": 5}, {"event": 6}]
+    trail.calls.clear()
+    assert resumed.read_new("v1", trail, page_size=2) == 2
+    # The last stored entry is re-read first to check the trail was not reordered.
+    assert trail.calls == [(4, 1), (5, 2), (7, 2)]
+    assert resumed.read_new("v1", trail, page_size=2) == 0
+    assert [e["entry"]["event"] for e in resumed.entries("v1", after=4, limit=2)] == [4, 5]
+    assert resumed.checkpoint("v2") == 0
+    resumed.close()
+
+
+def test_failed_page_keeps_earlier_progress(tmp_path):
+    store = AuditTrailStore(str(tmp_path / "audit.db"))
+    entries = [{"event": i} for i in range(4)]
+
+    def flaky(start, max):
+        if start >= 2:
+            raise RuntimeError("boom")
+        return entries[start : start + max]
+
+    try:
+        store.read_new("v1", flaky, page_size=2)
+    except RuntimeError:
+        pass
+    assert store.checkpoint("v1") == 2
+    store.close()
+
+
+def test_trail_key_separates_query_options():
+    assert trail_key("v1") == "v1"
+    assert trail_key("v1", includeArchived=None) == "v1"
+    assert trail_key("v1", includeArchived=True) == "v1?includeArchived=true"
+
+
+def test_reordered_trail_is_reread_without_duplicates(tmp_path):
+    store = AuditTrailStore(str(tmp_path / "audit.db"))
+    trail = FakeTrail([{"event": i} for i in range(3)])
+    assert store.read_new("v1", trail, page_size=2) == 3
+    # A backdated entry shifts everything after it by one position.
+    trail.entries.insert(1, {"event": "late"})
+    trail.calls.clear()
+    assert store.read_new("v1", trail, page_size=2) == 1
+    assert trail.calls[0] == (2, 1)
+    assert trail.calls[1] == (0, 2)
+    assert [e["entry"]["event"] for e in store.entries("v1")] == [0, 1, 2, "late"]
+    assert store.read_new("v1", trail, page_size=2) == 0
+    store.close()
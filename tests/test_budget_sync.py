@@ -0,0 +1,32 @@
+import pytest
+
+from universal_mcp_bill.budget_sync import diff_members
+
+CURRENT = [
+    {"user": {"id": "u1"}, "limit": 100.0, "recurringLimit": 100.0, "role": "MEMBER", "shareBudgetFunds": False},
+    {"userId": "u2", "role": "OWNER", "shareBudgetFunds": True},
+    {"userId": "u3", "role": "MEMBER", "shareBudgetFunds": True},
+]
+
+
+def test_diff_sends_only_real_changes():
+    desired = [
+        {"userId": "u1", "limit": 100, "role": "MEMBER"},
+        {"userId": "u2", "role": "MEMBER"},
+        {"userId": "u4", "role": "MEMBER", "shareBudgetFunds": True},
+    ]
+    diff = diff_members(CURRENT, desired)
+    assert diff["add"] == [{"userId": "u4", "role": "MEMBER", "shareBudgetFunds": True}]
+    assert diff["update"] == [{"userId": "u2", "role": "MEMBER"}]
+    assert diff["remove"] == ["u3"]
+    assert diff["unchanged"] == 1
+
+
+def test_diff_can_keep_unlisted_members():
+    diff = diff_members(CURRENT, [{"userId": "u1"}], remove_missing=False)
+    assert diff == {"add": [], "update": [], "remove": [], "unchanged": 1}
+
+
+def test_diff_rejects_members_without_user_id():
+    with pytest.raises(ValueError):
+        diff_members(CURRENT, [{"role": "MEMBER"}])
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from universal_mcp_bill.cache import MISSING, CachedResponse, ResponseCache, SingleFlight, TTLCache, parse_max_age, request_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expiry_and_lru_eviction():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    clock.now = 11
+    assert cache.get("a") is MISSING
+    assert len(cache) == 1
+
+
+def test_get_or_load_coalesces_concurrent_loads():
+    cache = TTLCache()
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(1)
+        return {"results": []}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{"results": []}] * 5
+    assert cache.get_or_load("k", loader) == {"results": []}
+    assert len(calls) == 1
+
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flight.do("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert flight.do("k", lambda: 42) == 42
+
+
+def test_cached_response_validators():
+    entry = CachedResponse(body={"id": "00n1"}, etag='"abc"', last_modified="Wed, 01 May 2024 10:00:00 GMT")
+    assert entry.has_http_validators
+    assert entry.conditional_headers() == {"If-None-Match": '"abc"', "If-Modified-Since": "Wed, 01 May 2024 10:00:00 GMT"}
+    assert not CachedResponse(body={}, updated_time="2024-05-01T10:00:00Z").has_http_validators
+
+
+def test_parse_max_age():
+    assert parse_max_age("private, max-age=60") == 60.0
+    assert parse_max_age("no-cache, max-age=60") is None
+    assert parse_max_age(None) is None
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2)
+    cache.put("a", CachedResponse(body=1))
+    cache.put("b", CachedResponse(body=2))
+    cache.get("a")
+    cache.put("c", CachedResponse(body=3))
+    assert cache.get("b") is None
+    assert cache.get("a").body == 1
+
+
+def test_request_key_ignores_param_order_and_none():
+    assert request_key("get", "u", {"a": 1, "b": None, "c": [1, 2]}) == request_key("GET", "u", {"c": [1, 2], "a": 1})
+    assert request_key("GET", "u", {"a": 1}) != request_key("GET", "u", {"a": "1"})
+    assert request_key("GET", "u") == request_key("GET", "u", {})
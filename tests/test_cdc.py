@@ -0,0 +1,52 @@
+from universal_mcp_bill.cdc import ChangeFeed, classify, fingerprint, last_logged_seq, read_events
+
+
+def test_fingerprint_ignores_updated_time():
+    assert fingerprint({"id": "1", "name": "a", "updatedTime": "t1"}) == fingerprint({"id": "1", "name": "a", "updatedTime": "t2"})
+    assert fingerprint({"id": "1", "name": "a"}) != fingerprint({"id": "1", "name": "b"})
+
+
+def test_classify():
+    record = {"id": "1", "name": "a"}
+    assert classify(None, None, record) == "created"
+    assert classify(fingerprint(record), False, record) is None
+    assert classify("old", False, record) == "updated"
+    assert classify("old", False, {**record, "archived": True}) == "archived"
+    assert classify("old", True, record) == "restored"
+
+
+def test_capture_logs_only_changes_and_resumes(tmp_path):
+    log = str(tmp_path / "changes.jsonl")
+    feed = ChangeFeed(log)
+    counts = feed.capture("vendors", [
+        {"id": "v1", "name": "Acme", "updatedTime": "2024-01-01T00:00:00Z"},
+        {"id": "v2", "name": "Beta", "updatedTime": "2024-01-02T00:00:00Z"},
+    ])
+    assert counts["created"] == 2
+    assert feed.watermark("vendors") == "2024-01-02T00:00:00Z"
+
+    resumed = ChangeFeed(log)
+    counts = resumed.capture("vendors", [
+        {"id": "v2", "name": "Beta", "updatedTime": "2024-01-03T00:00:00Z"},
+        {"id": "v1", "name": "Acme", "archived": True, "updatedTime": "2024-01-04T00:00:00Z"},
+    ])
+    assert counts == {"seen": 2, "created": 0, "updated": 0, "archived": 1, "restored": 0}
+    assert resumed.watermark("vendors") == "2024-01-04T00:00:00Z"
+
+    events = list(read_events(log))
+    assert [(e["seq"], e["type"], e["id"]) for e in events] == [(1, "created", "v1"), (2, "created", "v2"), (3, "archived", "v1")]
+    assert [e["seq"] for e in read_events(log, after=1, limit=1)] == [2]
+
+
+def test_seq_recovers_from_log_ahead_of_state(tmp_path):
+    log = tmp_path / "changes.jsonl"
+    feed = ChangeFeed(str(log))
+    feed.capture("vendors", [{"id": "v1", "name": "Acme", "updatedTime": "2024-01-01T00:00:00Z"}])
+    # Simulate a crash after the log append but before the state was saved, leaving a torn line.
+    with open(log, "a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "source": "vendors", "type": "created", "id": "v2"}\n{"seq": 3, "sour')
+    assert last_logged_seq(str(log), block_size=16) == 2
+    resumed = ChangeFeed(str(log))
+    assert resumed.seq == 2
+    resumed.capture("vendors", [{"id": "v3", "name": "Gamma", "updatedTime": "2024-01-02T00:00:00Z"}])
+    assert [e["seq"] for e in read_events(str(log))] == [1, 2, 3]
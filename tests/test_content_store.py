@@ -0,0 +1,37 @@
+import hashlib
+import os
+
+from universal_mcp_bill.content_store import ContentStore
+
+
+def test_put_stream_deduplicates_and_refs_persist(tmp_path):
+    root = str(tmp_path / "images")
+    store = ContentStore(root)
+    digest, size = store.put_stream([b"abc", b"def"])
+    assert digest == hashlib.sha256(b"abcdef").hexdigest() and size == 6
+    assert store.put_stream([b"abcdef"]) == (digest, 6)
+    assert [name for name in os.listdir(root) if name.startswith(".blob-")] == []
+
+    ref = store.set_ref("p1", digest, size, contentType="image/png")
+    with open(ref["path"], "rb") as f:
+        assert f.read() == b"abcdef"
+
+    reopened = ContentStore(root)
+    assert reopened.ref("p1")["sha256"] == digest
+    assert reopened.ref("p2") is None
+    os.unlink(reopened.path_for(digest))
+    assert reopened.ref("p1") is None
+
+
+def test_failed_stream_leaves_no_partial_files(tmp_path):
+    store = ContentStore(str(tmp_path))
+
+    def chunks():
+        yield b"partial"
+        raise IOError("connection reset")
+
+    try:
+        store.put_stream(chunks())
+    except IOError:
+        pass
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,48 @@
+import pytest
+
+from universal_mcp_bill.dedup import BillDuplicateIndex, DuplicateBillError, bill_key
+
+
+def test_bill_key_normalizes():
+    assert bill_key("009a ", "inv-0042", 10, "2024-01-02T00:00:00Z") == ("009a", "INV0042", "10.00", "2024-01-02")
+
+
+def test_index_finds_existing_and_in_batch_duplicates():
+    index = BillDuplicateIndex()
+    index.load([
+        {"id": "00n1", "vendorId": "009a", "amount": 120.5, "invoice": {"invoiceNumber": "INV 7", "invoiceDate": "2024-01-02"}},
+        {"id": "00n2", "vendorId": "009a", "amount": 5, "invoice": {"invoiceNumber": "X"}, "archived": True},
+    ])
+    payload = {"vendorId": "009a", "invoice": {"invoiceNumber": "inv-7", "invoiceDate": "2024-01-02"},
+               "billLineItems": [{"amount": 100}, {"amount": 20.5}]}
+    other = {"vendorId": "009b", "invoice": {"invoiceNumber": "1"}, "billLineItems": [{"amount": 1}]}
+    assert index.find(payload) == "00n1"
+    assert index.find_duplicates([payload, other, other]) == [
+        {"index": 0, "duplicateOf": "00n1"},
+        {"index": 2, "duplicateOf": "item 1"},
+    ]
+    index.discard("00n1")
+    assert index.find(payload) is None
+    index.add([dict(other, id="00n3")])
+    assert index.find(other) == "00n3"
+
+
+def test_duplicate_error_message():
+    with pytest.raises(ValueError, match="item 0 duplicates 00n1"):
+        raise DuplicateBillError([{"index": 0, "duplicateOf": "00n1"}])
+
+
+def test_add_rekeys_updated_and_restored_bills():
+    index = BillDuplicateIndex()
+    original = {"id": "b1", "vendorId": "v1", "amount": 10, "invoice": {"invoiceNumber": "A-1", "invoiceDate": "2024-01-01"}}
+    index.load([original])
+    updated = dict(original, invoice={"invoiceNumber": "A-2", "invoiceDate": "2024-01-01"})
+    index.add([updated])
+    assert index.find(original) is None
+    assert index.find(updated) == "b1"
+    assert len(index) == 1
+    index.discard("b1")
+    index.add([updated])
+    assert index.find(updated) == "b1"
+    index.add([dict(updated, archived=True)])
+    assert index.find(updated) is None
@@ -0,0 +1,47 @@
+from universal_mcp_bill.enrichment import CustomFieldCatalog, chunk_field_ids, enrich, merge_custom_fields
+
+FIELDS = [{"id": "cf1", "name": "Project"}, {"id": "cf2", "name": "Cost center"}]
+VALUES = {"cf1": [{"id": "val1", "value": "Apollo"}], "cf2": [{"id": "val2", "value": "R&D"}]}
+
+
+def _catalog(calls):
+    def load_fields():
+        calls.append("fields")
+        return FIELDS
+
+    def load_values(field_id):
+        calls.append(field_id)
+        return VALUES[field_id]
+
+    return CustomFieldCatalog(load_fields, load_values)
+
+
+def test_catalog_loads_once_until_invalidated():
+    calls = []
+    catalog = _catalog(calls)
+    assert list(catalog.fields()) == ["cf1", "cf2"]
+    assert catalog.label("cf1", "val1") == "Apollo"
+    assert catalog.label("cf1", "free text") == "free text"
+    catalog.fields()
+    assert calls == ["fields", "cf1"]
+    catalog.invalidate()
+    catalog.fields()
+    assert calls == ["fields", "cf1", "fields"]
+
+
+def test_chunk_field_ids():
+    assert chunk_field_ids([]) == [[]]
+    chunks = chunk_field_ids([f"cf{i}" for i in range(45)])
+    assert [len(chunk) for chunk in chunks] == [20, 20, 5]
+
+
+def test_merge_and_enrich():
+    record = {"id": "t1", "customFields": [{"id": "cf1", "selectedValues": ["val1"]}]}
+    merged = merge_custom_fields(record, [{"id": "t1", "customFields": [{"id": "cf2", "selectedValues": ["val2"]}]}])
+    assert [field["id"] for field in merged["customFields"]] == ["cf1", "cf2"]
+    assert len(record["customFields"]) == 1
+    enriched = enrich(merged, _catalog([]), ["cf1", "cf2"])
+    assert enriched["customFieldValues"] == {"Project": ["Apollo"], "Cost center": ["R&D"]}
+    # A requested field the listing omitted is empty rather than looked up.
+    assert enrich(record, _catalog([]), ["cf1", "cf2"])["customFieldValues"] == {"Project": ["Apollo"], "Cost center": []}
+    assert "customFieldValues" not in record
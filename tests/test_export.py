@@ -0,0 +1,69 @@
+import pytest
+
+from universal_mcp_bill.export import ColumnBatch, PartitionedWriter, flatten_record, partition_value
+
+
+def test_flatten_record():
+    record = {"id": "00n1", "invoice": {"invoiceNumber": "A-1"}, "billLineItems": [{"amount": 5}]}
+    assert flatten_record(record) == {
+        "id": "00n1",
+        "invoice.invoiceNumber": "A-1",
+        "billLineItems": '[{"amount":5}]',
+    }
+
+
+def test_column_batch_infers_kinds():
+    batch = ColumnBatch()
+    batch.append({"amount": 1, "dueDate": "2024-01-31"})
+    batch.append({"amount": 2.5, "vendorId": "009a"})
+    assert batch.num_rows == 2
+    assert batch.columns["vendorId"] == [None, "009a"]
+    assert batch.kinds == {"amount": "float64", "dueDate": "date", "vendorId": "string"}
+
+
+def test_partition_value():
+    assert partition_value("2024-03-05T10:00:00.000+00:00", "month") == "2024-03"
+    assert partition_value(None, "month") == "unknown"
+
+
+def test_partitioned_writer_writes_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    writer = PartitionedWriter(str(tmp_path / "bills"), partition_field="createdTime", batch_size=2)
+    writer.write_all(
+        {"id": str(i), "amount": i, "createdTime": f"2024-0{1 + i % 2}-01T00:00:00.000+00:00"} for i in range(5)
+    )
+    summary = writer.close()
+    assert summary["rows"] == 5
+    assert summary["partitions"] == ["month=2024-01", "month=2024-02"]
+    assert sum(pq.read_table(path).num_rows for path in summary["files"]) == 5
+
+
+def test_column_batch_amounts_are_float():
+    batch = ColumnBatch()
+    batch.append({"amount": 1, "count": 2})
+    assert batch.kinds == {"amount": "float64", "count": "int64"}
+
+
+def test_partitioned_writer_parts_share_one_schema(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    pa = pytest.importorskip("pyarrow")
+    root = tmp_path / "payments"
+    writer = PartitionedWriter(str(root), partition_by=None, batch_size=2)
+    writer.write_all(
+        [
+            {"id": "1", "amount": 10, "memo": None, "processDate": "2024-01-01"},
+            {"id": "2", "amount": 11, "memo": None, "processDate": "2024-01-02"},
+            {"id": "3", "amount": 12.5, "memo": "late", "processDate": "2024-01-03T08:00:00.000+00:00"},
+            {"id": "4", "amount": 13, "memo": 7, "vendorId": "009a"},
+        ]
+    )
+    summary = writer.close()
+    assert len(summary["files"]) == 2
+    schemas = {str(pq.read_schema(path)) for path in summary["files"]}
+    assert len(schemas) == 1
+    table = pq.read_table(str(root))
+    assert sorted(table.column("id").to_pylist()) == ["1", "2", "3", "4"]
+    assert table.schema.field("amount").type == pa.float64()
+    assert table.schema.field("memo").type == pa.string()
+    assert table.schema.field("processDate").type == pa.timestamp("ms", tz="UTC")
+    assert sorted(table.column("vendorId").to_pylist(), key=str) == ["009a", None, None, None]
@@ -0,0 +1,30 @@
+import pytest
+
+from universal_mcp_bill.filters import Field, Filter, apply_query, parse_filters, serialize_filters, serialize_sort
+
+BILLS = [
+    {"id": "1", "vendorId": "v1", "amount": 100, "dueDate": "2024-01-10", "archived": False, "invoice": {"invoiceNumber": "A-1"}},
+    {"id": "2", "vendorId": "v2", "amount": 250.5, "dueDate": "2024-02-01", "archived": False, "invoice": {"invoiceNumber": "B-7"}},
+    {"id": "3", "vendorId": "v1", "amount": 75, "archived": True, "invoice": {"invoiceNumber": "A-2"}},
+]
+
+
+def test_serialize_and_parse_round_trip():
+    filters = [Field("archived").eq(False), Field("dueDate").gte("2024-01-01"), Field("vendorId").in_(["v1", "v2"])]
+    wire = serialize_filters(filters)
+    assert wire == 'archived:eq:false,dueDate:gte:"2024-01-01",vendorId:in:"v1,v2"'
+    assert parse_filters(wire) == [Filter("archived", "eq", False), Filter("dueDate", "gte", "2024-01-01"), Filter("vendorId", "in", ["v1", "v2"])]
+    assert serialize_sort([Field("dueDate").desc(), "amount:asc"]) == "dueDate:desc,amount:asc"
+    assert serialize_filters(None) is None
+
+
+def test_local_evaluation():
+    assert [r["id"] for r in apply_query(BILLS, 'archived:eq:false,amount:gt:150')] == ["2"]
+    assert [r["id"] for r in apply_query(BILLS, [{"field": "invoice.invoiceNumber", "op": "sw", "value": "a-"}])] == ["1", "3"]
+    assert [r["id"] for r in apply_query(BILLS, Field("vendorId").nin(["v2"]), sort="dueDate:desc")] == ["1", "3"]
+    assert [r["id"] for r in apply_query(BILLS, sort=[Field("amount").desc()], limit=2)] == ["2", "1"]
+
+
+def test_rejects_unknown_operator():
+    with pytest.raises(ValueError):
+        parse_filters("amount:between:1")
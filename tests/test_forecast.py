@@ -0,0 +1,68 @@
+from datetime import date
+
+from universal_mcp_bill.forecast import CashForecaster, expand_schedule
+
+
+def test_expand_schedule_monthly_keeps_month_end_anchor():
+    schedule = {"period": "MONTHLY", "frequency": 1, "nextDueDate": "2024-01-31"}
+    assert expand_schedule(schedule, date(2024, 1, 1), date(2024, 5, 1)) == [
+        date(2024, 1, 31),
+        date(2024, 2, 29),
+        date(2024, 3, 31),
+        date(2024, 4, 30),
+    ]
+
+
+def test_expand_schedule_respects_end_date():
+    schedule = {"period": "WEEKLY", "frequency": 2, "nextDueDate": "2024-01-01", "endDate": "2024-01-20"}
+    assert expand_schedule(schedule, date(2024, 1, 1), date(2024, 3, 1)) == [date(2024, 1, 1), date(2024, 1, 15)]
+
+
+def test_forecaster_incremental_sync():
+    forecaster = CashForecaster()
+    payments = [{"id": "p1", "status": "SCHEDULED", "processDate": "2024-01-03", "amount": 40.0, "billId": "b2",
+                 "fundingAccount": {"type": "BANK_ACCOUNT", "id": "bank1"}}]
+    bills = [
+        {"id": "b1", "dueDate": "2023-12-20", "dueAmount": 10.0},
+        {"id": "b2", "dueDate": "2024-01-05", "dueAmount": 40.0},
+        {"id": "b3", "dueDate": "2024-01-04", "dueAmount": 5.0, "paymentStatus": "PAID"},
+    ]
+    assert forecaster.sync("payments", payments) == 1
+    assert forecaster.sync("bills", bills) == 3
+    series = forecaster.series(date(2024, 1, 1), days=10)
+    assert series["total"] == 50.0
+    assert series["accounts"]["unassigned"]["daily"][0] == 10.0
+    assert series["accounts"]["bank1"]["daily"][2] == 40.0
+
+    bills[0] = dict(bills[0], dueAmount=15.0)
+    assert forecaster.sync("bills", bills) == 1
+    assert forecaster.sync("bills", bills[:1]) == 2
+    assert forecaster.series(date(2024, 1, 1), days=10)["total"] == 55.0
+
+
+def test_series_window_moves_without_resync():
+    forecaster = CashForecaster()
+    forecaster.sync("bills", [{"id": "b1", "dueDate": "2024-01-20", "dueAmount": 10.0}])
+    forecaster.sync("recurring_bills", [{
+        "id": "r1",
+        "schedule": {"period": "MONTHLY", "nextDueDate": "2024-01-15"},
+        "recurringBillLineItems": [{"amount": 7.0}],
+    }])
+    assert forecaster.series(date(2024, 1, 1), days=10)["total"] == 0.0
+    later = forecaster.series(date(2024, 1, 25), days=30)
+    # The overdue bill and the missed 2024-01-15 occurrence land on the first day; the next one is due 2024-02-15.
+    assert later["dailyTotal"][0] == 17.0
+    assert later["dailyTotal"][21] == 7.0
+    assert later["total"] == 24.0
+
+
+def test_partial_pending_payment_reduces_bill_outflow():
+    forecaster = CashForecaster()
+    forecaster.sync("payments", [{"id": "p1", "status": "SCHEDULED", "processDate": "2024-01-02", "amount": 30.0, "billId": "b1"}])
+    forecaster.sync("bills", [{"id": "b1", "dueDate": "2024-01-05", "dueAmount": 100.0}])
+    series = forecaster.series(date(2024, 1, 1), days=10)
+    assert (series["dailyTotal"][1], series["dailyTotal"][4], series["total"]) == (30.0, 70.0, 100.0)
+
+    assert forecaster.sync("payments", []) == 1
+    assert forecaster.sync("bills", [{"id": "b1", "dueDate": "2024-01-05", "dueAmount": 100.0}]) == 1
+    assert forecaster.series(date(2024, 1, 1), days=10)["dailyTotal"][4] == 100.0
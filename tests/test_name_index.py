@@ -0,0 +1,34 @@
+from universal_mcp_bill.name_index import NameIndex, normalize_name
+
+
+def test_normalize_name():
+    assert normalize_name("Acmé Widgets, Inc.") == "acme widgets"
+    assert normalize_name("Co") == "co"
+
+
+def test_search_ranks_exact_prefix_and_fuzzy():
+    index = NameIndex()
+    index.load("vendor", [
+        {"id": "v1", "name": "Acme Widgets LLC"},
+        {"id": "v2", "name": "Acme Widgetry"},
+        {"id": "v3", "name": "Globex"},
+        {"id": "v4", "name": "Old Acme", "archived": True},
+    ])
+    index.add("customer", {"id": "c1", "name": "ACME widgets"})
+    assert len(index) == 4
+    results = index.search("acme widgets")
+    assert {r["id"] for r in results[:2]} == {"v1", "c1"}
+    assert results[0]["score"] >= 1.0
+    assert [r["id"] for r in index.search("acme widgets", entity_types=["vendor"])][0] == "v1"
+    assert index.search("glbex")[0]["id"] == "v3"
+    assert index.search("zzz") == []
+
+
+def test_update_and_archive_reindex():
+    index = NameIndex()
+    index.add("vendor", {"id": "v1", "name": "Initech"})
+    index.add("vendor", {"id": "v1", "name": "Initrode"})
+    assert index.search("initrode")[0]["id"] == "v1"
+    assert index.search("initech", min_score=0.9) == []
+    index.add("vendor", {"id": "v1", "name": "Initrode", "archived": True})
+    assert len(index) == 0
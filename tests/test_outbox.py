@@ -0,0 +1,127 @@
+import time
+
+import httpx
+import pytest
+
+from universal_mcp_bill.outbox import Outbox, OutboxHandler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeApi:
+    def __init__(self, fail_bulk=False, bad_names=()):
+        self.single_calls = []
+        self.bulk_calls = []
+        self.fail_bulk = fail_bulk
+        self.bad_names = set(bad_names)
+
+    def single(self, args):
+        if args["name"] in self.bad_names:
+            raise RuntimeError(f"rejected {args['name']}")
+        self.single_calls.append(args)
+        return {"id": f"id-{args['name']}"}
+
+    def bulk(self, items):
+        if self.fail_bulk:
+            raise RuntimeError("bulk down")
+        self.bulk_calls.append(items)
+        return [{"id": f"id-{item['name']}"} for item in items]
+
+
+def _outbox(path, api, **kwargs):
+    handlers = {
+        "create_vendor": OutboxHandler(api.single, api.bulk, bulk_size=2),
+        "update_vendor": OutboxHandler(api.single),
+    }
+    return Outbox(str(path), handlers, **kwargs)
+
+
+def test_batches_through_bulk_endpoint(tmp_path):
+    api = FakeApi()
+    outbox = _outbox(tmp_path / "outbox.db", api)
+    handles = [outbox.enqueue("create_vendor", {"name": name}) for name in "abc"]
+    update = outbox.enqueue("update_vendor", {"name": "d"})
+    assert outbox.flush() == {"done": 4, "failed": 0, "pending": 0}
+    assert [len(call) for call in api.bulk_calls] == [2, 1]
+    assert api.single_calls == [{"name": "d"}]
+    assert outbox.status(handles[2])["result"] == {"id": "id-c"}
+    assert outbox.status(update)["status"] == "done"
+    with pytest.raises(ValueError):
+        outbox.enqueue("delete_everything", {})
+    outbox.close()
+
+
+def test_pending_entries_survive_restart(tmp_path):
+    path = tmp_path / "outbox.db"
+    first = _outbox(path, FakeApi())
+    handle = first.enqueue("create_vendor", {"name": "a"})
+    first.close(flush=False)
+
+    api = FakeApi()
+    second = _outbox(path, api)
+    assert second.pending() == 1
+    second.flush()
+    assert second.status(handle)["status"] == "done"
+    second.close()
+
+
+def test_failed_bulk_is_retried_per_entry_until_max_attempts(tmp_path):
+    api = FakeApi(fail_bulk=True, bad_names={"b"})
+    clock = FakeClock()
+    outbox = _outbox(tmp_path / "outbox.db", api, max_attempts=2, base_backoff=10.0, clock=clock)
+    good = outbox.enqueue("create_vendor", {"name": "a"})
+    bad = outbox.enqueue("create_vendor", {"name": "b"})
+    assert outbox.flush() == {"done": 0, "failed": 0, "pending": 2}
+    # Nothing is retried before the backoff has elapsed.
+    assert outbox.flush() == {"done": 0, "failed": 0, "pending": 0}
+    clock.now += 10.0
+    assert outbox.flush() == {"done": 1, "failed": 1, "pending": 0}
+    assert outbox.status(good)["status"] == "done"
+    assert outbox.status(bad) == {"handle": bad, "operation": "create_vendor", "status": "failed", "attempts": 2, "result": None, "error": "rejected b"}
+    outbox.close()
+
+
+def test_transient_errors_retry_with_backoff_until_window_ends(tmp_path):
+    response = httpx.Response(429, headers={"Retry-After": "30"}, request=httpx.Request("POST", "https://example.test"))
+
+    def throttled(args):
+        raise httpx.HTTPStatusError("throttled", request=response.request, response=response)
+
+    clock = FakeClock()
+    outbox = Outbox(
+        str(tmp_path / "outbox.db"),
+        {"update_vendor": OutboxHandler(throttled)},
+        max_attempts=1,
+        base_backoff=1.0,
+        retry_window=100.0,
+        clock=clock,
+    )
+    handle = outbox.enqueue("update_vendor", {"name": "a"})
+    delays = []
+    while outbox.status(handle)["status"] == "pending":
+        counts = outbox.flush()
+        row = outbox._db.execute("SELECT next_attempt_at FROM outbox").fetchone()
+        delays.append(row[0] - clock.now)
+        clock.now = row[0]
+        assert sum(counts.values()) == 1
+    # Retry-After (30s) dominates the exponential delay, and 429 outlives max_attempts until the window closes.
+    assert all(delay >= 30.0 for delay in delays)
+    assert outbox.status(handle)["attempts"] == 4
+    assert outbox.status(handle)["status"] == "failed"
+    outbox.close(flush=False)
+
+
+def test_background_delivery(tmp_path):
+    outbox = _outbox(tmp_path / "outbox.db", FakeApi(), flush_interval=0.01).start()
+    handle = outbox.enqueue("update_vendor", {"name": "a"})
+    deadline = time.monotonic() + 5
+    while outbox.status(handle)["status"] != "done" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert outbox.status(handle)["status"] == "done"
+    outbox.close(flush=False)
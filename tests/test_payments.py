@@ -0,0 +1,136 @@
+import base64
+import threading
+
+import pytest
+
+from universal_mcp_bill.concurrency import RateLimiter, run_concurrently
+from universal_mcp_bill.payments import PaymentOptionsResolver, amount_bucket, bulk_payment_results, decode_check_image, plan_bulk_payments
+
+
+class FakeOptions:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, vendor_id, amount):
+        with self._lock:
+            self.calls.append((vendor_id, amount))
+        return {"vendorId": vendor_id, "amount": amount}
+
+
+def test_amount_bucket_groups_by_order_of_magnitude():
+    assert amount_bucket(120) == amount_bucket(999) == 3
+    assert amount_bucket(1000) == 3
+    assert amount_bucket(1000.01) == 4
+    assert amount_bucket(0) == 0
+
+
+def test_same_vendor_and_bucket_is_fetched_once():
+    fetch = FakeOptions()
+    resolver = PaymentOptionsResolver(fetch)
+    first = resolver.get("v1", 150)
+    assert resolver.get("v1", 420) is first
+    resolver.get("v1", 5000)
+    resolver.get("v2", 150)
+    assert fetch.calls == [("v1", 150), ("v1", 5000), ("v2", 150)]
+
+
+def test_invalidate_drops_every_bucket_for_the_vendor():
+    fetch = FakeOptions()
+    resolver = PaymentOptionsResolver(fetch)
+    resolver.get("v1", 150)
+    resolver.get("v1", 5000)
+    resolver.get("v2", 150)
+    resolver.invalidate("v1")
+    resolver.get("v1", 150)
+    resolver.get("v1", 5000)
+    resolver.get("v2", 150)
+    assert len(fetch.calls) == 5
+
+
+def test_prefetch_deduplicates_and_reports_failures():
+    fetch = FakeOptions()
+
+    def flaky(vendor_id, amount):
+        if vendor_id == "bad":
+            raise RuntimeError("boom")
+        return fetch(vendor_id, amount)
+
+    resolver = PaymentOptionsResolver(flaky)
+    summary = resolver.prefetch([("v1", 150), ("v1", 200), ("v2", 150), ("bad", 10)], max_workers=4)
+    assert summary["requested"] == 3
+    assert summary["failed"] == [{"vendorId": "bad", "amount": 10, "error": "boom"}]
+    resolver.get("v1", 300)
+    assert sorted(fetch.calls) == [("v1", 150), ("v2", 150)]
+
+
+def test_run_concurrently_keeps_order_and_captures_errors():
+    def square(n):
+        if n == 3:
+            raise ValueError("three")
+        return n * n
+
+    outcomes = run_concurrently(square, range(6), max_workers=3)
+    assert [o.item for o in outcomes] == list(range(6))
+    assert [o.result for o in outcomes if o.ok] == [0, 1, 4, 16, 25]
+    assert isinstance(outcomes[3].error, ValueError)
+
+
+BANK = {"type": "BANK_ACCOUNT", "id": "bank1"}
+CARD = {"type": "CARD_ACCOUNT", "id": "card1"}
+
+
+def _item(bill_id, vendor_id="v1", account=BANK, process_date="2024-07-01", amount=10.0):
+    return {"billId": bill_id, "vendorId": vendor_id, "amount": amount, "fundingAccount": account, "processDate": process_date}
+
+
+def test_plan_groups_by_account_and_date_and_chunks():
+    items = [_item(f"b{i}", vendor_id=f"v{i % 3}") for i in range(5)]
+    items += [_item("c1", account=CARD), _item("d1", process_date="2024-07-02")]
+    plan = plan_bulk_payments(items, max_per_request=2)
+    assert [len(request["payments"]) for request in plan] == [2, 2, 1, 1, 1]
+    assert all("vendorId" not in request for request in plan)
+    assert plan[3]["fundingAccount"] == CARD
+    assert plan[4]["processDate"] == "2024-07-02"
+    # One vendor's bills stay together inside a group.
+    first_group = [p["billId"] for request in plan[:3] for p in request["payments"]]
+    assert first_group == ["b0", "b3", "b1", "b4", "b2"]
+    with pytest.raises(ValueError):
+        plan_bulk_payments(items, max_per_request=0)
+
+
+def test_plan_single_vendor_sets_vendor_id():
+    plan = plan_bulk_payments([_item("a", "v1"), _item("b", "v2"), _item("c", "v1")], single_vendor=True)
+    assert [(request["vendorId"], len(request["payments"])) for request in plan] == [("v1", 2), ("v2", 1)]
+
+
+def test_bulk_payment_results_matches_by_bill_id_or_position():
+    payments = [{"billId": "b1", "amount": 1}, {"billId": "b2", "amount": 2}]
+    by_id = bulk_payment_results({"payments": [{"id": "p2", "billId": "b2"}, {"id": "p1", "billId": "b1"}]}, payments)
+    assert [r["payment"]["id"] for r in by_id] == ["p1", "p2"]
+    by_position = bulk_payment_results([{"id": "p1"}, {"id": "p2"}], payments)
+    assert [r["payment"]["id"] for r in by_position] == ["p1", "p2"]
+    assert all(r["status"] == "submitted" for r in by_position)
+
+
+def test_rate_limiter_spaces_calls_after_burst():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2.0, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        limiter.acquire()
+    assert sleeps == [0.5, 0.5]
+
+
+def test_decode_check_image():
+    encoded = base64.b64encode(b"\x89PNG").decode()
+    assert decode_check_image({"checkImageData": encoded}) == b"\x89PNG"
+    assert decode_check_image({"image": f"data:image/png;base64,{encoded}"}) == b"\x89PNG"
+    assert decode_check_image({"data": {"content": encoded}}) == b"\x89PNG"
+    with pytest.raises(ValueError):
+        decode_check_image({"status": "ok"})
@@ -0,0 +1,50 @@
+from universal_mcp_bill.reconcile import InvoiceReconciler
+
+INVOICES = [
+    {"id": "i1", "customerId": "c1", "invoiceNumber": "INV-1", "dueAmount": 100.0, "dueDate": "2024-01-10"},
+    {"id": "i2", "customerId": "c1", "invoiceNumber": "INV-2", "dueAmount": 50.0, "dueDate": "2024-01-05"},
+    {"id": "i3", "customerId": "c1", "invoiceNumber": "INV-3", "dueAmount": 50.0, "dueDate": "2024-01-20"},
+    {"id": "i4", "customerId": "c2", "invoiceNumber": "INV-4", "dueAmount": 75.0, "status": "PAID_IN_FULL"},
+]
+
+
+def test_reference_amount_and_unmatched():
+    reconciler = InvoiceReconciler(INVOICES, amount_tolerance=0.05)
+    result = reconciler.reconcile([
+        {"customerId": "c1", "amount": 99.97, "reference": "inv 1", "paymentDate": "2024-02-01"},
+        {"customerId": "c1", "amount": 50.0, "paymentDate": "2024-02-01", "paymentType": "CHECK"},
+        {"customerId": "c1", "amount": 50.0, "reference": "INV-2", "paymentDate": "2024-02-02"},
+        {"customerId": "c2", "amount": 75.0, "paymentDate": "2024-02-02"},
+        {"customerId": "c1", "amount": 100.0},
+    ])
+    assert reconciler.open_invoices == 3
+    assert [(m["index"], m["rule"], m["invoiceIds"]) for m in result["matches"]] == [
+        (0, "reference", ["i1"]),
+        (1, "amount", ["i3"]),
+        (2, "reference", ["i2"]),
+    ]
+    assert [(u["index"], u["reason"]) for u in result["unmatched"]] == [
+        (3, "no matching open invoice"),
+        (4, "missing paymentDate"),
+    ]
+    assert result["recordInvoiceRequests"][0] == {
+        "customerId": "c1",
+        "paymentDate": "2024-02-01",
+        "paymentType": "OTHER",
+        "amount": 99.97,
+        "invoices": [{"id": "i1", "amount": 99.97}],
+    }
+
+
+def test_multi_invoice_reference_and_partial():
+    reconciler = InvoiceReconciler(INVOICES, allow_partial=True)
+    result = reconciler.reconcile([
+        {"customerId": "c1", "amount": 30.0, "paymentDate": "2024-02-01"},
+        {"customerId": "c1", "amount": 150.0, "reference": "INV-1, INV-2", "paymentDate": "2024-02-01"},
+        {"customerId": "c1", "amount": 20.0, "reference": "INV-3", "paymentDate": "2024-02-01"},
+    ])
+    assert [(m["rule"], m["invoiceIds"]) for m in result["matches"]] == [
+        ("amount", ["i3"]),
+        ("reference", ["i1", "i2"]),
+        ("partial", ["i3"]),
+    ]
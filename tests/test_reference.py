@@ -0,0 +1,53 @@
+import json
+
+from universal_mcp_bill.reference import ReferenceDataStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_loads_once_and_refreshes_due_entries():
+    clock = FakeClock()
+    store = ReferenceDataStore(refresh_interval=None, clock=clock)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"results": len(calls)}
+
+    assert store.get("list_industries", {}, loader) == {"results": 1}
+    assert store.get("list_industries", {}, loader) == {"results": 1}
+    assert store.get("get_price_plan", {"url": "x"}, loader) == {"results": 2}
+    store.refresh_interval = 60
+    clock.now += 61
+    assert store.refresh_due() == 2
+    assert len(calls) == 4
+
+
+def test_snapshot_round_trip_and_max_stale(tmp_path):
+    path = tmp_path / "reference.json"
+    clock = FakeClock()
+    store = ReferenceDataStore(snapshot_path=str(path), refresh_interval=None, clock=clock)
+    store.get("list_industries", {}, lambda: {"results": ["Retail"]})
+    assert json.loads(path.read_text())[0]["value"] == {"results": ["Retail"]}
+
+    restored = ReferenceDataStore(snapshot_path=str(path), refresh_interval=None, max_stale=100, clock=clock)
+    assert restored.get("list_industries", {}, lambda: {"results": []}) == {"results": ["Retail"]}
+    clock.now += 101
+    assert restored.get("list_industries", {}, lambda: {"results": []}) == {"results": []}
+    restored.invalidate()
+    assert len(restored) == 0
+
+
+def test_get_returns_independent_copies():
+    store = ReferenceDataStore(refresh_interval=None)
+    first = store.get("list_industries", {}, lambda: {"results": ["Retail"]})
+    first["results"].append("Mining")
+    second = store.get("list_industries", {}, lambda: {"results": []})
+    second["results"].clear()
+    assert store.get("list_industries", {}, lambda: {"results": []}) == {"results": ["Retail"]}
@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from universal_mcp_bill.spend import SpendStore
+
+
+TRANSACTIONS = [
+    {"id": "t1", "amount": 10.0, "budgetId": "b1", "cardId": "c1", "merchantName": "Cafe", "occurredTime": "2024-01-05T10:00:00Z",
+     "customFields": [{"id": "cf1", "selectedValues": [{"value": "Travel"}]}]},
+    {"id": "t2", "amount": 25.0, "budgetId": "b1", "cardId": "c2", "merchantName": "Air", "occurredTime": "2024-02-01T10:00:00Z"},
+    {"id": "t3", "amount": 5.0, "budgetId": "b2", "cardId": "c1", "merchantName": "Cafe", "occurredTime": "2024-02-03T10:00:00Z",
+     "customFields": [{"id": "cf1", "selectedValues": [{"value": "Meals"}]}]},
+]
+
+
+def test_group_by_and_filters():
+    store = SpendStore(capacity=2)
+    assert store.upsert(TRANSACTIONS) == {"inserted": 3, "updated": 0, "unchanged": 0}
+    assert store.query(["budgetId"]) == [
+        {"budgetId": "b1", "total": 35.0, "count": 2},
+        {"budgetId": "b2", "total": 5.0, "count": 1},
+    ]
+    assert store.query(["merchantName", "month"], filters={"cardId": "c1"}) == [
+        {"merchantName": "Cafe", "month": "2024-01", "total": 10.0, "count": 1},
+        {"merchantName": "Cafe", "month": "2024-02", "total": 5.0, "count": 1},
+    ]
+    assert store.query(["customField:cf1"], start_date="2024-01-01", end_date="2024-01-31") == [
+        {"customField:cf1": "Travel", "total": 10.0, "count": 1},
+    ]
+
+
+def test_incremental_upsert():
+    store = SpendStore()
+    store.upsert(TRANSACTIONS)
+    changed = dict(TRANSACTIONS[1], budgetId="b2")
+    assert store.upsert([TRANSACTIONS[0], changed]) == {"inserted": 0, "updated": 1, "unchanged": 1}
+    assert store.query(["budgetId"])[0] == {"budgetId": "b2", "total": 30.0, "count": 2}
+    assert store.query() == [{"total": 40.0, "count": 3}]
+
+
+def test_unknown_dimension():
+    with pytest.raises(ValueError):
+        SpendStore().query(["nope"])
+
+
+def test_watermark_tracks_latest_update():
+    store = SpendStore()
+    assert store.watermark is None
+    store.upsert([dict(TRANSACTIONS[0], updatedTime="2024-02-01T00:00:00.000+00:00"), dict(TRANSACTIONS[1], updatedTime="2024-01-01T00:00:00.000+00:00")])
+    assert store.watermark == "2024-02-01T00:00:00.000+00:00"
@@ -0,0 +1,33 @@
+from universal_mcp_bill.tagging import plan_tagging, selected_values
+
+TRANSACTIONS = {
+    "t1": {"id": "t1", "customFields": [{"id": "cf1", "selectedValues": [{"value": "Travel"}]}]},
+    "t2": {"id": "t2", "customFields": [{"customFieldId": "cf1", "values": ["Meals"]}, {"id": "cf2", "selectedValues": []}]},
+}
+
+
+def test_selected_values():
+    assert selected_values(TRANSACTIONS["t2"]) == {"cf1": frozenset({"Meals"}), "cf2": frozenset()}
+
+
+def test_plan_merges_per_transaction_and_drops_no_ops():
+    tags = [
+        {"transactionId": "t1", "customFieldId": "cf1", "values": ["Travel"]},
+        {"transactionId": "t2", "customFieldId": "cf1", "values": "Meals"},
+        {"transactionId": "t2", "customFieldId": "cf2", "values": ["A", "B"]},
+        {"transactionId": "t2", "customFieldId": "cf3", "values": []},
+        {"transactionId": "t1", "customFieldId": "cf2", "values": ["X"]},
+        {"transactionId": "t1", "customFieldId": "cf2", "values": ["Y"]},
+        {"transactionId": "missing", "customFieldId": "cf1", "values": ["Z"]},
+    ]
+    updates, skipped = plan_tagging(tags, TRANSACTIONS)
+    assert updates == {
+        "t1": [{"customFieldId": "cf2", "selectedValues": ["Y"]}],
+        "t2": [{"customFieldId": "cf2", "selectedValues": ["A", "B"]}],
+    }
+    assert skipped == [{"transactionId": "missing", "status": "failed", "error": "Transaction not found."}]
+
+
+def test_plan_reports_unchanged_transactions():
+    updates, skipped = plan_tagging([{"transactionId": "t1", "customFieldId": "cf1", "values": ["Travel"]}], TRANSACTIONS)
+    assert updates == {} and skipped == [{"transactionId": "t1", "status": "unchanged"}]
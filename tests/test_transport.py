@@ -0,0 +1,45 @@
+import httpx
+import pytest
+
+from universal_mcp_bill.transport import HttpConfig, build_client, endpoint_family
+
+
+def test_endpoint_family():
+    assert endpoint_family("/connect/v3/spend/budgets") == "spend"
+    assert endpoint_family("/connect/v3/health") == "health"
+    assert endpoint_family("/connect/login") is None
+    assert endpoint_family("/connect/v3") is None
+
+
+def test_timeout_for_uses_family_override():
+    config = HttpConfig(timeout=30.0, connect_timeout=10.0, family_timeouts={"health": 2.0, "attachments": 120.0})
+    assert config.timeout_for("/connect/v3/health").read == 2.0
+    assert config.timeout_for("/connect/v3/health").connect == 2.0
+    assert config.timeout_for("/connect/v3/attachments").read == 120.0
+    assert config.timeout_for("/connect/v3/bills").read == 30.0
+
+
+def test_build_client_applies_limits_and_family_timeouts():
+    config = HttpConfig(max_connections=7, family_timeouts={"health": 2.0})
+    client = build_client(config, base_url="https://example.test/connect", headers={"X-Test": "1"})
+    assert client.headers["X-Test"] == "1"
+    [hook] = client.event_hooks["request"]
+    health = client.build_request("GET", "/v3/health")
+    bills = client.build_request("GET", "/v3/bills")
+    hook(health)
+    hook(bills)
+    assert health.extensions["timeout"]["read"] == 2.0
+    assert bills.extensions["timeout"]["read"] == 180.0
+    assert client.timeout.read == 180.0
+
+
+def test_build_client_keeps_default_timeout_unless_configured():
+    assert build_client(HttpConfig(), default_timeout=60.0).timeout.read == 60.0
+    assert build_client(HttpConfig(timeout=15.0), default_timeout=60.0).timeout.read == 15.0
+    assert HttpConfig().timeout_for("/connect/v3/bills").read == 180.0
+
+
+def test_build_client_with_http2():
+    pytest.importorskip("h2")
+    client = build_client(HttpConfig(http2=True))
+    assert isinstance(client, httpx.Client)
@@ -0,0 +1,59 @@
+import threading
+import time
+
+import pytest
+
+from universal_mcp_bill.uploads import UploadIndex, content_digest
+
+
+def test_content_digest_streams_items():
+    assert content_digest([b"ab", b"cd"]) == content_digest([b"abcd"]) == content_digest(["ab", b"cd"])
+    assert content_digest([b"abcd"]) != content_digest([b"abce"])
+
+
+def test_repeat_upload_to_same_target_is_skipped(tmp_path):
+    path = str(tmp_path / "uploads.jsonl")
+    index = UploadIndex(path)
+    calls = []
+
+    def send(target):
+        calls.append(target)
+        return {"id": f"att-{len(calls)}"}
+
+    digest = content_digest([b"%PDF"])
+    first = index.upload(digest, "vendor:v1", lambda: send("vendor:v1"))
+    assert index.upload(digest, "vendor:v1", lambda: send("vendor:v1")) == first
+    index.upload(digest, "bill:b1", lambda: send("bill:b1"))
+    assert calls == ["vendor:v1", "bill:b1"]
+
+    reopened = UploadIndex(path)
+    assert len(reopened) == 2
+    assert reopened.get(digest, "vendor:v1") == first
+
+
+def test_failed_upload_is_not_recorded():
+    index = UploadIndex()
+
+    def fail():
+        raise RuntimeError("timeout")
+
+    with pytest.raises(RuntimeError):
+        index.upload("d", "vendor:v1", fail)
+    assert index.get("d", "vendor:v1") is None
+
+
+def test_concurrent_identical_uploads_share_one_request():
+    index = UploadIndex()
+    calls = []
+
+    def send():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"id": "att"}
+
+    threads = [threading.Thread(target=index.upload, args=("d", "bill:b1", send)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
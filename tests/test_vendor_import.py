@@ -0,0 +1,67 @@
+from universal_mcp_bill.vendor_import import changed_fields, normalize_address, normalize_tax_id, plan_vendor_import
+
+ADDRESS = {"line1": "1 Main St.", "city": "Springfield", "zipOrPostalCode": "12345-6789", "country": "US"}
+EXISTING = [
+    {"id": "v1", "name": "Acme, Inc.", "email": "ap@acme.test", "additionalInfo": {"taxId": "12-3456789"}},
+    {"id": "v2", "name": "Beta LLC", "address": ADDRESS},
+    {"id": "v3", "name": "Gamma"},
+    {"id": "v4", "name": "Gamma Co"},
+    {"id": "v5", "name": "Old", "archived": True},
+]
+
+
+def test_normalizers():
+    assert normalize_tax_id("12-345 6789") == "123456789"
+    assert normalize_address({"line1": "1 MAIN ST", "zipOrPostalCode": "12345", "country": "us"}) == normalize_address(ADDRESS)
+    assert normalize_address({"line1": "1 Main St"}) == ""
+
+
+def test_changed_fields_merges_nested_objects():
+    existing = {"email": "a@x.test", "address": ADDRESS}
+    assert changed_fields(existing, {"email": "a@x.test", "name": None}) == {}
+    changes = changed_fields(existing, {"email": "b@x.test", "address": {"city": "Shelbyville"}})
+    assert changes["email"] == "b@x.test"
+    assert changes["address"] == {**ADDRESS, "city": "Shelbyville"}
+
+
+def test_plan_matches_by_tax_id_name_and_address_and_unique_name():
+    incoming = [
+        {"name": "ACME Corporation", "email": "billing@acme.test", "additionalInfo": {"taxId": "12-3456789"}},
+        {"name": "Beta LLC", "address": {"line1": "1 main st", "zipOrPostalCode": "12345", "country": "US"}},
+        {"name": "Gamma"},
+        {"name": "Old"},
+        {"name": "New Vendor"},
+        {"name": "new vendor, inc."},
+    ]
+    plan = plan_vendor_import(incoming, EXISTING)
+    assert plan["update"][0] == (0, "v1", {"name": "ACME Corporation", "email": "billing@acme.test"})
+    # Matched on name and normalized address; the differing line1/zip formatting is an update.
+    assert plan["update"][1][:2] == (1, "v2")
+    # "Gamma" is ambiguous by name alone and is skipped rather than created.
+    assert [(skip["index"], skip.get("vendorId")) for skip in plan["skip"]] == [(2, None), (5, None)]
+    assert "v3, v4" in plan["skip"][0]["reason"]
+    # The archived vendor is ignored.
+    assert [index for index, _ in plan["create"]] == [3, 4]
+
+
+def test_plan_name_fallback_requires_compatible_tax_ids():
+    plan = plan_vendor_import(
+        [
+            {"name": "Acme Inc", "additionalInfo": {"taxId": "98-7654321"}},
+            {"name": "Beta LLC", "additionalInfo": {"taxId": "11-1111111"}},
+        ],
+        EXISTING,
+    )
+    # Acme exists under another tax ID, so it is a different vendor; Beta has none on file.
+    assert [index for index, _ in plan["create"]] == [0]
+    assert plan["update"][0][:2] == (1, "v2")
+
+
+def test_plan_skips_unchanged_vendor():
+    plan = plan_vendor_import([{"name": "Beta LLC", "address": ADDRESS}], EXISTING)
+    assert plan["skip"] == [{"index": 0, "status": "skipped", "vendorId": "v2", "reason": "Vendor exists and is unchanged."}]
+
+
+def test_plan_without_updates_skips_matches():
+    plan = plan_vendor_import([{"name": "x", "additionalInfo": {"taxId": "12-3456789"}}], EXISTING, update_existing=False)
+    assert plan["update"] == [] and plan["skip"][0]["reason"] == "Vendor exists."
@@ -0,0 +1,80 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from universal_mcp_bill.webhooks import SIGNATURE_HEADER, WebhookReceiver, parse_event, sign, verify_signature
+
+SECRET = "s3cret"
+
+
+def _payload(event_id="e1", event_type="bill.updated", record=None):
+    return json.dumps({"metadata": {"eventId": event_id, "eventType": event_type}, "bill": record or {"id": "b1", "amount": 10}}).encode()
+
+
+def test_verify_signature():
+    body = b'{"a": 1}'
+    assert verify_signature(body, sign(body, SECRET), SECRET)
+    assert not verify_signature(body, sign(body, "other"), SECRET)
+    assert not verify_signature(body, None, SECRET)
+
+
+def test_parse_event():
+    event = parse_event(json.loads(_payload()))
+    assert (event.event_id, event.entity, event.action, event.object_id) == ("e1", "bill", "updated", "b1")
+    with pytest.raises(ValueError):
+        parse_event({"metadata": {"eventType": "nonsense"}})
+    for payload in ([], "bill.updated", 7, {"metadata": ["bill.updated"]}, {"eventType": 5}):
+        with pytest.raises(ValueError):
+            parse_event(payload)
+
+
+def test_handle_rejects_bad_signatures_and_drops_redeliveries():
+    events = []
+    receiver = WebhookReceiver(SECRET, events.append)
+    try:
+        body = _payload()
+        assert receiver.handle(body, "bad") == 401
+        assert receiver.handle(b"not json", sign(b"not json", SECRET)) == 400
+        assert receiver.handle(b"[1, 2]", sign(b"[1, 2]", SECRET)) == 400
+        assert receiver.handle(body, sign(body, SECRET)) == 200
+        assert receiver.handle(body, sign(body, SECRET)) == 200
+        assert len(events) == 1
+    finally:
+        receiver.stop()
+
+
+def test_failed_handler_allows_retry():
+    calls = []
+
+    def flaky(event):
+        calls.append(event)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    receiver = WebhookReceiver(SECRET, flaky)
+    try:
+        body = _payload()
+        assert receiver.handle(body, sign(body, SECRET)) == 500
+        assert receiver.handle(body, sign(body, SECRET)) == 200
+        assert len(calls) == 2
+    finally:
+        receiver.stop()
+
+
+def test_receiver_serves_http():
+    events = []
+    receiver = WebhookReceiver(SECRET, events.append, path="/hooks").start()
+    host, port = receiver.address
+    try:
+        body = _payload(event_type="vendor.archived", record=None)
+        request = urllib.request.Request(f"http://{host}:{port}/hooks", data=body, headers={SIGNATURE_HEADER: sign(body, SECRET)})
+        with urllib.request.urlopen(request) as response:
+            assert response.status == 200
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(urllib.request.Request(f"http://{host}:{port}/hooks", data=body, headers={SIGNATURE_HEADER: "x"}))
+        assert excinfo.value.code == 401
+        assert events[0].entity == "vendor" and events[0].action == "archived"
+    finally:
+        receiver.stop()